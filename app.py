@@ -5,47 +5,84 @@ DIAS Package Creator - Main Application Entry Point
 A standalone desktop application to create DIAS-compliant submission packages.
 """
 
+import logging
+import os
 import sys
-from pathlib import Path
 
-# Add src directory to path for development
+# Add src directory to path for development, unless it is already importable
+# (installed or frozen builds), to avoid lengthening sys.path needlessly
 if __name__ == "__main__":
-    src_path = Path(__file__).parent
-    if str(src_path) not in sys.path:
-        sys.path.insert(0, str(src_path))
+    import importlib.util
+    if importlib.util.find_spec("src") is None:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def _log_uncaught_exception(exc_type, exc_value, exc_traceback) -> None:
+    """sys.excepthook that logs fatal errors before the default handler runs."""
+    if not issubclass(exc_type, KeyboardInterrupt):
+        logging.getLogger(__name__).error(
+            "Fatal error in application",
+            exc_info=(exc_type, exc_value, exc_traceback)
+        )
+    sys.__excepthook__(exc_type, exc_value, exc_traceback)
+
+
+def _configure_pycache_prefix() -> None:
+    """
+    Redirect bytecode caching to a per-user directory when the install is read-only.
+    
+    Installs under e.g. Program Files cannot write __pycache__, so every launch
+    would recompile all sources. Must run before any src module is imported.
+    """
+    if getattr(sys, 'frozen', False) or sys.dont_write_bytecode or sys.pycache_prefix:
+        return
+    if os.access(os.path.dirname(os.path.abspath(__file__)), os.W_OK):
+        return
+    
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(r'~\AppData\Local')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    sys.pycache_prefix = os.path.join(base, 'dias_package_creator', 'pycache')
 
 
 def main() -> None:
     """Main entry point for the GUI application."""
+    _configure_pycache_prefix()
+    
     # Set up logging before anything else
-    from src.utils.logging_config import setup_logging, cleanup_old_logs, log_memory_usage
-    import logging
+    from src.utils.logging_config import setup_logging, cleanup_old_logs
+    import threading
     
     log_file = setup_logging()
-    cleanup_old_logs()  # Clean up old logs on startup
+    # Clean up old logs in the background so it does not delay the first window
+    threading.Thread(target=cleanup_old_logs, name="log-cleanup", daemon=True).start()
     
     logger = logging.getLogger(__name__)
     logger.info("DIAS Package Creator starting...")
-    log_memory_usage(logger, "Initial memory")
-    
-    try:
-        from src.core import PackageController
-        from src.gui import MainWindow
-        
-        # Initialize controller
-        logger.info("Initializing controller...")
-        controller = PackageController()
-        
-        # Create and run main window
-        logger.info("Creating main window...")
-        window = MainWindow(controller)
-        
-        logger.info("Application ready")
-        window.run()
-        
-    except Exception as e:
-        logger.exception("Fatal error in application")
-        raise
+    # Memory telemetry loads psutil (or ctypes), so it is opt-in
+    if os.environ.get("DIAS_LOG_MEMORY") == "1":
+        from src.utils.logging_config import log_memory_usage
+        log_memory_usage(logger, "Initial memory")
+    
+    # Log fatal errors once at the top level instead of wrapping main() in try/except
+    sys.excepthook = _log_uncaught_exception
+    
+    from src.core import PackageController
+    from src.gui import MainWindow
+    
+    # Initialize controller
+    logger.info("Initializing controller...")
+    controller = PackageController()
+    
+    # Create and run main window
+    logger.info("Creating main window...")
+    window = MainWindow(controller)
+    
+    logger.info("Application ready")
+    window.run()
 
 
 if __name__ == "__main__":
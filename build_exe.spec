@@ -66,6 +66,10 @@ a = Analysis(
     win_private_assemblies=False,
     cipher=block_cipher,
     noarchive=False,
+    # Bundle bytecode compiled as with -OO (asserts and docstrings stripped)
+    # for smaller modules that load faster. Requires PyInstaller >= 6.6;
+    # older releases silently ignore the option.
+    optimize=2,
 )
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
@@ -1,15 +1,15 @@
 # DIAS Package Creator
-"""
-A standalone desktop application to create DIAS-compliant submission packages.
+"""A standalone desktop application to create DIAS-compliant submission packages."""
 
-Modules:
-- gui: GUI components using tkinter
-- core: Business logic and controllers
-- utils: File processing utilities  
-- dias_package_creator: XML generation (METS, PREMIS, Submission Description)
-"""
 
-from .utils.env_config import config
-
-__version__ = config.APP_VERSION
-__author__ = config.APP_AUTHOR
\ No newline at end of file
+def __getattr__(name):
+    """Resolve package metadata from env_config on first access."""
+    if name in ('__version__', '__author__', 'config'):
+        from .utils.env_config import config as _config
+        globals().update(
+            __version__=_config.APP_VERSION,
+            __author__=_config.APP_AUTHOR,
+            config=_config,
+        )
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
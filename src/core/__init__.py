@@ -1,9 +1,33 @@
 # DIAS Package Creator - Core Module
-"""
-Core business logic and controller components.
-"""
+"""Core business logic and controller components."""
 
-from .dias_controller import PackageController
-from .job_manager import JobManager
+import importlib
+import sys
 
 __all__ = ['PackageController', 'JobManager']
+
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    'PackageController': '.dias_controller',
+    'JobManager': '.job_manager',
+}
+
+# Exports are imported on first attribute access (PEP 562) so that
+# ``import src.core`` does not pull in the XML generation stack up front.
+# Frozen builds load everything from one archive anyway, so import eagerly.
+if getattr(sys, 'frozen', False):
+    from .dias_controller import PackageController
+    from .job_manager import JobManager
+else:
+    def __getattr__(name):
+        """Import lazily exported names on first access."""
+        if name in _LAZY_IMPORTS:
+            module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+            value = getattr(module, name)
+            # Cache on the module so later lookups bypass __getattr__
+            globals()[name] = value
+            return value
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_IMPORTS))
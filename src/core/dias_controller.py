@@ -3,14 +3,33 @@ Package Controller for DIAS Package Creator.
 Creates DIAS-compliant packages with the proper nested structure.
 """
 
+import errno
+import hashlib
+import io
 import logging
+import os
 import shutil
+import subprocess
 import tarfile
+import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Dict, Any, Optional, List
+from stat import S_IMODE, S_ISDIR, S_ISLNK, S_ISREG
+from typing import Callable, Dict, Any, Optional, List, Iterator, Tuple, Union
+
+try:
+    import grp
+    import pwd
+except ImportError:  # Windows
+    # Checked before use; mypy types the names as the modules themselves
+    grp = pwd = None  # type: ignore[assignment]
 
 from .job_manager import JobManager
+from ..utils.env_config import config
 from ..utils.file_processor import FileProcessor
 from ..utils.validation import InputValidator, ValidationResult
 from ..utils.platform_utils import get_application_path, get_resource_path
@@ -18,10 +37,301 @@ from ..dias_package_creator.dias_xml_generators import (
     DIASInfoGenerator, 
     DIASMetsGenerator, 
     DIASLogGenerator,
+    cached_sha256,
     calculate_sha256,
+    calculate_sha256_many,
+    remember_sha256,
     get_timestamp,
-    generate_uuid
+    generate_uuid,
+    guess_mimetype
 )
+from ..dias_package_creator.metadata_handler import MetadataHandler
+
+# Copy buffer for tarfile (its default is 16 KiB) and write buffer for the archive
+_TAR_BUFFER_SIZE = 2 * 1024 * 1024
+
+# Progress is reported when this much time has passed or this many more bytes
+# have been processed, instead of once per file
+_PROGRESS_INTERVAL = 0.1
+_PROGRESS_BYTES = 16 * 1024 * 1024
+
+# (path, path relative to the walked root, stat) from _walk_with_stat
+WalkEntry = Tuple[str, str, os.stat_result]
+
+# Bundled schema name -> location in the SIP, relative to the SIP root
+_SCHEMA_FILES = {
+    'dias_mets.xsd': 'mets.xsd',
+    'dias_premis.xsd': 'administrative_metadata/DIAS_PREMIS.xsd',
+}
+
+# SIP files listed in mets.xml ahead of the content, relative to the SIP root
+_SIP_FILESEC_FILES = ('mets.xsd', 'log.xml', 'administrative/DIAS_PREMIS.xsd')
+
+# Worker threads used to copy and hash source files
+_COPY_WORKERS = min(8, os.cpu_count() or 1)
+
+# copy_file_range errors meaning "not supported for these files", not a real failure
+_COPY_FILE_RANGE_UNSUPPORTED = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.EPERM,
+}
+
+
+def _copy_file_range(src: Union[str, Path], dest: Union[str, Path]) -> bool:
+    """
+    Copy file contents inside the kernel with os.copy_file_range.
+    
+    On filesystems with reflink support (Btrfs, XFS) this clones the data
+    instead of copying it. Returns False, before any data is copied, when the
+    call is unavailable or unsupported for this pair of files. Some
+    filesystems (FUSE, procfs) accept the call but copy nothing, which is
+    also reported as unsupported.
+    """
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    
+    with open(src, 'rb') as fsrc, open(dest, 'wb') as fdest:
+        copied = 0
+        while True:
+            try:
+                n = os.copy_file_range(fsrc.fileno(), fdest.fileno(), 1 << 30)
+            except OSError as e:
+                if copied == 0 and e.errno in _COPY_FILE_RANGE_UNSUPPORTED:
+                    return False
+                raise
+            if n == 0:
+                return copied > 0 or os.fstat(fsrc.fileno()).st_size == 0
+            copied += n
+
+
+def _walk_with_stat(root: str, prefix: str = '') -> Iterator[WalkEntry]:
+    """
+    Yield (path, relative path, lstat) for everything below root, each directory
+    before its contents.
+    
+    Entries come in the same order as Path.rglob('*'): a directory's entries,
+    then those of each subdirectory in turn. Uses os.scandir so each entry is
+    stat'ed once (and not at all on Windows, where the directory listing
+    already carries the stat data). Paths are plain strings and relative
+    paths (os.sep separated, starting with prefix) are built by concatenation,
+    so walking large trees creates no Path objects.
+    """
+    with os.scandir(root) as it:
+        dir_entries = [(entry.path, prefix + entry.name, entry.stat(follow_symlinks=False)) for entry in it]
+    yield from dir_entries
+    for path, rel_path, st in dir_entries:
+        if S_ISDIR(st.st_mode):
+            yield from _walk_with_stat(path, rel_path + os.sep)
+
+
+def _scan_source(source: Path) -> Tuple[List[WalkEntry], int]:
+    """
+    Scan a source file or directory once for packaging.
+    
+    Returns (path, relative path, stat) entries for the directories and regular
+    files to copy, each directory before its contents, and the total size of
+    the files. A single file's relative path is its name. Symlinks are
+    classified by their target, as Path.is_file()/is_dir() do, but linked
+    directories are not descended into; broken links are skipped.
+    """
+    if source.is_file():
+        st = source.stat()
+        return [(str(source), source.name, st)], st.st_size
+    
+    entries = []
+    total_size = 0
+    for path, rel_path, st in _walk_with_stat(str(source)):
+        if S_ISLNK(st.st_mode):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+        if S_ISREG(st.st_mode):
+            total_size += st.st_size
+        elif not S_ISDIR(st.st_mode):
+            continue
+        entries.append((path, rel_path, st))
+    return entries, total_size
+
+
+@lru_cache(maxsize=None)
+def _owner_names(uid: int, gid: int) -> Tuple[str, str]:
+    """Resolve user and group names for tar headers, as tarfile.gettarinfo does."""
+    uname = gname = ''
+    if pwd is not None:
+        try:
+            uname = pwd.getpwuid(uid)[0]
+        except KeyError:
+            pass
+    if grp is not None:
+        try:
+            gname = grp.getgrgid(gid)[0]
+        except KeyError:
+            pass
+    return uname, gname
+
+
+def _tarinfo_from_stat(arcname: str, st: os.stat_result) -> tarfile.TarInfo:
+    """
+    Build a TarInfo from an existing lstat result without touching the filesystem.
+    
+    Raises:
+        ValueError: If st is neither a regular file nor a directory.
+    """
+    if S_ISREG(st.st_mode):
+        tarinfo = tarfile.TarInfo(arcname.replace(os.sep, '/'))
+        tarinfo.type = tarfile.REGTYPE
+        tarinfo.size = st.st_size
+    elif S_ISDIR(st.st_mode):
+        tarinfo = tarfile.TarInfo(arcname.replace(os.sep, '/'))
+        tarinfo.type = tarfile.DIRTYPE
+    else:
+        raise ValueError(f"Not a regular file or directory: {arcname}")
+    tarinfo.mode = S_IMODE(st.st_mode)
+    tarinfo.uid = st.st_uid
+    tarinfo.gid = st.st_gid
+    tarinfo.mtime = st.st_mtime
+    tarinfo.uname, tarinfo.gname = _owner_names(st.st_uid, st.st_gid)
+    return tarinfo
+
+
+@lru_cache(maxsize=None)
+def _resolve_schema(src_name: str, base_path: Path, cwd: Path) -> Optional[Path]:
+    """
+    Find a schema file, or None. Cached: the locations do not change while the app runs.
+    """
+    # Resolve schemas from bundled resources first (PyInstaller onefile/_MEIPASS),
+    # then fall back to executable/current directory for external overrides.
+    candidate_paths = [
+        get_resource_path(src_name),
+        base_path / src_name,
+        cwd / src_name,
+    ]
+    return next((p for p in candidate_paths if p.exists()), None)
+
+
+def _generated_tarinfo(arcname: str, size: int = 0, directory: bool = False) -> tarfile.TarInfo:
+    """Build a TarInfo for an entry with no file behind it, owned by the current user."""
+    tarinfo = tarfile.TarInfo(arcname)
+    if directory:
+        tarinfo.type = tarfile.DIRTYPE
+        tarinfo.mode = 0o755
+    else:
+        tarinfo.size = size
+        tarinfo.mode = 0o644
+    tarinfo.mtime = time.time()
+    if hasattr(os, 'getuid'):
+        tarinfo.uid, tarinfo.gid = os.getuid(), os.getgid()
+        tarinfo.uname, tarinfo.gname = _owner_names(tarinfo.uid, tarinfo.gid)
+    return tarinfo
+
+
+def _tar_add_bytes(tar: tarfile.TarFile, arcname: str, data: bytes) -> None:
+    """Add an in-memory file to tar under arcname."""
+    tar.addfile(_generated_tarinfo(arcname, size=len(data)), io.BytesIO(data))
+
+
+def _tar_add_file(tar: tarfile.TarFile, arcname: str, st: os.stat_result, fileobj) -> str:
+    """
+    Add an open file to tar with headers from st and return the SHA-256 of its contents.
+    
+    The contents are hashed as tarfile copies them, unless the file is
+    unchanged since it was last hashed in this process. Only st.st_size bytes
+    are archived, so the cache is bypassed for a file that changed after st
+    was taken: its hash would not describe the file as it is now.
+    """
+    current = os.fstat(fileobj.fileno())
+    unchanged = (current.st_size, current.st_mtime_ns) == (st.st_size, st.st_mtime_ns)
+    checksum = cached_sha256(current) if unchanged else None
+    if checksum is not None:
+        tar.addfile(_tarinfo_from_stat(arcname, st), fileobj)
+        return checksum
+    
+    reader = _HashingReader(fileobj)
+    tar.addfile(_tarinfo_from_stat(arcname, st), reader)
+    checksum = reader.hexdigest()
+    if unchanged:
+        remember_sha256(current, checksum)
+    return checksum
+
+
+def _file_info(rel_path: str, name: str, checksum: str, st: os.stat_result) -> Dict:
+    """Build the file information dictionary used for PREMIS and METS."""
+    return {
+        'path': rel_path,
+        'checksum': checksum,
+        'size': st.st_size,
+        'created': datetime.fromtimestamp(st.st_mtime).astimezone().isoformat(),
+        'mimetype': guess_mimetype(name),
+        'name': name
+    }
+
+
+class _HashingWriter:
+    """
+    Write-through file wrapper that hashes every byte written.
+    
+    Lets tarfile stream the archive to disk while its SHA-256 and size are
+    computed in the same pass, so the archive is never read back.
+    """
+    
+    def __init__(self, fileobj) -> None:
+        self._fileobj = fileobj
+        self._hash = hashlib.sha256()
+        self.bytes_written = 0
+    
+    def write(self, data) -> int:
+        self._hash.update(data)
+        self.bytes_written += len(data)
+        written: int = self._fileobj.write(data)
+        return written
+    
+    def tell(self) -> int:
+        return self.bytes_written
+    
+    def flush(self) -> None:
+        self._fileobj.flush()
+    
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class _HashingReader:
+    """
+    Read-only file wrapper that hashes every byte read.
+    
+    tarfile copies member data with read(), so a source file streamed into
+    the archive through this wrapper is hashed in the same pass.
+    """
+    
+    def __init__(self, fileobj) -> None:
+        self._fileobj = fileobj
+        self._hash = hashlib.sha256()
+    
+    def read(self, size: int = -1) -> bytes:
+        data: bytes = self._fileobj.read(size)
+        self._hash.update(data)
+        return data
+    
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class _ProgressThrottle:
+    """Decides when byte-based progress is worth reporting."""
+    
+    def __init__(self):
+        self._last_time = time.monotonic()
+        self._last_bytes = 0
+    
+    def due(self, bytes_done: int, final: bool = False) -> bool:
+        """Return True if progress should be reported for bytes_done."""
+        now = time.monotonic()
+        if (final or now - self._last_time >= _PROGRESS_INTERVAL
+                or bytes_done - self._last_bytes >= _PROGRESS_BYTES):
+            self._last_time = now
+            self._last_bytes = bytes_done
+            return True
+        return False
 
 
 class PackageController:
@@ -46,15 +356,21 @@ class PackageController:
         self.logger.info("Initializing DIAS Package Controller")
         
         self.job_manager = JobManager()
+        try:
+            self.job_manager.set_min_level(config.LOG_LEVEL)
+        except ValueError:
+            # Same fallback as setup_logging: show everything
+            pass
         self.file_processor = FileProcessor()
         
         # XML generators
         self.info_generator = DIASInfoGenerator()
         self.mets_generator = DIASMetsGenerator()
         self.log_generator = DIASLogGenerator()
+        self.metadata_handler = MetadataHandler()
         
         # Callbacks for GUI updates
-        self._progress_callback: Optional[Callable[[float, str], None]] = None
+        self._progress_callback: Optional[Callable[[float, Optional[str]], None]] = None
         self._log_callback: Optional[Callable[[str, str], None]] = None
         self._completion_callback: Optional[Callable[[bool, str], None]] = None
         
@@ -63,7 +379,7 @@ class PackageController:
         
         self.logger.info("Controller initialized successfully")
         
-    def set_progress_callback(self, callback: Callable[[float, str], None]) -> None:
+    def set_progress_callback(self, callback: Callable[[float, Optional[str]], None]) -> None:
         """Set callback for progress updates."""
         self._progress_callback = callback
         self.job_manager.set_progress_callback(callback)
@@ -100,13 +416,11 @@ class PackageController:
         
     def _log(self, message: str, level: str = "INFO") -> None:
         """Log a message via callback if available."""
-        if self._log_callback:
-            self._log_callback(message, level)
+        self.job_manager.log(message, level)
             
     def _update_progress(self, value: float, status: Optional[str] = None) -> None:
         """Update progress via callback if available."""
-        if self._progress_callback:
-            self._progress_callback(value, status)
+        self.job_manager.update_progress(value, status)
 
     def _check_cancelled(self) -> None:
         """Raise InterruptedError if the current job has been cancelled."""
@@ -114,7 +428,7 @@ class PackageController:
             raise InterruptedError("Job was cancelled")
             
     def create_package(self, source_path: str, output_path: str, 
-                       package_name: str, metadata: Dict[str, Any]) -> None:
+                       package_name: str, metadata: Dict[str, Any]) -> str:
         """
         Start package creation in a background thread.
         
@@ -123,6 +437,9 @@ class PackageController:
             output_path: Path to output directory.
             package_name: Name for the package (used for label if not set).
             metadata: Package metadata dictionary.
+            
+        Returns:
+            The job id of the background job.
         """
         package_type = metadata.get('package_type') or metadata.get('type')
         if package_type:
@@ -133,7 +450,7 @@ class PackageController:
             metadata['label'] = package_name
             
         # Start the job in background thread
-        self.job_manager.start_job(
+        return self.job_manager.start_job(
             target=self._create_package_task,
             args=(source_path, output_path, package_name, metadata),
             completion_callback=self._completion_callback
@@ -199,16 +516,14 @@ class PackageController:
                 
             self._log("Validation passed")
             
-            # Check source size
+            # Scan the source once; the entries are reused for copying
             source = Path(source_path)
-            if source.exists():
-                if source.is_file():
-                    size_mb = source.stat().st_size / (1024*1024)
-                    self.logger.info(f"Source file size: {size_mb:.2f} MB")
-                else:
-                    total_size = sum(f.stat().st_size for f in source.rglob('*') if f.is_file())
-                    size_mb = total_size / (1024*1024)
-                    self.logger.info(f"Source directory size: {size_mb:.2f} MB")
+            source_entries, total_size = _scan_source(source)
+            size_mb = total_size / (1024*1024)
+            if source.is_file():
+                self.logger.info(f"Source file size: {size_mb:.2f} MB")
+            else:
+                self.logger.info(f"Source directory size: {size_mb:.2f} MB")
             
             self._log("Starting DIAS package creation...")
             self._update_progress(0, "Initializing...")
@@ -228,24 +543,15 @@ class PackageController:
             aic_dir = Path(output_path) / aic_uuid
             aip_dir = aic_dir / aip_uuid
             
-            # Create full structure
+            # Create full structure. The SIP is only staged on disk when the
+            # system tar program archives it; otherwise it is streamed into
+            # its tar file directly from the source
+            stage_sip = config.USE_NATIVE_TAR and shutil.which('tar') is not None
             self._update_progress(5, "Creating directory structure...")
-            self._create_directory_structure(aic_dir, aip_dir, sip_uuid)
+            self._create_directory_structure(aic_dir, aip_dir, sip_uuid, include_sip=stage_sip)
             
-            # Get SIP content directory (double-nested)
+            # SIP root (double-nested); its contents end up in [SIP_UUID].tar
             sip_root = aip_dir / "content" / sip_uuid / sip_uuid
-            sip_content_dir = sip_root / "content"
-            sip_admin_dir = sip_root / "administrative_metadata"
-            sip_desc_dir = sip_root / "descriptive_metadata"
-            
-            # Step 1: Copy source files to SIP content (10-40%)
-            self._update_progress(10, "Processing source files...")
-            files_info = self._process_source_files(source_path, sip_content_dir)
-            self._log(f"Processed {len(files_info)} files")
-            
-            # Step 2: Copy XSD schemas (40-45%)
-            self._update_progress(40, "Copying schema files...")
-            self._copy_schema_files(sip_root, sip_admin_dir)
             
             # Extract PREMIS events and agents from metadata
             all_premis_events = metadata.get('premis_events', [])
@@ -255,78 +561,19 @@ class PackageController:
             sip_agents = [a for a in all_premis_agents if a.get('include_sip', True)]
             aip_agents = [a for a in all_premis_agents if a.get('include_aip', True)]
             
-            # Step 3: Generate SIP-level premis.xml (45-55%)
-            self._update_progress(45, "Generating SIP premis.xml...")
-            premis_path = sip_admin_dir / "premis.xml"
-            premis_xml = self.log_generator.create_log_xml(
-                metadata=metadata,
-                object_uuid=sip_uuid,
-                aic_uuid=None,  # SIP doesn't reference AIC directly
-                files_info=files_info,
-                is_sip_level=True,
-                user_events=sip_events,
-                agents=sip_agents
-            )
-            self.log_generator.save(premis_xml, str(premis_path))
-            self._log(f"Created: {premis_path.relative_to(aic_dir)}")
-            
-            # Get premis file info for mets.xml reference
-            premis_file_info = {
-                'checksum': calculate_sha256(str(premis_path)),
-                'size': premis_path.stat().st_size,
-                'created': get_timestamp()
-            }
-            
-            # Step 4: Generate SIP-level log.xml (55-60%)
-            self._update_progress(55, "Generating SIP log.xml...")
-            sip_log_path = sip_root / "log.xml"
-            sip_log_xml = self.log_generator.create_log_xml(
-                metadata=metadata,
-                object_uuid=sip_uuid,
-                aic_uuid=None,
-                files_info=None,
-                is_sip_level=True,
-                user_events=sip_events,
-                agents=sip_agents
-            )
-            self.log_generator.save(sip_log_xml, str(sip_log_path))
-            self._log(f"Created: {sip_log_path.relative_to(aic_dir)}")
-            
-            # Add log.xml and other SIP files to files_info for mets.xml
-            sip_files_info = self._gather_sip_files_info(sip_root)
-            
-            # Step 5: Generate SIP mets.xml (60-70%)
-            self._update_progress(60, "Generating SIP mets.xml...")
-            mets_path = sip_root / "mets.xml"
-            mets_xml = self.mets_generator.create_mets_xml(
-                metadata=metadata,
-                sip_uuid=sip_uuid,
-                files_info=sip_files_info,
-                premis_file_info=premis_file_info
-            )
-            self.mets_generator.save(mets_xml, str(mets_path))
-            self._log(f"Created: {mets_path.relative_to(aic_dir)}")
-            
-            # Step 6: Create tar archive of SIP (70-80%)
-            self._update_progress(70, "Creating SIP tar archive...")
-            self.logger.info("Starting tar archive creation")
-            
-            tar_file_info = self._create_sip_tar_archive(sip_root, aip_dir / "content", sip_uuid)
+            if stage_sip:
+                tar_file_info = self._build_staged_sip(
+                    source_path, source_entries, metadata, aic_dir, sip_root, sip_events, sip_agents
+                )
+            else:
+                tar_file_info = self._build_streamed_sip(
+                    source, source_entries, total_size, metadata, sip_root, sip_events, sip_agents
+                )
             
             archive_size_mb = tar_file_info['size'] / (1024*1024)
             self.logger.info(f"Tar archive created: {archive_size_mb:.2f} MB")
             self._log(f"Created: {sip_uuid}.tar ({archive_size_mb:.2f} MB)")
             
-            # Remove the uncompressed SIP directory after successful tar creation
-            self.logger.info("Removing temporary SIP directory")
-            shutil.rmtree(sip_root.parent)  # Remove the outer SIP_UUID directory
-            self._log(f"Removed temporary SIP directory")
-            
-            # Force garbage collection to free memory
-            import gc
-            gc.collect()
-            self.logger.debug("Performed garbage collection")
-            
             # Step 7: Generate AIP-level log.xml (80-85%)
             self._update_progress(80, "Generating AIP log.xml...")
             aip_log_path = aip_dir / "log.xml"
@@ -364,12 +611,318 @@ class PackageController:
             
         except Exception as e:
             self._log(f"Error creating package: {e}", "ERROR")
-            import traceback
-            self._log(traceback.format_exc(), "DEBUG")
+            self.logger.exception("Package creation failed")
+            # Only format the traceback when the GUI log would show it
+            if self.job_manager.is_enabled_for("DEBUG"):
+                self._log(traceback.format_exc(), "DEBUG")
             return (False, f"Package creation failed: {e}")
     
-    def _create_directory_structure(self, aic_dir: Path, aip_dir: Path, sip_uuid: str) -> None:
-        """Create the full DIAS directory structure."""
+    def _build_staged_sip(self, source_path: str, source_entries: List[WalkEntry],
+                          metadata: Dict[str, Any], aic_dir: Path, sip_root: Path,
+                          sip_events: List[Dict], sip_agents: List[Dict]) -> Dict:
+        """
+        Build the SIP on disk under sip_root, archive it and remove the staging copy.
+        
+        Used with the system tar backend, which can only archive an existing
+        directory tree.
+        
+        Returns:
+            Dictionary with tar file information.
+        """
+        sip_uuid = sip_root.name
+        
+        # Get SIP content directory (double-nested)
+        sip_content_dir = sip_root / "content"
+        sip_admin_dir = sip_root / "administrative_metadata"
+        sip_desc_dir = sip_root / "descriptive_metadata"
+        
+        # Step 1: Copy source files to SIP content (10-40%)
+        self._update_progress(10, "Processing source files...")
+        files_info = self._process_source_files(source_path, sip_content_dir, entries=source_entries)
+        self._log(f"Processed {len(files_info)} files")
+        
+        # Step 2: Copy XSD schemas (40-45%)
+        self._update_progress(40, "Copying schema files...")
+        self._copy_schema_files(sip_root, sip_admin_dir)
+        
+        # Step 3: Generate SIP-level premis.xml (45-55%)
+        self._update_progress(45, "Generating SIP premis.xml...")
+        premis_path = sip_admin_dir / "premis.xml"
+        premis_xml = self.log_generator.create_log_xml(
+            metadata=metadata,
+            object_uuid=sip_uuid,
+            aic_uuid=None,  # SIP doesn't reference AIC directly
+            files_info=files_info,
+            is_sip_level=True,
+            user_events=sip_events,
+            agents=sip_agents
+        )
+        premis_checksum, premis_size = self.log_generator.save_with_checksum(
+            premis_xml, str(premis_path))
+        self._log(f"Created: {premis_path.relative_to(aic_dir)}")
+        
+        # Get premis file info for mets.xml reference, hashed while the
+        # document was written rather than read back from disk
+        premis_file_info = {
+            'checksum': premis_checksum,
+            'size': premis_size,
+            'created': get_timestamp()
+        }
+        
+        # Step 4: Generate SIP-level log.xml (55-60%)
+        self._update_progress(55, "Generating SIP log.xml...")
+        sip_log_path = sip_root / "log.xml"
+        sip_log_xml = self.log_generator.create_log_xml(
+            metadata=metadata,
+            object_uuid=sip_uuid,
+            aic_uuid=None,
+            files_info=None,
+            is_sip_level=True,
+            user_events=sip_events,
+            agents=sip_agents
+        )
+        sip_log_checksum, sip_log_size = self.log_generator.save_with_checksum(
+            sip_log_xml, str(sip_log_path))
+        self._log(f"Created: {sip_log_path.relative_to(aic_dir)}")
+        
+        # Add log.xml and other SIP files to files_info for mets.xml,
+        # reusing the checksums computed while copying the content
+        # and writing log.xml
+        copied_files = {os.path.normpath(info['path']): info for info in files_info}
+        copied_files['log.xml'] = {
+            'path': 'log.xml',
+            'checksum': sip_log_checksum,
+            'size': sip_log_size,
+            'created': get_timestamp(),
+            'mimetype': guess_mimetype(sip_log_path.name),
+            'name': sip_log_path.name
+        }
+        sip_files_info = self._gather_sip_files_info(sip_root, precomputed=copied_files)
+        
+        # Step 5: Generate SIP mets.xml (60-70%)
+        self._update_progress(60, "Generating SIP mets.xml...")
+        mets_path = sip_root / "mets.xml"
+        self.mets_generator.write_mets_xml(
+            str(mets_path),
+            metadata=metadata,
+            sip_uuid=sip_uuid,
+            files_info=sip_files_info,
+            premis_file_info=premis_file_info
+        )
+        self._log(f"Created: {mets_path.relative_to(aic_dir)}")
+        
+        # Step 6: Create tar archive of SIP (70-80%)
+        self._update_progress(70, "Creating SIP tar archive...")
+        self.logger.info("Starting tar archive creation")
+        
+        tar_file_info = self._create_sip_tar_archive(sip_root, sip_root.parent.parent, sip_uuid)
+        
+        # Remove the uncompressed SIP directory after successful tar creation
+        self.logger.info("Removing temporary SIP directory")
+        shutil.rmtree(sip_root.parent)  # Remove the outer SIP_UUID directory
+        self._log(f"Removed temporary SIP directory")
+        
+        return tar_file_info
+    
+    def _build_streamed_sip(self, source: Path, source_entries: List[WalkEntry],
+                            total_size: int, metadata: Dict[str, Any], sip_root: Path,
+                            sip_events: List[Dict], sip_agents: List[Dict]) -> Dict:
+        """
+        Write the SIP tar archive straight from the source, without staging the SIP on disk.
+        
+        Source files are streamed into the archive and hashed as they are read,
+        so each is read once and never copied. The generated XML files need
+        those checksums and are added after the content, from memory.
+        
+        Returns:
+            Dictionary with tar file information.
+        """
+        sip_uuid = sip_root.name
+        tar_path = sip_root.parent.parent / f"{sip_uuid}.tar"
+        start_time = time.time()
+        
+        with open(tar_path, 'wb', buffering=_TAR_BUFFER_SIZE) as tar_file:
+            writer = _HashingWriter(tar_file)
+            # typeshed's TarFile.open overloads omit copybufsize, which open() passes on to TarFile
+            with tarfile.open(  # type: ignore[call-overload]
+                    fileobj=writer, mode='w', copybufsize=_TAR_BUFFER_SIZE) as tar:
+                for name in ('administrative_metadata', 'content', 'descriptive_metadata'):
+                    tar.addfile(_generated_tarinfo(f"{sip_uuid}/{name}", directory=True))
+                
+                # Step 1: Archive source files (10-60%)
+                self._update_progress(10, "Archiving source files...")
+                files_info = self._archive_source_files(
+                    tar, source, source_entries, total_size, f"{sip_uuid}/content"
+                )
+                self._log(f"Processed {len(files_info)} files")
+                
+                # Step 2: Add XSD schemas (60-65%)
+                self._update_progress(60, "Adding schema files...")
+                generated_files = self._archive_schema_files(tar, sip_uuid)
+                
+                # Step 3: Generate SIP-level premis.xml (65-70%)
+                self._update_progress(65, "Generating SIP premis.xml...")
+                premis_xml = self.log_generator.create_log_xml(
+                    metadata=metadata,
+                    object_uuid=sip_uuid,
+                    aic_uuid=None,  # SIP doesn't reference AIC directly
+                    files_info=files_info,
+                    is_sip_level=True,
+                    user_events=sip_events,
+                    agents=sip_agents
+                )
+                premis_bytes = self.log_generator.tostring(premis_xml)
+                _tar_add_bytes(tar, f"{sip_uuid}/administrative_metadata/premis.xml", premis_bytes)
+                self._log("Created: administrative_metadata/premis.xml")
+                
+                premis_file_info = {
+                    'checksum': hashlib.sha256(premis_bytes).hexdigest(),
+                    'size': len(premis_bytes),
+                    'created': get_timestamp()
+                }
+                
+                # Step 4: Generate SIP-level log.xml (70-75%)
+                self._update_progress(70, "Generating SIP log.xml...")
+                sip_log_xml = self.log_generator.create_log_xml(
+                    metadata=metadata,
+                    object_uuid=sip_uuid,
+                    aic_uuid=None,
+                    files_info=None,
+                    is_sip_level=True,
+                    user_events=sip_events,
+                    agents=sip_agents
+                )
+                sip_log_bytes = self.log_generator.tostring(sip_log_xml)
+                _tar_add_bytes(tar, f"{sip_uuid}/log.xml", sip_log_bytes)
+                self._log("Created: log.xml")
+                
+                generated_files['log.xml'] = {
+                    'path': 'log.xml',
+                    'checksum': hashlib.sha256(sip_log_bytes).hexdigest(),
+                    'size': len(sip_log_bytes),
+                    'created': get_timestamp(),
+                    'mimetype': guess_mimetype('log.xml'),
+                    'name': 'log.xml'
+                }
+                
+                # Step 5: Generate SIP mets.xml (75-80%), listing the same
+                # files in the same order as _gather_sip_files_info
+                self._update_progress(75, "Generating SIP mets.xml...")
+                sip_files_info = [
+                    generated_files[rel_path] for rel_path in _SIP_FILESEC_FILES
+                    if rel_path in generated_files
+                ] + files_info
+                mets_bytes = self.mets_generator.render_mets_xml(
+                    metadata=metadata,
+                    sip_uuid=sip_uuid,
+                    files_info=sip_files_info,
+                    premis_file_info=premis_file_info
+                )
+                _tar_add_bytes(tar, f"{sip_uuid}/mets.xml", mets_bytes)
+                self._log("Created: mets.xml")
+        
+        elapsed = time.time() - start_time
+        self.logger.info(f"Tar archive creation completed in {elapsed:.2f} seconds")
+        
+        return {
+            'path': f"content/{tar_path.name}",
+            'checksum': writer.hexdigest(),
+            'size': writer.bytes_written,
+            'created': datetime.now().astimezone().isoformat(),
+            'mimetype': 'application/x-tar',
+            'name': tar_path.name
+        }
+    
+    def _archive_source_files(self, tar: tarfile.TarFile, source: Path,
+                              entries: List[WalkEntry],
+                              total_size: int, arc_prefix: str) -> List[Dict]:
+        """
+        Stream source files into tar under arc_prefix, hashing them as they are read.
+        
+        Args:
+            tar: Open tar archive.
+            source: Source file or directory.
+            entries: Result of _scan_source for source.
+            total_size: Total size of the source files, for progress.
+            arc_prefix: Archive path of the SIP content directory.
+            
+        Returns:
+            List of file information dictionaries, in source order.
+        """
+        if source.is_file():
+            self.logger.info(f"Processing single file: {source.name} ({total_size / (1024*1024):.2f} MB)")
+            self._log(f"Processing file: {source.name}")
+        else:
+            self.logger.info(f"Processing directory: {source}")
+        
+        files_info = []
+        total_files = sum(1 for _, _, st in entries if S_ISREG(st.st_mode))
+        processed = 0
+        bytes_done = 0
+        throttle = _ProgressThrottle()
+        self.logger.info(f"Found {total_files} files to process")
+        
+        for src_item, rel_path, st in entries:
+            self._check_cancelled()
+            arcname = f"{arc_prefix}/{rel_path}"
+            
+            if S_ISDIR(st.st_mode):
+                # Keep empty directories to preserve structure
+                tar.addfile(_tarinfo_from_stat(arcname, st))
+                continue
+            
+            # A file that cannot be opened is skipped; failing once its tar
+            # header is written would leave a corrupt archive, so that raises
+            try:
+                fileobj = open(src_item, 'rb')
+            except OSError as e:
+                self._log(f"Error copying {src_item}: {e}", "ERROR")
+                continue
+            with fileobj:
+                if hasattr(os, 'posix_fadvise'):
+                    # Read ahead aggressively, then drop the pages: the source
+                    # is read exactly once, so caching it only evicts other data
+                    os.posix_fadvise(fileobj.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    checksum = _tar_add_file(tar, arcname, st, fileobj)
+                    os.posix_fadvise(fileobj.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+                else:
+                    checksum = _tar_add_file(tar, arcname, st, fileobj)
+            files_info.append(_file_info(f"content/{rel_path}", os.path.basename(src_item), checksum, st))
+            
+            processed += 1
+            bytes_done += st.st_size
+            if throttle.due(bytes_done, processed == total_files):
+                fraction = bytes_done / total_size if total_size else processed / total_files
+                self._update_progress(10 + fraction * 50, f"Archiving: {rel_path}")
+        
+        self.logger.info(f"Completed processing {processed} files")
+        return files_info
+    
+    def _archive_schema_files(self, tar: tarfile.TarFile, sip_uuid: str) -> Dict[str, Dict]:
+        """
+        Add the XSD schema files to tar.
+        
+        Returns:
+            File information dictionaries keyed by path relative to the SIP root.
+        """
+        schema_info = {}
+        for src_name, rel_path in _SCHEMA_FILES.items():
+            src_path = self._find_schema(src_name)
+            if src_path is None:
+                self._log(f"Schema not found: {src_name}, skipping", "WARNING")
+                self.logger.warning(f"Schema not found in any expected location: {src_name}")
+                continue
+            
+            with open(src_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                checksum = _tar_add_file(tar, f"{sip_uuid}/{rel_path}", st, f)
+            schema_info[rel_path] = _file_info(rel_path, Path(rel_path).name, checksum, st)
+            self._log(f"Copied schema: {Path(rel_path).name}")
+        return schema_info
+    
+    def _create_directory_structure(self, aic_dir: Path, aip_dir: Path, sip_uuid: str,
+                                    include_sip: bool = True) -> None:
+        """Create the full DIAS directory structure, optionally without the staged SIP."""
         # SIP root (double-nested)
         sip_root = aip_dir / "content" / sip_uuid / sip_uuid
         
@@ -389,72 +942,104 @@ class PackageController:
             sip_root / "content",
             sip_root / "descriptive_metadata",
         ]
+        if not include_sip:
+            dirs = [d for d in dirs if d != sip_root and sip_root not in d.parents]
         
-        for d in dirs:
+        # Creating the leaves creates every ancestor too
+        leaves = [d for d in dirs if not any(d in other.parents for other in dirs)]
+        for d in leaves:
             d.mkdir(parents=True, exist_ok=True)
-            self._log(f"Created directory: {d.relative_to(aic_dir.parent)}")
+        for d in dirs:
+            self.logger.debug(f"Created directory: {d.relative_to(aic_dir.parent)}")
+        self._log(f"Created directory structure under {aic_dir.name}")
     
-    def _process_source_files(self, source_path: str, content_dir: Path) -> List[Dict]:
+    def _process_source_files(self, source_path: str, content_dir: Path,
+                              entries: Optional[List[WalkEntry]] = None) -> List[Dict]:
         """
         Process source files: copy and calculate checksums.
-        Memory-efficient processing with periodic cleanup.
         
         Args:
             source_path: Source file or directory path.
             content_dir: Destination content directory.
+            entries: Result of _scan_source for source_path, if already scanned.
             
         Returns:
             List of file information dictionaries.
         """
-        import gc
-        
         source = Path(source_path)
         files_info = []
         
+        if entries is None:
+            entries, _ = _scan_source(source)
+        
         if source.is_file():
             # Single file
-            self.logger.info(f"Processing single file: {source.name} ({source.stat().st_size / (1024*1024):.2f} MB)")
+            src_stat = entries[0][2]
+            self.logger.info(f"Processing single file: {source.name} ({src_stat.st_size / (1024*1024):.2f} MB)")
             self._log(f"Processing file: {source.name}")
             dest_file = content_dir / source.name
             
-            file_info = self._copy_file_with_info(source, dest_file, content_dir)
+            file_info = self._copy_file_with_info(source, dest_file, content_dir, src_stat)
             if file_info:
                 files_info.append(file_info)
         else:
             # Directory - recursive copy
             self.logger.info(f"Processing directory: {source}")
-            all_items = list(source.rglob('*'))
-            total_files = sum(1 for f in all_items if f.is_file())
-            processed = 0
-            
-            self.logger.info(f"Found {total_files} files to process")
+            copy_jobs = []
+            content_dir.mkdir(parents=True, exist_ok=True)
+            dest_prefix = os.path.join(str(content_dir), '')
             
-            for src_item in all_items:
+            # Entries list each directory before its contents, so creating the
+            # directories in order gives every file an existing parent
+            for src_item, rel_path, src_stat in entries:
                 # Preserve relative path structure
-                rel_path = src_item.relative_to(source)
-                dest_item = content_dir / rel_path
+                dest_item = dest_prefix + rel_path
                 
-                if src_item.is_dir():
+                if S_ISDIR(src_stat.st_mode):
                     # Create empty directories to preserve structure
-                    dest_item.mkdir(parents=True, exist_ok=True)
+                    os.makedirs(dest_item, exist_ok=True)
                     self.logger.debug(f"Created directory: {rel_path}")
-                elif src_item.is_file():
-                    dest_item.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    progress = 10 + (processed / max(total_files, 1)) * 30
-                    self._update_progress(progress, f"Copying: {rel_path}")
-                    
-                    file_info = self._copy_file_with_info(src_item, dest_item, content_dir)
-                    if file_info:
-                        files_info.append(file_info)
+                else:
+                    copy_jobs.append((src_item, dest_item, rel_path, src_stat))
+            
+            total_files = len(copy_jobs)
+            total_bytes = sum(job[3].st_size for job in copy_jobs)
+            processed = 0
+            bytes_done = 0
+            throttle = _ProgressThrottle()
+            results: List[Optional[Dict]] = [None] * total_files
+            
+            self.logger.info(f"Found {total_files} files to process")
+            
+            # Copy files on a thread pool: the copies block on I/O and hashlib
+            # releases the GIL while hashing, so workers overlap both.
+            # Results are stored by index to keep files_info in source order.
+            with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+                futures = {
+                    executor.submit(
+                        self._copy_file_with_info, src_item, dest_item, content_dir, src_stat, rel_path
+                    ): index
+                    for index, (src_item, dest_item, rel_path, src_stat) in enumerate(copy_jobs)
+                }
+                try:
+                    for future in as_completed(futures):
+                        index = futures[future]
+                        results[index] = future.result()
+                        processed += 1
+                        bytes_done += copy_jobs[index][3].st_size
+                        self._check_cancelled()
                         
-                    processed += 1
-                    
-                    # Perform garbage collection every 100 files to prevent memory buildup
-                    if processed % 100 == 0:
-                        gc.collect()
-                        self.logger.debug(f"Processed {processed}/{total_files} files, performed GC")
+                        if throttle.due(bytes_done, processed == total_files):
+                            if total_bytes:
+                                fraction = bytes_done / total_bytes
+                            else:
+                                fraction = processed / total_files
+                            self._update_progress(10 + fraction * 30, f"Copying: {copy_jobs[index][2]}")
+                except BaseException:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
             
+            files_info = [info for info in results if info]
             self.logger.info(f"Completed processing {processed} files")
                     
         return files_info
@@ -472,54 +1057,31 @@ class PackageController:
         Returns:
             Dictionary with tar file information.
         """
-        import gc
-        import time
-        
         tar_path = content_dir / f"{sip_uuid}.tar"
         
-        # Count total files for progress reporting
+        # Walk once, keeping each entry's stat for sizes, progress and tar headers
         self.logger.info("Scanning directory structure for tar archive")
-        all_files = list(sip_root.rglob('*'))
-        total_files = sum(1 for f in all_files if f.is_file())
-        total_size = sum(f.stat().st_size for f in all_files if f.is_file())
+        # Relative paths start with the SIP_UUID so they are the archive names
+        entries = list(_walk_with_stat(str(sip_root), sip_root.name + os.sep))
+        total_files = sum(1 for _, _, st in entries if S_ISREG(st.st_mode))
+        total_size = sum(st.st_size for _, _, st in entries if S_ISREG(st.st_mode))
         
         self.logger.info(f"Creating tar archive with {total_files} files ({total_size / (1024*1024):.2f} MB)")
         self._log(f"Creating tar archive with {total_files} files...")
         
-        processed = 0
         start_time = time.time()
         
         try:
             # Create tar file without compression (better for long-term preservation)
-            # Using streaming mode for memory efficiency with large archives
-            with tarfile.open(tar_path, 'w') as tar:
-                # Add the entire SIP directory, preserving structure including empty directories
-                # arcname ensures the SIP_UUID appears as the root in the tar
-                for item in sip_root.rglob('*'):
-                    try:
-                        # Calculate relative path from SIP root's parent
-                        arcname = item.relative_to(sip_root.parent)
-                        
-                        # Add item to tar (tarfile handles streaming internally)
-                        tar.add(item, arcname=arcname, recursive=False)
-                        if item.is_file():
-                            processed += 1 # Progress reporting
-                            if processed % 10 == 0 or processed == total_files:
-                                elapsed = time.time() - start_time
-                                if elapsed > 0:
-                                    rate_mb = (sum(f.stat().st_size for f in all_files[:processed] if f.is_file()) / (1024*1024)) / elapsed
-                                    self.logger.debug(f"Tar progress: {processed}/{total_files} files ({rate_mb:.2f} MB/s)")
-                                
-                                progress = 70 + (processed / max(total_files, 1)) * 10
-                                self._update_progress(progress, f"Archiving: {processed}/{total_files} files")
-                            
-                            # Garbage collection every 50 files to prevent memory buildup
-                            if processed % 50 == 0:
-                                gc.collect()
-                    
-                    except Exception as e:
-                        self.logger.error(f"Error adding {item} to tar: {e}")
-                        self._log(f"Warning: Could not add {item.name} to archive", "WARNING")
+            # Using streaming mode for memory efficiency with large archives;
+            # the checksum is computed as the archive is written
+            tar_executable = shutil.which('tar') if config.USE_NATIVE_TAR else None
+            with open(tar_path, 'wb', buffering=_TAR_BUFFER_SIZE) as tar_file:
+                writer = _HashingWriter(tar_file)
+                if tar_executable:
+                    self._stream_native_tar(tar_executable, sip_root, writer, total_size)
+                else:
+                    self._write_tarfile(sip_root, writer, entries, total_files, total_size, start_time)
             
             elapsed = time.time() - start_time
             self.logger.info(f"Tar archive creation completed in {elapsed:.2f} seconds")
@@ -528,141 +1090,239 @@ class PackageController:
             self.logger.error(f"Fatal error creating tar archive: {e}")
             raise
         
-        # Calculate checksum of tar file
-        self.logger.info("Calculating tar archive checksum")
-        checksum = calculate_sha256(str(tar_path))
-        stat = tar_path.stat()
-        
         return {
             'path': f"content/{tar_path.name}",
-            'checksum': checksum,
-            'size': stat.st_size,
-            'created': datetime.fromtimestamp(stat.st_mtime).astimezone().isoformat(),
+            'checksum': writer.hexdigest(),
+            'size': writer.bytes_written,
+            'created': datetime.now().astimezone().isoformat(),
             'mimetype': 'application/x-tar',
             'name': tar_path.name
         }
     
-    def _copy_file_with_info(self, src: Path, dest: Path, base_dir: Path) -> Optional[Dict]:
-        """Copy a file and return its metadata."""
-        try:
-            shutil.copy2(src, dest)
+    def _write_tarfile(self, sip_root: Path, writer: _HashingWriter,
+                       entries: List[WalkEntry],
+                       total_files: int, total_size: int, start_time: float) -> None:
+        """
+        Write the SIP archive with Python's tarfile module.
+        
+        Tar headers are built from the stats gathered by the pre-scan, so
+        tarfile does not lstat every entry again.
+        
+        Args:
+            sip_root: Path to the SIP root directory.
+            writer: Hashing writer wrapping the open archive file.
+            entries: Walk entries below sip_root, parents first, with archive names.
+            total_files: Number of regular files, for progress.
+            total_size: Total size of those files, for progress.
+            start_time: Archive start time, for the transfer rate.
+        """
+        processed = 0
+        bytes_done = 0
+        throttle = _ProgressThrottle()
+        
+        # typeshed's TarFile.open overloads omit copybufsize, which open() passes on to TarFile
+        with tarfile.open(  # type: ignore[call-overload]
+                fileobj=writer, mode='w', copybufsize=_TAR_BUFFER_SIZE) as tar:
+            # Add the entire SIP directory, preserving structure including empty directories
+            # arcname ensures the SIP_UUID appears as the root in the tar
+            for item, arcname, st in entries:
+                try:
+                    if S_ISREG(st.st_mode):
+                        with open(item, 'rb') as f:
+                            tar.addfile(_tarinfo_from_stat(arcname, st), f)
+                    elif S_ISDIR(st.st_mode):
+                        tar.addfile(_tarinfo_from_stat(arcname, st))
+                    else:
+                        # Not a regular file or directory; let tarfile inspect it
+                        tar.add(item, arcname=arcname, recursive=False)
+                    
+                    if S_ISREG(st.st_mode):
+                        processed += 1 # Progress reporting
+                        bytes_done += st.st_size
+                        if throttle.due(bytes_done, processed == total_files):
+                            elapsed = time.time() - start_time
+                            if elapsed > 0:
+                                rate_mb = (bytes_done / (1024*1024)) / elapsed
+                                self.logger.debug(f"Tar progress: {processed}/{total_files} files ({rate_mb:.2f} MB/s)")
+                            
+                            if total_size:
+                                fraction = bytes_done / total_size
+                            else:
+                                fraction = processed / total_files
+                            self._update_progress(70 + fraction * 10, f"Archiving: {processed}/{total_files} files")
+                
+                except Exception as e:
+                    self.logger.error(f"Error adding {item} to tar: {e}")
+                    self._log(f"Warning: Could not add {os.path.basename(item)} to archive", "WARNING")
+    
+    def _stream_native_tar(self, tar_executable: str, sip_root: Path,
+                           writer: _HashingWriter, total_size: int) -> None:
+        """
+        Write the SIP archive using the system tar program.
+        
+        tar writes the archive to stdout, which is streamed into writer so the
+        checksum is still computed in the same pass. pax format is used because
+        ustar cannot hold the long UUID-prefixed member names.
+        
+        Args:
+            tar_executable: Path to the tar program.
+            sip_root: Path to the SIP root directory.
+            writer: Hashing writer wrapping the open archive file.
+            total_size: Total size of the files being archived, for progress.
+        """
+        cmd = [tar_executable, '--format=pax', '-cf', '-', '-C', str(sip_root.parent), sip_root.name]
+        # Keep macOS bsdtar from adding AppleDouble (._*) entries
+        env = dict(os.environ, COPYFILE_DISABLE='1')
+        self.logger.info(f"Creating tar archive with {tar_executable}")
+        
+        with tempfile.TemporaryFile() as stderr_file:
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, env=env) as proc:
+                assert proc.stdout is not None
+                chunk_size = config.FILE_PROCESSOR_CHUNK_SIZE
+                throttle = _ProgressThrottle()
+                while True:
+                    chunk = proc.stdout.read(chunk_size)
+                    if not chunk:
+                        break
+                    writer.write(chunk)
+                    if not throttle.due(writer.bytes_written):
+                        continue
+                    progress = 70 + min(writer.bytes_written / max(total_size, 1), 1.0) * 10
+                    self._update_progress(progress, f"Archiving: {writer.bytes_written / (1024*1024):.0f} MB")
             
-            # Calculate checksum
-            checksum = calculate_sha256(str(dest))
+            if proc.returncode != 0:
+                stderr_file.seek(0)
+                error = stderr_file.read().decode(errors='replace').strip()
+                raise RuntimeError(f"tar exited with status {proc.returncode}: {error}")
+    
+    def _copy_file_with_info(self, src: Union[str, Path], dest: Union[str, Path], base_dir: Path,
+                             src_stat: Optional[os.stat_result] = None,
+                             rel_path: Optional[str] = None) -> Optional[Dict]:
+        """
+        Copy a file and return its metadata.
+        
+        Uses an in-kernel copy_file_range (reflink where supported) and then
+        hashes the copy. Where that is unavailable, the SHA-256 is computed
+        from the bytes as they are copied, so each file is read only once.
+        src_stat and rel_path (dest relative to base_dir), when given, come
+        from the source scan.
+        """
+        try:
+            stat = src_stat if src_stat is not None else os.stat(src)
             
-            # Get file info
-            stat = dest.stat()
+            if _copy_file_range(src, dest):
+                checksum = calculate_sha256(dest)
+                if checksum is None:
+                    raise OSError(f"Could not calculate the checksum of {dest}")
+            else:
+                sha256_hash = hashlib.sha256()
+                buffer = memoryview(bytearray(min(config.FILE_PROCESSOR_CHUNK_SIZE, max(stat.st_size, 1))))
+                
+                with open(src, 'rb', buffering=0) as fsrc, open(dest, 'wb', buffering=0) as fdest:
+                    while True:
+                        n = fsrc.readinto(buffer)
+                        if not n:
+                            break
+                        chunk = buffer[:n]
+                        sha256_hash.update(chunk)
+                        fdest.write(chunk)
+                checksum = sha256_hash.hexdigest()
+            shutil.copystat(src, dest)
             
             # Determine relative path for storage in package
-            rel_path = str(dest.relative_to(base_dir))
-            
-            # Guess mimetype
-            import mimetypes
-            mimetype = mimetypes.guess_type(str(dest))[0] or 'application/octet-stream'
-            
-            return {
-                'path': f"content/{rel_path}",
-                'checksum': checksum,
-                'size': stat.st_size,
-                'created': datetime.fromtimestamp(stat.st_mtime).astimezone().isoformat(),
-                'mimetype': mimetype,
-                'name': dest.name
-            }
+            if rel_path is None:
+                rel_path = str(Path(dest).relative_to(base_dir))
+            
+            return _file_info(f"content/{rel_path}", os.path.basename(dest), checksum, stat)
         except Exception as e:
             self._log(f"Error copying {src}: {e}", "ERROR")
             return None
     
+    def _find_schema(self, src_name: str) -> Optional[Path]:
+        """Locate a bundled XSD schema, or return None if it cannot be found."""
+        return _resolve_schema(src_name, self._base_path, Path.cwd())
+    
     def _copy_schema_files(self, sip_root: Path, admin_dir: Path) -> None:
         """Copy XSD schema files to the package."""
-        # Resolve schemas from bundled resources first (PyInstaller onefile/_MEIPASS),
-        # then fall back to executable/current directory for external overrides.
         schema_files = {
             'dias_mets.xsd': sip_root / 'mets.xsd',
             'dias_premis.xsd': admin_dir / 'DIAS_PREMIS.xsd'
         }
         
         for src_name, dest_path in schema_files.items():
-            candidate_paths = [
-                get_resource_path(src_name),
-                self._base_path / src_name,
-                Path.cwd() / src_name,
-            ]
-
-            src_path = next((p for p in candidate_paths if p.exists()), None)
+            src_path = self._find_schema(src_name)
             if src_path is None:
                 self._log(f"Schema not found: {src_name}, skipping", "WARNING")
                 self.logger.warning(f"Schema not found in any expected location: {src_name}")
                 continue
 
-            shutil.copy2(src_path, dest_path)
+            if not _copy_file_range(src_path, dest_path):
+                shutil.copyfile(src_path, dest_path)
+            shutil.copystat(src_path, dest_path)
             self._log(f"Copied schema: {dest_path.name}")
     
-    def _gather_sip_files_info(self, sip_root: Path) -> List[Dict]:
-        """Gather information about all files in the SIP for mets.xml."""
-        files_info = []
+    def _gather_sip_files_info(self, sip_root: Path,
+                               precomputed: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+        """
+        Gather information about all files in the SIP for mets.xml.
+        
+        The SIP is walked once; files are classified by their path relative to
+        sip_root. Files found in precomputed (keyed by normalized path relative
+        to sip_root) reuse the checksum computed while copying instead of
+        being read again.
         
-        # Files to include in mets.xml fileSec
-        file_patterns = [
-            ('mets.xsd', 'mets.xsd'),
-            ('log.xml', 'log.xml'),
-            ('administrative/DIAS_PREMIS.xsd', 'administrative/DIAS_PREMIS.xsd'),
+        Args:
+            sip_root: Path to the SIP root directory.
+            precomputed: File information dictionaries from _process_source_files.
+            
+        Returns:
+            List of file information dictionaries, in mets.xml fileSec order.
+            
+        Raises:
+            OSError: If a file that is not in precomputed cannot be hashed.
+        """
+        precomputed = precomputed or {}
+        
+        # Directories whose files are all included, in this order
+        sections: Dict[str, List[WalkEntry]] = {'content': [], 'descriptive_metadata': []}
+        
+        regular_files = {}
+        for file_path, rel_path, stat in _walk_with_stat(str(sip_root)):
+            if not S_ISREG(stat.st_mode):
+                continue
+            regular_files[rel_path.replace(os.sep, '/')] = (file_path, rel_path, stat)
+            section, sep, _ = rel_path.partition(os.sep)
+            if sep and section in sections:
+                sections[section].append((file_path, rel_path, stat))
+        
+        # Fixed files keep the path spelling from _SIP_FILESEC_FILES
+        entries = [
+            (regular_files[name][0], name, regular_files[name][2])
+            for name in _SIP_FILESEC_FILES
+            if name in regular_files
         ]
+        for section_entries in sections.values():
+            entries.extend(section_entries)
         
-        for pattern, rel_path in file_patterns:
-            file_path = sip_root / pattern
-            if file_path.exists():
-                stat = file_path.stat()
-                import mimetypes
-                mimetype = mimetypes.guess_type(str(file_path))[0] or 'application/octet-stream'
-                
-                files_info.append({
-                    'path': rel_path,
-                    'checksum': calculate_sha256(str(file_path)),
-                    'size': stat.st_size,
-                    'created': datetime.fromtimestamp(stat.st_mtime).astimezone().isoformat(),
-                    'mimetype': mimetype,
-                    'name': file_path.name
-                })
-        
-        # Add content files
-        content_dir = sip_root / 'content'
-        if content_dir.exists():
-            for file_path in content_dir.rglob('*'):
-                if file_path.is_file():
-                    stat = file_path.stat()
-                    rel_path = file_path.relative_to(sip_root)
-                    import mimetypes
-                    mimetype = mimetypes.guess_type(str(file_path))[0] or 'application/octet-stream'
-                    
-                    files_info.append({
-                        'path': str(rel_path),
-                        'checksum': calculate_sha256(str(file_path)),
-                        'size': stat.st_size,
-                        'created': datetime.fromtimestamp(stat.st_mtime).astimezone().isoformat(),
-                        'mimetype': mimetype,
-                        'name': file_path.name
-                    })
-        
-        # Add descriptive metadata files
-        desc_dir = sip_root / 'descriptive_metadata'
-        if desc_dir.exists():
-            for file_path in desc_dir.rglob('*'):
-                if file_path.is_file():
-                    stat = file_path.stat()
-                    rel_path = file_path.relative_to(sip_root)
-                    import mimetypes
-                    mimetype = mimetypes.guess_type(str(file_path))[0] or 'application/octet-stream'
-                    
-                    files_info.append({
-                        'path': str(rel_path),
-                        'checksum': calculate_sha256(str(file_path)),
-                        'size': stat.st_size,
-                        'created': datetime.fromtimestamp(stat.st_mtime).astimezone().isoformat(),
-                        'mimetype': mimetype,
-                        'name': file_path.name
-                    })
+        files_info: List[Optional[Dict]] = []
+        pending = []
+        for file_path, rel_path, stat in entries:
+            known = precomputed.get(os.path.normpath(rel_path))
+            if known is not None:
+                files_info.append(dict(known, path=rel_path))
+            else:
+                # Hashed below in one batch; the slot keeps fileSec order
+                pending.append((len(files_info), file_path, rel_path, stat))
+                files_info.append(None)
         
-        return files_info
+        checksums = calculate_sha256_many([file_path for _, file_path, _, _ in pending])
+        for (index, file_path, rel_path, stat), checksum in zip(pending, checksums):
+            if checksum is None:
+                raise OSError(f"Could not calculate the checksum of {file_path}")
+            files_info[index] = _file_info(rel_path, os.path.basename(file_path), checksum, stat)
+        
+        # Every slot is filled by now
+        return [info for info in files_info if info is not None]
         
     def load_metadata_template(self, filepath: str) -> Dict[str, Any]:
         """
@@ -674,9 +1334,8 @@ class PackageController:
         Returns:
             Dictionary of metadata values.
         """
-        from ..dias_package_creator.metadata_handler import MetadataHandler
-        handler = MetadataHandler()
-        return handler.load_metadata_from_xml(filepath)
+        metadata: Dict[str, Any] = self.metadata_handler.load_metadata_from_xml(filepath)
+        return metadata
         
     def save_metadata_template(self, filepath: str, metadata: Dict[str, Any]):
         """
@@ -686,6 +1345,4 @@ class PackageController:
             filepath: Path to save the template.
             metadata: Metadata dictionary.
         """
-        from ..dias_package_creator.metadata_handler import MetadataHandler
-        handler = MetadataHandler()
-        handler.save_metadata_to_xml(filepath, metadata)
+        self.metadata_handler.save_metadata_to_xml(filepath, metadata)
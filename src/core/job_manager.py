@@ -3,104 +3,312 @@ Job Manager for DIAS Package Creator.
 Handles running long-running tasks in background threads.
 """
 
+import logging
+import os
 import queue
 import threading
-from typing import Callable, Optional, Tuple
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Package creation is I/O bound, so allow more jobs than cores
+_DEFAULT_MAX_JOBS = min(32, (os.cpu_count() or 1) * 2)
+# Finished jobs kept for wait() before the oldest are forgotten
+_JOB_HISTORY = 100
+# Log levels used by the GUI log panel, ordered like the logging module's
+_LEVEL_PRIORITY = {
+    'DEBUG': 10,
+    'INFO': 20,
+    'SUCCESS': 25,
+    'WARNING': 30,
+    'ERROR': 40,
+    'CRITICAL': 50,
+}
+
+# How often the Tk thread drains queued UI updates, and how many per tick
+_UI_POLL_MS = 50
+_UI_DRAIN_LIMIT = 500
+# Progress is redrawn at most this often; the latest skipped value is kept
+_PROGRESS_MIN_INTERVAL = 1 / 30
 
 
 class JobManager:
     """
     Manages background job execution to keep GUI responsive.
-    Uses threading to run heavy operations without blocking the UI.
+    Jobs run on a pool of persistent worker threads, so several can run at
+    once and no thread is created per job. Each job is tracked by a job id.
     """
     
-    def __init__(self) -> None:
-        """Initialize the job manager."""
-        self._current_thread: Optional[threading.Thread] = None
-        self._progress_callback: Optional[Callable[[float, str], None]] = None
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """
+        Initialize the job manager.
+        
+        Args:
+            max_workers: Maximum number of jobs run at the same time.
+                Defaults to twice the CPU count, capped at 32.
+        """
+        if max_workers is None:
+            max_workers = _DEFAULT_MAX_JOBS
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dias-job")
+        self._jobs: Dict[str, "Future[Tuple[bool, str]]"] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._jobs_lock = threading.Lock()
+        self._progress_callback: Optional[Callable[[float, Optional[str]], None]] = None
         self._log_callback: Optional[Callable[[str, str], None]] = None
-        self._result_queue: queue.Queue[Tuple[str, Tuple[bool, str]]] = queue.Queue()
-        self._is_running = False
-        self._cancel_requested = False
+        self._min_level = _LEVEL_PRIORITY['DEBUG']
+        # Cancel event of the most recent job; jobs read their own through _job_local
+        self._cancel_event = threading.Event()
+        self._last_job_id: Optional[str] = None
+        self._job_local = threading.local()
+        # Worker -> Tk thread hand-off, used once a root is attached
+        self._ui_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._root: Any = None
+        self._progress_lock = threading.Lock()
+        self._pending_progress: Optional[Tuple[float, Optional[str]]] = None
+        self._last_progress_emit = 0.0
         
-    def set_progress_callback(self, callback: Callable[[float, str], None]) -> None:
-        """Set callback for progress updates (called from worker thread)."""
+    def set_progress_callback(self, callback: Callable[[float, Optional[str]], None]) -> None:
+        """Set callback for progress updates (see attach_root for threading)."""
         self._progress_callback = callback
         
     def set_log_callback(self, callback: Callable[[str, str], None]) -> None:
-        """Set callback for log messages (called from worker thread)."""
+        """Set callback for log messages (see attach_root for threading)."""
         self._log_callback = callback
         
+    def set_min_level(self, level: str) -> None:
+        """
+        Drop log messages below the given level before they are dispatched.
+        
+        Args:
+            level: DEBUG, INFO, SUCCESS, WARNING, ERROR or CRITICAL.
+            
+        Raises:
+            ValueError: If the level is unknown.
+        """
+        try:
+            self._min_level = _LEVEL_PRIORITY[level.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown log level: {level}") from None
+        
+    def attach_root(self, root: Any) -> None:
+        """
+        Deliver callbacks on the Tk main thread from now on.
+        
+        Progress, log and completion callbacks are queued by the worker and
+        drained by a periodic root.after() poll, so the worker never calls
+        into Tk directly.
+        
+        Args:
+            root: The Tk root window (anything with an after() method).
+        """
+        self._root = root
+        root.after(_UI_POLL_MS, self._drain_ui_queue)
+        
+    def _post(self, kind: str, *payload: Any) -> None:
+        """Dispatch a UI update now, or queue it for the Tk thread."""
+        if self._root is None:
+            self._dispatch((kind,) + payload)
+        else:
+            self._ui_queue.put((kind,) + payload)
+            
+    def _dispatch(self, item: tuple) -> None:
+        """Invoke the callback for one queued UI update."""
+        kind = item[0]
+        if kind == 'progress':
+            if self._progress_callback:
+                self._progress_callback(item[1], item[2])
+        elif kind == 'log':
+            if self._log_callback:
+                self._log_callback(item[1], item[2])
+        else:
+            # 'done': (completion_callback, success, message)
+            item[1](item[2], item[3])
+            
+    def _dispatch_safely(self, item: tuple) -> None:
+        """Dispatch one queued UI update; a failing callback does not stop the drain."""
+        try:
+            self._dispatch(item)
+        except Exception:
+            logger.exception("UI callback for %r update failed", item[0])
+            
+    def _take_throttled_progress(self) -> Optional[tuple]:
+        """Remove and return the progress update held back by the throttle, if any."""
+        with self._progress_lock:
+            throttled, self._pending_progress = self._pending_progress, None
+        return ('progress',) + throttled if throttled else None
+            
+    def _drain_ui_queue(self) -> None:
+        """Deliver queued UI updates on the Tk thread, then poll again."""
+        try:
+            pending_progress = None
+            for _ in range(_UI_DRAIN_LIMIT):
+                try:
+                    item = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item[0] == 'progress':
+                    # Only the latest of consecutive progress updates is drawn
+                    pending_progress = item
+                    continue
+                if item[0] == 'done':
+                    # Progress held back by the throttle was reported before the
+                    # job finished, so it must not be drawn after completion
+                    throttled = self._take_throttled_progress()
+                    if throttled:
+                        pending_progress = throttled
+                if pending_progress:
+                    self._dispatch_safely(pending_progress)
+                    pending_progress = None
+                self._dispatch_safely(item)
+            throttled = self._take_throttled_progress()
+            if throttled:
+                # Reported after every progress update drained this tick
+                pending_progress = throttled
+            if pending_progress:
+                self._dispatch_safely(pending_progress)
+        finally:
+            self._root.after(_UI_POLL_MS, self._drain_ui_queue)
+        
     @property
     def is_running(self) -> bool:
-        """Check if a job is currently running."""
-        return self._is_running and self._current_thread is not None and self._current_thread.is_alive()
+        """Check if any job is currently running."""
+        with self._jobs_lock:
+            return any(not future.done() for future in self._jobs.values())
+            
+    def is_job_running(self, job_id: str) -> bool:
+        """Check if the given job is still running."""
+        with self._jobs_lock:
+            future = self._jobs.get(job_id)
+        return future is not None and not future.done()
         
     def start_job(self, target: Callable[..., Tuple[bool, str]], 
                   args: tuple = (), 
-                  completion_callback: Optional[Callable[[bool, str], None]] = None) -> None:
+                  completion_callback: Optional[Callable[[bool, str], None]] = None) -> str:
         """
         Start a job in a background thread.
         
         Args:
             target: The function to run. Must return (success: bool, message: str).
             args: Arguments to pass to the target function.
-            completion_callback: Called when job completes with (success, message).
+            completion_callback: Called when the job completes with
+                (success, message); see attach_root for threading.
+                
+        Returns:
+            The job id, for cancel_job(), is_job_running() and wait().
         """
-        if self.is_running:
-            if self._log_callback:
-                self._log_callback("A job is already running", "WARNING")
-            return
+        job_id = uuid.uuid4().hex
+        cancel_event = threading.Event()
+        
+        with self._jobs_lock:
+            # Forget the oldest finished jobs once the history is full
+            excess = len(self._jobs) + 1 - _JOB_HISTORY
+            if excess > 0:
+                finished = [j for j, f in self._jobs.items() if f.done()]
+                for old_id in finished[:excess]:
+                    del self._jobs[old_id]
+                    del self._cancel_events[old_id]
+            self._cancel_events[job_id] = cancel_event
+            self._cancel_event = cancel_event
+            self._last_job_id = job_id
+            self._jobs[job_id] = self._executor.submit(
+                self._run_job, target, args, completion_callback, cancel_event
+            )
+        return job_id
+        
+    def _run_job(self, target: Callable[..., Tuple[bool, str]], args: tuple,
+                 completion_callback: Optional[Callable[[bool, str], None]],
+                 cancel_event: threading.Event) -> Tuple[bool, str]:
+        """Run a job on the worker thread and report its result from there."""
+        self._job_local.cancel_event = cancel_event
+        try:
+            success, message = target(*args)
+        except Exception as e:
+            success, message = False, str(e)
+        finally:
+            # Worker threads are reused by later jobs
+            del self._job_local.cancel_event
+        if completion_callback:
+            # Queued behind the job's own log lines when a root is attached
+            self._post('done', completion_callback, success, message)
+        return success, message
+        
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Tuple[bool, str]:
+        """
+        Block until a job has finished.
+        
+        Args:
+            job_id: Id returned by start_job().
+            timeout: Maximum time to wait in seconds, or None for no limit.
             
-        self._is_running = True
-        self._cancel_requested = False
-        
-        def worker():
-            try:
-                result = target(*args)
-                self._result_queue.put(('success', result))
-            except Exception as e:
-                self._result_queue.put(('error', (False, str(e))))
-            finally:
-                self._is_running = False
-                
-        def monitor():
-            """Monitor the worker and call completion callback on main thread."""
-            worker_thread.join()
+        Returns:
+            The job's (success, message) result.
             
-            try:
-                status, result = self._result_queue.get_nowait()
-                success, message = result
-            except queue.Empty:
-                success, message = False, "Job completed without result"
-                
-            if completion_callback:
-                # Call completion callback
-                completion_callback(success, message)
-                
-        # Start worker thread
-        worker_thread = threading.Thread(target=worker, daemon=True)
-        worker_thread.start()
-        self._current_thread = worker_thread
-        
-        # Start monitor thread to handle completion
-        monitor_thread = threading.Thread(target=monitor, daemon=True)
-        monitor_thread.start()
+        Raises:
+            KeyError: If the job id is unknown or was already forgotten.
+            concurrent.futures.TimeoutError: If the timeout expires first.
+        """
+        return self._jobs[job_id].result(timeout)
         
-    def cancel_job(self) -> None:
+    def cancel_job(self, job_id: Optional[str] = None) -> None:
         """
-        Request cancellation of the current job.
-        Note: The job must check is_cancelled() periodically.
+        Request cancellation of a job.
+        Note: The job must check is_cancelled() or block in wait_or_cancel().
+        
+        Cancelling a job that has finished and been forgotten, or an
+        unknown id, does nothing.
+        
+        Args:
+            job_id: The job to cancel. Defaults to the most recently started job.
         """
-        self._cancel_requested = True
-        if self._log_callback:
-            self._log_callback("Cancellation requested...", "WARNING")
+        if job_id is None:
+            self._cancel_event.set()
+        else:
+            with self._jobs_lock:
+                cancel_event = self._cancel_events.get(job_id)
+            if cancel_event is not None:
+                cancel_event.set()
+        self.warning("Cancellation requested...")
+            
+    def _current_cancel_event(self) -> threading.Event:
+        """Cancel event of the job on this thread, else of the latest job."""
+        return getattr(self._job_local, 'cancel_event', self._cancel_event)
             
     def is_cancelled(self) -> bool:
-        """Check if cancellation has been requested."""
-        return self._cancel_requested
+        """Check if cancellation has been requested for the calling job."""
+        return self._current_cancel_event().is_set()
         
-    def update_progress(self, value: float, status: str = None):
+    def wait_or_cancel(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sleep for up to timeout seconds, waking early on cancellation.
+        
+        Args:
+            timeout: Maximum time to wait, or None to wait until cancelled.
+            
+        Returns:
+            True if cancellation was requested, False if the timeout expired.
+        """
+        return self._current_cancel_event().wait(timeout)
+        
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker threads.
+        
+        Running jobs are asked to cancel, so with wait=True this returns once
+        every job reaches its next cancellation check.
+        
+        Args:
+            wait: Block until the worker threads have exited.
+        """
+        with self._jobs_lock:
+            self._cancel_event.set()
+            for event in self._cancel_events.values():
+                event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        
+    def update_progress(self, value: float, status: Optional[str] = None) -> None:
         """
         Update progress (thread-safe).
         
@@ -108,10 +316,20 @@ class JobManager:
             value: Progress value (0-100).
             status: Optional status message.
         """
-        if self._progress_callback:
-            # Note: tkinter requires updates from main thread
-            # In a real app, you'd use after() or a queue
-            self._progress_callback(value, status)
+        if not self._progress_callback:
+            return
+        if self._root is None:
+            self._dispatch(('progress', value, status))
+            return
+        now = time.monotonic()
+        with self._progress_lock:
+            # Completion is never held back; the drain picks up skipped values
+            if value < 100 and now - self._last_progress_emit < _PROGRESS_MIN_INTERVAL:
+                self._pending_progress = (value, status)
+                return
+            self._last_progress_emit = now
+            self._pending_progress = None
+        self._ui_queue.put(('progress', value, status))
             
     def log(self, message: str, level: str = "INFO"):
         """
@@ -121,5 +339,35 @@ class JobManager:
             message: The message to log.
             level: Log level.
         """
-        if self._log_callback:
-            self._log_callback(message, level)
+        if not self.is_enabled_for(level):
+            return
+        self._post('log', message, level)
+        
+    def is_enabled_for(self, level: str) -> bool:
+        """
+        Check whether a message at the given level would be delivered.
+        
+        Lets callers skip building expensive messages that would be dropped.
+        
+        Args:
+            level: Log level.
+        """
+        # Unknown levels are treated like INFO
+        return (self._log_callback is not None
+                and _LEVEL_PRIORITY.get(level, 20) >= self._min_level)
+        
+    def debug(self, message: str) -> None:
+        """Log a DEBUG message."""
+        self.log(message, "DEBUG")
+        
+    def info(self, message: str) -> None:
+        """Log an INFO message."""
+        self.log(message, "INFO")
+        
+    def warning(self, message: str) -> None:
+        """Log a WARNING message."""
+        self.log(message, "WARNING")
+        
+    def error(self, message: str) -> None:
+        """Log an ERROR message."""
+        self.log(message, "ERROR")
@@ -4,10 +4,8 @@ XML generation components for DIAS packages.
 Includes DIAS-compliant METS, PREMIS, and Info XML generators.
 """
 
-from .dias_xml_generators import DIASInfoGenerator, DIASMetsGenerator, DIASLogGenerator
-from .metadata_handler import MetadataHandler
-from .package_validator import DIASPackageValidator, PackageValidationResult
-from .package_inspector import DIASPackageInspector, PackageDescription
+import importlib
+import sys
 
 __all__ = [
     'DIASInfoGenerator',
@@ -18,4 +16,38 @@ __all__ = [
     'PackageValidationResult',
     'DIASPackageInspector',
     'PackageDescription'
-]
\ No newline at end of file
+]
+
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    'DIASInfoGenerator': '.dias_xml_generators',
+    'DIASMetsGenerator': '.dias_xml_generators',
+    'DIASLogGenerator': '.dias_xml_generators',
+    'MetadataHandler': '.metadata_handler',
+    'DIASPackageValidator': '.package_validator',
+    'PackageValidationResult': '.package_validator',
+    'DIASPackageInspector': '.package_inspector',
+    'PackageDescription': '.package_inspector',
+}
+
+# Exports are imported on first attribute access (PEP 562), so importing one
+# submodule does not load the validator and inspector as well.
+# Frozen builds load everything from one archive anyway, so import eagerly.
+if getattr(sys, 'frozen', False):
+    from .dias_xml_generators import DIASInfoGenerator, DIASMetsGenerator, DIASLogGenerator
+    from .metadata_handler import MetadataHandler
+    from .package_validator import DIASPackageValidator, PackageValidationResult
+    from .package_inspector import DIASPackageInspector, PackageDescription
+else:
+    def __getattr__(name):
+        """Import lazily exported names on first access."""
+        if name in _LAZY_IMPORTS:
+            module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+            value = getattr(module, name)
+            # Cache on the module so later lookups bypass __getattr__
+            globals()[name] = value
+            return value
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -4,14 +4,19 @@ Based on the DIAS package structure from Norwegian archives.
 """
 
 import hashlib
+import itertools
 import logging
 import mimetypes
+import mmap
 import os
-import uuid
+import sys
+import threading
+import time
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Sequence, Set, Tuple, Union
 
 from ..utils.env_config import config
 
@@ -19,6 +24,129 @@ from ..utils.env_config import config
 logger = logging.getLogger(__name__)
 
 VALID_PACKAGE_TYPES = {"SIP", "AIP", "DIP", "AIU", "AIC"}
+# Record statuses that refer to an earlier package
+RELATED_RECORD_STATUSES = {"SUPPLEMENT", "REPLACEMENT"}
+
+# Files at least this large are hashed through mmap instead of a read loop;
+# smaller ones take only a few SHA256_CHUNK_SIZE reads, cheaper than mapping
+MMAP_HASH_THRESHOLD = 4 * 1024 * 1024
+
+# Worker threads used by calculate_sha256_many
+_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+# SHA-256 of files seen in this process, keyed by _checksum_key(stat), so a
+# regenerated package does not hash unchanged files again
+_CHECKSUM_CACHE: Dict[tuple, str] = {}
+_CHECKSUM_CACHE_SIZE = 100_000
+_CHECKSUM_CACHE_LOCK = threading.Lock()
+# Files changed this recently are not cached: with coarse timestamps a
+# same-size rewrite in the same tick would keep the same stat (as in git)
+_CHECKSUM_RACY_NS = 2_000_000_000
+
+# generate_uuid reads random bytes for this many UUIDs at a time, per thread
+_UUID_BATCH = 256
+_uuid_pool = threading.local()
+# Hex digit holding the variant bits -> same digit with the variant set to 10xx
+_UUID_VARIANT = {digit: format(int(digit, 16) & 0x3 | 0x8, 'x') for digit in '0123456789abcdef'}
+
+# guess_mimetype results keyed by the file name's last two suffixes
+_MIME_CACHE: Dict[str, str] = {}
+
+NS_METS = 'http://www.loc.gov/METS/'
+NS_XLINK = 'http://www.w3.org/1999/xlink'
+NS_XSI = 'http://www.w3.org/2001/XMLSchema-instance'
+NS_PREMIS = 'http://arkivverket.no/standarder/PREMIS'
+
+
+def _qname(namespace: str, local: str) -> str:
+    """Build an interned {namespace}local tag name."""
+    return sys.intern(f"{{{namespace}}}{local}")
+
+
+# Prefixes the generators register for their namespaces, used by serialize_xml
+_NS_PREFIXES = {NS_METS: 'mets', NS_XLINK: 'xlink', NS_XSI: 'xsi', NS_PREMIS: 'premis'}
+# {uri}local name -> (prefix:local, uri), filled by _qualify
+_QUALIFIED_NAMES: Dict[str, Tuple[str, Optional[str]]] = {}
+_XML_DECLARATION = "<?xml version='1.0' encoding='UTF-8'?>\n"
+
+# Tag and attribute names used by the generators, built once at import
+METS_METS = _qname(NS_METS, "mets")
+METS_METS_HDR = _qname(NS_METS, "metsHdr")
+METS_METS_DOCUMENT_ID = _qname(NS_METS, "metsDocumentID")
+METS_AGENT = _qname(NS_METS, "agent")
+METS_NAME = _qname(NS_METS, "name")
+METS_ALT_RECORD_ID = _qname(NS_METS, "altRecordID")
+METS_FILE_SEC = _qname(NS_METS, "fileSec")
+METS_FILE_GRP = _qname(NS_METS, "fileGrp")
+METS_FILE = _qname(NS_METS, "file")
+METS_FLOCAT = _qname(NS_METS, "FLocat")
+METS_STRUCT_MAP = _qname(NS_METS, "structMap")
+METS_DIV = _qname(NS_METS, "div")
+METS_FPTR = _qname(NS_METS, "fptr")
+METS_AMD_SEC = _qname(NS_METS, "amdSec")
+METS_DIGIPROV_MD = _qname(NS_METS, "digiprovMD")
+METS_MD_REF = _qname(NS_METS, "mdRef")
+
+XLINK_HREF = _qname(NS_XLINK, "href")
+XLINK_TYPE = _qname(NS_XLINK, "type")
+
+XSI_SCHEMA_LOCATION = _qname(NS_XSI, "schemaLocation")
+XSI_TYPE = _qname(NS_XSI, "type")
+
+PREMIS_PREMIS = _qname(NS_PREMIS, "premis")
+PREMIS_OBJECT = _qname(NS_PREMIS, "object")
+PREMIS_OBJECT_IDENTIFIER = _qname(NS_PREMIS, "objectIdentifier")
+PREMIS_OBJECT_IDENTIFIER_TYPE = _qname(NS_PREMIS, "objectIdentifierType")
+PREMIS_OBJECT_IDENTIFIER_VALUE = _qname(NS_PREMIS, "objectIdentifierValue")
+PREMIS_PRESERVATION_LEVEL = _qname(NS_PREMIS, "preservationLevel")
+PREMIS_PRESERVATION_LEVEL_VALUE = _qname(NS_PREMIS, "preservationLevelValue")
+PREMIS_OBJECT_CHARACTERISTICS = _qname(NS_PREMIS, "objectCharacteristics")
+PREMIS_COMPOSITION_LEVEL = _qname(NS_PREMIS, "compositionLevel")
+PREMIS_FORMAT = _qname(NS_PREMIS, "format")
+PREMIS_FORMAT_DESIGNATION = _qname(NS_PREMIS, "formatDesignation")
+PREMIS_FORMAT_NAME = _qname(NS_PREMIS, "formatName")
+PREMIS_STORAGE = _qname(NS_PREMIS, "storage")
+PREMIS_STORAGE_MEDIUM = _qname(NS_PREMIS, "storageMedium")
+PREMIS_RELATIONSHIP = _qname(NS_PREMIS, "relationship")
+PREMIS_RELATIONSHIP_TYPE = _qname(NS_PREMIS, "relationshipType")
+PREMIS_RELATIONSHIP_SUB_TYPE = _qname(NS_PREMIS, "relationshipSubType")
+PREMIS_RELATED_OBJECT_IDENTIFICATION = _qname(NS_PREMIS, "relatedObjectIdentification")
+PREMIS_RELATED_OBJECT_IDENTIFIER_TYPE = _qname(NS_PREMIS, "relatedObjectIdentifierType")
+PREMIS_RELATED_OBJECT_IDENTIFIER_VALUE = _qname(NS_PREMIS, "relatedObjectIdentifierValue")
+PREMIS_SIGNIFICANT_PROPERTIES = _qname(NS_PREMIS, "significantProperties")
+PREMIS_SIGNIFICANT_PROPERTIES_TYPE = _qname(NS_PREMIS, "significantPropertiesType")
+PREMIS_SIGNIFICANT_PROPERTIES_VALUE = _qname(NS_PREMIS, "significantPropertiesValue")
+PREMIS_FIXITY = _qname(NS_PREMIS, "fixity")
+PREMIS_MESSAGE_DIGEST_ALGORITHM = _qname(NS_PREMIS, "messageDigestAlgorithm")
+PREMIS_MESSAGE_DIGEST = _qname(NS_PREMIS, "messageDigest")
+PREMIS_MESSAGE_DIGEST_ORIGINATOR = _qname(NS_PREMIS, "messageDigestOriginator")
+PREMIS_SIZE = _qname(NS_PREMIS, "size")
+PREMIS_CONTENT_LOCATION = _qname(NS_PREMIS, "contentLocation")
+PREMIS_CONTENT_LOCATION_TYPE = _qname(NS_PREMIS, "contentLocationType")
+PREMIS_CONTENT_LOCATION_VALUE = _qname(NS_PREMIS, "contentLocationValue")
+PREMIS_EVENT = _qname(NS_PREMIS, "event")
+PREMIS_EVENT_IDENTIFIER = _qname(NS_PREMIS, "eventIdentifier")
+PREMIS_EVENT_IDENTIFIER_TYPE = _qname(NS_PREMIS, "eventIdentifierType")
+PREMIS_EVENT_IDENTIFIER_VALUE = _qname(NS_PREMIS, "eventIdentifierValue")
+PREMIS_EVENT_TYPE = _qname(NS_PREMIS, "eventType")
+PREMIS_EVENT_DATE_TIME = _qname(NS_PREMIS, "eventDateTime")
+PREMIS_EVENT_DETAIL = _qname(NS_PREMIS, "eventDetail")
+PREMIS_EVENT_OUTCOME_INFORMATION = _qname(NS_PREMIS, "eventOutcomeInformation")
+PREMIS_EVENT_OUTCOME = _qname(NS_PREMIS, "eventOutcome")
+PREMIS_EVENT_OUTCOME_DETAIL = _qname(NS_PREMIS, "eventOutcomeDetail")
+PREMIS_EVENT_OUTCOME_DETAIL_NOTE = _qname(NS_PREMIS, "eventOutcomeDetailNote")
+PREMIS_LINKING_AGENT_IDENTIFIER = _qname(NS_PREMIS, "linkingAgentIdentifier")
+PREMIS_LINKING_AGENT_IDENTIFIER_TYPE = _qname(NS_PREMIS, "linkingAgentIdentifierType")
+PREMIS_LINKING_AGENT_IDENTIFIER_VALUE = _qname(NS_PREMIS, "linkingAgentIdentifierValue")
+PREMIS_LINKING_OBJECT_IDENTIFIER = _qname(NS_PREMIS, "linkingObjectIdentifier")
+PREMIS_LINKING_OBJECT_IDENTIFIER_TYPE = _qname(NS_PREMIS, "linkingObjectIdentifierType")
+PREMIS_LINKING_OBJECT_IDENTIFIER_VALUE = _qname(NS_PREMIS, "linkingObjectIdentifierValue")
+PREMIS_AGENT = _qname(NS_PREMIS, "agent")
+PREMIS_AGENT_IDENTIFIER = _qname(NS_PREMIS, "agentIdentifier")
+PREMIS_AGENT_IDENTIFIER_TYPE = _qname(NS_PREMIS, "agentIdentifierType")
+PREMIS_AGENT_IDENTIFIER_VALUE = _qname(NS_PREMIS, "agentIdentifierValue")
+PREMIS_AGENT_NAME = _qname(NS_PREMIS, "agentName")
+PREMIS_AGENT_TYPE = _qname(NS_PREMIS, "agentType")
 
 
 def resolve_package_type(metadata: Dict[str, Any]) -> str:
@@ -28,13 +156,18 @@ def resolve_package_type(metadata: Dict[str, Any]) -> str:
     return package_type if package_type in VALID_PACKAGE_TYPES else 'SIP'
 
 
+def resolve_record_status(metadata: Dict[str, Any]) -> str:
+    """Resolve and normalize the record status, defaulting to NEW."""
+    return str(metadata.get('record_status', 'NEW')).strip().upper()
+
+
 def resolve_record_relation_type(metadata: Dict[str, Any]) -> str:
     """Resolve semantic relation type for supplement/replacement records."""
     relation_type = str(metadata.get('relation_type', '')).strip().lower()
     if relation_type:
         return relation_type
 
-    record_status = str(metadata.get('record_status', 'NEW')).strip().upper()
+    record_status = resolve_record_status(metadata)
     return {
         'SUPPLEMENT': 'supplements',
         'REPLACEMENT': 'replaces'
@@ -46,39 +179,437 @@ def get_timestamp() -> str:
     return datetime.now().astimezone().isoformat()
 
 
+def _reset_uuid_pool() -> None:
+    """Drop the random bytes buffered for generate_uuid."""
+    global _uuid_pool
+    _uuid_pool = threading.local()
+
+
+if hasattr(os, 'register_at_fork'):
+    # A forked child must not hand out the UUIDs left in its parent's buffer
+    os.register_at_fork(after_in_child=_reset_uuid_pool)
+
+
 def generate_uuid() -> str:
-    """Generate a new random UUID (uuid4 avoids leaking MAC address)."""
-    return str(uuid.uuid4())
+    """
+    Generate a new random UUID (uuid4 avoids leaking MAC address).
+    
+    Same result as str(uuid.uuid4()), but the random bytes are read from
+    os.urandom for _UUID_BATCH UUIDs at a time, per thread, and formatted
+    without building a uuid.UUID.
+    """
+    pool = _uuid_pool
+    index = getattr(pool, 'index', _UUID_BATCH)
+    if index >= _UUID_BATCH:
+        pool.hex = os.urandom(16 * _UUID_BATCH).hex()
+        index = 0
+    pool.index = index + 1
+    h = pool.hex[index * 32:index * 32 + 32]
+    # Set the version (4) and RFC 4122 variant bits like uuid.uuid4() does
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{_UUID_VARIANT[h[16]]}{h[17:20]}-{h[20:]}"
+
+
+def guess_mimetype(path) -> str:
+    """
+    Guess a file's MIME type from its name, defaulting to application/octet-stream.
+    
+    Same result as mimetypes.guess_type, which only looks at the name's last
+    suffix plus one compression suffix (e.g. .tar.gz), so results are cached
+    per suffix pair.
+    """
+    # The last two of Path(path).suffixes, without building a Path per file
+    name = os.path.basename(os.fspath(path))
+    if name.endswith('.'):
+        key = ''
+    else:
+        key = ''.join('.' + suffix for suffix in name.lstrip('.').split('.')[1:][-2:])
+    mimetype = _MIME_CACHE.get(key)
+    if mimetype is None:
+        mimetype = mimetypes.guess_type('file' + key)[0] or 'application/octet-stream'
+        _MIME_CACHE[key] = mimetype
+    return mimetype
+
+
+def _format_name(path: str) -> str:
+    """
+    PREMIS formatName for a file: its lowercased extension, or 'unknown'.
+    
+    Same result as os.path.splitext(path)[1].lstrip('.').lower(), which also
+    ignores leading dots (.bashrc has no extension), in fewer calls per file.
+    """
+    _, dot, ext = os.path.basename(path).lstrip('.').rpartition('.')
+    return ext.lower() if dot and ext else 'unknown'
+
+
+def serialize_xml(element, space: str) -> bytes:
+    """
+    Indent and serialize an XML element as a UTF-8 document with declaration.
+    
+    Produces the same bytes as ET.indent() followed by ET.tostring(), but
+    indents while writing in a single pass and leaves the element untouched.
+    Trees the generators never build (comments, foreign namespaces, mixed
+    content) go through ElementTree instead.
+    """
+    try:
+        parts = _render_document(element, space)
+    except _NotRenderable:
+        ET.indent(element, space=space, level=0)
+        data: bytes = ET.tostring(element, encoding='UTF-8', xml_declaration=True)
+        return data
+    return "".join(parts).encode("utf-8", "xmlcharrefreplace")
+
+
+def write_xml(element, output_path, space: str) -> bytes:
+    """
+    Serialize an XML element, write it to output_path and return the bytes.
+    
+    Returning the serialized document lets callers hash it without reading
+    the file back.
+    """
+    data = serialize_xml(element, space)
+    with open(output_path, 'wb') as f:
+        f.write(data)
+    return data
+
+
+def stream_xml(element, output_path, space: str) -> Tuple[str, int]:
+    """
+    Write the document serialize_xml would produce, one top-level child at a
+    time, and return its SHA-256 hex digest and size in bytes.
+    
+    The serialized text of a large log.xml takes several times the file size
+    in memory; here only one child's worth is held at once.
+    """
+    sha256_hash = hashlib.sha256()
+    size = 0
+    with open(output_path, 'wb') as f:
+        try:
+            for chunk in _iter_document(element, space):
+                data = chunk.encode("utf-8", "xmlcharrefreplace")
+                f.write(data)
+                sha256_hash.update(data)
+                size += len(data)
+        except _NotRenderable:
+            # Mixed content is only found while rendering; start over with ET
+            data = serialize_xml(element, space)
+            f.seek(0)
+            f.truncate()
+            f.write(data)
+            return hashlib.sha256(data).hexdigest(), len(data)
+    return sha256_hash.hexdigest(), size
+
+
+def _escape_attr(value: str) -> str:
+    """Escape an attribute value exactly as ElementTree's serializer does."""
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    if "\"" in value:
+        value = value.replace("\"", "&quot;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+
+def _escape_text(value: str) -> str:
+    """Escape element text exactly as ElementTree's serializer does."""
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    return value
+
+
+class _NotRenderable(Exception):
+    """Raised when a tree needs ElementTree's own serializer."""
+
+
+def _qualify(name: str, used: Set[str]) -> str:
+    """Turn a {uri}local name into prefix:local and note its namespace as used."""
+    qualified = _QUALIFIED_NAMES.get(name)
+    if qualified is None:
+        if not isinstance(name, str):
+            raise _NotRenderable(name)
+        if name[:1] == "{":
+            uri, local = name[1:].split("}", 1)
+            if uri not in _NS_PREFIXES:
+                raise _NotRenderable(uri)
+            qualified = (f"{_NS_PREFIXES[uri]}:{local}", uri)
+        else:
+            qualified = (name, None)
+        _QUALIFIED_NAMES[name] = qualified
+    qualified_name, namespace = qualified
+    if namespace is not None:
+        used.add(namespace)
+    return qualified_name
+
+
+def _prefix_order(uri: str) -> str:
+    """Sort key for namespace declarations: ElementTree writes them in prefix order."""
+    return _NS_PREFIXES[uri]
+
+
+def _render_element(element, level: int, space: str, parts: List[str], used: Set[str]) -> None:
+    """Append element to parts as ET.indent() + ET.tostring() would write it at this depth."""
+    indent = "\n" + space * level
+    tag = _qualify(element.tag, used)
+    attrs = "".join(
+        f' {_qualify(key, used)}="{_escape_attr(value)}"' for key, value in element.items()
+    )
+    text = element.text
+    if len(element):
+        # ET.indent only replaces whitespace, so real mixed content is left to ET
+        if text and text.strip():
+            raise _NotRenderable(tag)
+        parts.append(f"{indent}<{tag}{attrs}>")
+        for child in element:
+            if child.tail and child.tail.strip():
+                raise _NotRenderable(tag)
+            _render_element(child, level + 1, space, parts, used)
+        parts.append(f"{indent}</{tag}>")
+    elif text:
+        parts.append(f"{indent}<{tag}{attrs}>{_escape_text(text)}</{tag}>")
+    else:
+        parts.append(f"{indent}<{tag}{attrs} />")
+
+
+def _render_document(element, space: str) -> List[str]:
+    """Render element as an indented document; raises _NotRenderable if unsupported."""
+    if element.tail:
+        raise _NotRenderable(element.tag)
+    used: Set[str] = set()
+    parts = [_XML_DECLARATION]
+    _render_element(element, 0, space, parts, used)
+    # Like ElementTree, declare every namespace used in the tree on the root,
+    # sorted by prefix, and drop the newline written before the root
+    tag = _qualify(element.tag, used)
+    declarations = "".join(
+        f' xmlns:{_NS_PREFIXES[uri]}="{_escape_attr(uri)}"'
+        for uri in sorted(used, key=_prefix_order)
+    )
+    parts[1] = f"<{tag}{declarations}" + parts[1][len(tag) + 2:]
+    return parts
+
+
+def _iter_document(element, space: str) -> Iterator[str]:
+    """
+    Yield the chunks of _render_document(element, space), one per top-level child.
+    
+    The root start tag declares every namespace in the tree, so all names are
+    qualified up front; mixed content raises _NotRenderable only once reached.
+    """
+    if element.tail:
+        raise _NotRenderable(element.tag)
+    # Distinct names only: qualifying every element's tag costs far more
+    names: Set[str] = set()
+    for elem in element.iter():
+        names.add(elem.tag)
+        keys = elem.keys()
+        if keys:
+            names.update(keys)
+    used: Set[str] = set()
+    for name in names:
+        _qualify(name, used)
+    if not len(element):
+        yield "".join(_render_document(element, space))
+        return
+    tag = _qualify(element.tag, used)
+    if element.text and element.text.strip():
+        raise _NotRenderable(tag)
+    declarations = "".join(
+        f' xmlns:{_NS_PREFIXES[uri]}="{_escape_attr(uri)}"'
+        for uri in sorted(used, key=_prefix_order)
+    )
+    attrs = "".join(
+        f' {_qualify(key, used)}="{_escape_attr(value)}"' for key, value in element.items()
+    )
+    yield f"{_XML_DECLARATION}<{tag}{declarations}{attrs}>"
+    for child in element:
+        if child.tail and child.tail.strip():
+            raise _NotRenderable(tag)
+        parts: List[str] = []
+        _render_element(child, 1, space, parts, used)
+        yield "".join(parts)
+    yield f"\n</{tag}>"
+
+
+def _hash_mapped(fileno: int, sha256_hash) -> bool:
+    """Feed a whole file to sha256_hash through mmap; False if it cannot be mapped."""
+    try:
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+            advice = getattr(mmap, 'MADV_SEQUENTIAL', None)
+            if advice is not None:
+                mapped.madvise(advice)
+            sha256_hash.update(mapped)
+        return True
+    except (OSError, ValueError, OverflowError):
+        return False
+
+
+def _checksum_key(st: os.stat_result) -> Optional[tuple]:
+    """Identify a file's current contents by its stat, or None if it cannot be."""
+    if not st.st_ino:
+        # Filesystems without stable inode numbers
+        return None
+    # ctime changes on every write and cannot be set from user space
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+def cached_sha256(st: os.stat_result) -> Optional[str]:
+    """Return the remembered SHA-256 of the file described by st, if any."""
+    key = _checksum_key(st)
+    return _CHECKSUM_CACHE.get(key) if key is not None else None
+
+
+def remember_sha256(st: os.stat_result, checksum: str) -> None:
+    """Remember the SHA-256 of the file described by st (taken before reading it)."""
+    key = _checksum_key(st)
+    if key is None or time.time_ns() - max(st.st_mtime_ns, st.st_ctime_ns) < _CHECKSUM_RACY_NS:
+        return
+    with _CHECKSUM_CACHE_LOCK:
+        if len(_CHECKSUM_CACHE) >= _CHECKSUM_CACHE_SIZE:
+            # Evict the oldest entry
+            del _CHECKSUM_CACHE[next(iter(_CHECKSUM_CACHE))]
+        _CHECKSUM_CACHE[key] = checksum
 
 
 def calculate_sha256(file_path: str | Path) -> Optional[str]:
     """
     Calculate SHA-256 checksum for a file using streaming to avoid memory issues.
     Uses configurable chunk size for optimal performance with large files.
+    
+    Files of at least MMAP_HASH_THRESHOLD bytes are memory-mapped and hashed in
+    a single update, letting the kernel page data in without copying it to
+    user space. Smaller files, and files that cannot be mapped, are read
+    unbuffered into one reused buffer. A file whose stat is unchanged since
+    it was last hashed is not read again.
     """
     sha256_hash = hashlib.sha256()
     chunk_size = config.SHA256_CHUNK_SIZE
-    path = Path(file_path)
+    # Called once per file, so skip formatting debug messages nobody sees
+    debug = logger.isEnabledFor(logging.DEBUG)
     
     try:
-        file_size = path.stat().st_size
-        logger.debug(f"Calculating SHA-256 for {file_path} ({file_size / (1024*1024):.2f} MB)")
-        
-        with open(file_path, "rb") as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                sha256_hash.update(chunk)
+        with open(file_path, "rb", buffering=0) as f:
+            st = os.fstat(f.fileno())
+            checksum = cached_sha256(st)
+            if checksum is not None:
+                return checksum
+            
+            file_size = st.st_size
+            if debug:
+                logger.debug(f"Calculating SHA-256 for {file_path} ({file_size / (1024*1024):.2f} MB)")
+            
+            if file_size < MMAP_HASH_THRESHOLD or not _hash_mapped(f.fileno(), sha256_hash):
+                if hasattr(os, 'posix_fadvise'):
+                    # Hint the kernel to read ahead aggressively
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                
+                buffer = memoryview(bytearray(min(chunk_size, max(file_size, 1))))
+                while True:
+                    n = f.readinto(buffer)
+                    if not n:
+                        break
+                    sha256_hash.update(buffer[:n])
         
         checksum = sha256_hash.hexdigest()
-        logger.debug(f"SHA-256 calculated: {checksum[:16]}...")
+        remember_sha256(st, checksum)
+        if debug:
+            logger.debug(f"SHA-256 calculated: {checksum[:16]}...")
         return checksum
     except Exception as e:
         logger.error(f"Failed to calculate SHA-256 for {file_path}: {e}")
         return None
 
 
+def calculate_sha256_many(file_paths: Sequence[Union[str, Path]]) -> List[Optional[str]]:
+    """
+    Calculate SHA-256 checksums for several files, in input order.
+    
+    hashlib releases the GIL while hashing, so the files are hashed in
+    parallel on a thread pool. Each entry is what calculate_sha256 returns
+    for that file (None if it could not be read).
+    """
+    if len(file_paths) < 2:
+        return [calculate_sha256(path) for path in file_paths]
+    
+    with ThreadPoolExecutor(max_workers=min(_HASH_WORKERS, len(file_paths))) as executor:
+        return list(executor.map(calculate_sha256, file_paths))
+
+
+# metsHdr agents in DIAS order:
+# (metadata key, TYPE, ROLE, OTHERTYPE, OTHERROLE)
+_AGENT_SPEC = (
+    ('archivist_organization', "ORGANIZATION", "ARCHIVIST", None, None),
+    ('system_name', "OTHER", "ARCHIVIST", "SOFTWARE", None),
+    ('system_version', "OTHER", "ARCHIVIST", "SOFTWARE", None),
+    ('system_format', "OTHER", "ARCHIVIST", "SOFTWARE", None),
+    ('creator_organization', "ORGANIZATION", "CREATOR", None, None),
+    ('producer_organization', "ORGANIZATION", "OTHER", None, "PRODUCER"),
+    ('producer_individual', "INDIVIDUAL", "OTHER", None, "PRODUCER"),
+    ('producer_software', "OTHER", "OTHER", "SOFTWARE", "PRODUCER"),
+    ('submitter_organization', "ORGANIZATION", "OTHER", None, "SUBMITTER"),
+    ('submitter_individual', "INDIVIDUAL", "OTHER", None, "SUBMITTER"),
+    ('ipowner_organization', "ORGANIZATION", "IPOWNER", None, None),
+    ('preservation_organization', "ORGANIZATION", "PRESERVATION", None, None),
+)
+
+# altRecordID TYPE per metadata key; the related ones are only written for
+# supplements and replacements
+_ALT_RECORD_SPEC = (
+    ('submission_agreement', "SUBMISSIONAGREEMENT"),
+    ('start_date', "STARTDATE"),
+    ('end_date', "ENDDATE"),
+)
+_RELATED_RECORD_SPEC = (
+    ('related_aic_id', "RELATEDAIC"),
+    ('related_package_id', "RELATEDPACKAGE"),
+)
+
+
+def _add_agents(mets_hdr, metadata) -> None:
+    """Add an agent element to metsHdr for every agent set in the metadata."""
+    for key, agent_type, role, othertype, otherrole in _AGENT_SPEC:
+        name = metadata.get(key)
+        if not name:
+            continue
+        agent = ET.SubElement(mets_hdr, METS_AGENT)
+        agent.set("TYPE", agent_type)
+        if othertype:
+            agent.set("OTHERTYPE", othertype)
+        agent.set("ROLE", role)
+        if otherrole:
+            agent.set("OTHERROLE", otherrole)
+        ET.SubElement(agent, METS_NAME).text = name
+
+
+def _add_alt_record_ids(mets_hdr, metadata) -> None:
+    """Add altRecordID elements to metsHdr."""
+    spec: Tuple[Tuple[str, str], ...] = _ALT_RECORD_SPEC
+    is_related = resolve_record_status(metadata) in RELATED_RECORD_STATUSES
+    if is_related:
+        spec += _RELATED_RECORD_SPEC
+    
+    for key, record_type in spec:
+        value = metadata.get(key)
+        if value:
+            ET.SubElement(mets_hdr, METS_ALT_RECORD_ID, TYPE=record_type).text = value
+    
+    if is_related:
+        relation_type = resolve_record_relation_type(metadata)
+        if relation_type:
+            ET.SubElement(mets_hdr, METS_ALT_RECORD_ID, TYPE="RELATIONTYPE").text = relation_type
+
+
 class DIASInfoGenerator:
     """
     Generator for info.xml (AIC-level METS) file.
@@ -86,9 +617,9 @@ class DIASInfoGenerator:
     """
     
     NAMESPACES = {
-        'mets': 'http://www.loc.gov/METS/',
-        'xlink': 'http://www.w3.org/1999/xlink',
-        'xsi': 'http://www.w3.org/2001/XMLSchema-instance'
+        'mets': NS_METS,
+        'xlink': NS_XLINK,
+        'xsi': NS_XSI
     }
     
     def __init__(self):
@@ -106,13 +637,13 @@ class DIASInfoGenerator:
             aic_uuid: UUID of the AIC wrapper
             tar_file_info: Information about the tar file (checksum, size, etc.)
         """
-        mets_ns = self.NAMESPACES['mets']
-        xlink_ns = self.NAMESPACES['xlink']
-        xsi_ns = self.NAMESPACES['xsi']
+        
+        # One timestamp for the whole document
+        timestamp = get_timestamp()
         
         # Create root METS element
-        root = ET.Element(f"{{{mets_ns}}}mets")
-        root.set(f"{{{xsi_ns}}}schemaLocation", config.METS_INFO_SCHEMA_LOCATION)
+        root = ET.Element(METS_METS)
+        root.set(XSI_SCHEMA_LOCATION, config.METS_INFO_SCHEMA_LOCATION)
         root.set("PROFILE", config.METS_PROFILE)
         root.set("LABEL", metadata.get('label', ''))
         root.set("TYPE", resolve_package_type(metadata))
@@ -120,192 +651,81 @@ class DIASInfoGenerator:
         root.set("OBJID", f"UUID:{aip_uuid}")
         
         # Create metsHdr
-        self._create_mets_header(root, metadata, mets_ns)
+        self._create_mets_header(root, metadata, timestamp)
         
         # Create fileSec (reference to the tar archive)
         if tar_file_info:
-            self._create_file_section(root, tar_file_info, aip_uuid, mets_ns, xlink_ns)
+            self._create_file_section(root, tar_file_info, aip_uuid, timestamp)
         
         # Create structMap
-        self._create_struct_map(root, tar_file_info, mets_ns)
+        self._create_struct_map(root, tar_file_info)
         
         return root
     
-    def _create_mets_header(self, root, metadata, mets_ns):
+    def _create_mets_header(self, root, metadata, timestamp):
         """Create the metsHdr element with all agents."""
-        mets_hdr = ET.SubElement(root, f"{{{mets_ns}}}metsHdr")
-        mets_hdr.set("CREATEDATE", get_timestamp())
+        mets_hdr = ET.SubElement(root, METS_METS_HDR)
+        mets_hdr.set("CREATEDATE", timestamp)
         mets_hdr.set("RECORDSTATUS", metadata.get('record_status', 'NEW'))
         
         # Add agents in the correct order as per DIAS specification
-        self._add_agents(mets_hdr, metadata, mets_ns)
+        _add_agents(mets_hdr, metadata)
         
         # Add altRecordID elements
-        self._add_alt_record_ids(mets_hdr, metadata, mets_ns)
+        _add_alt_record_ids(mets_hdr, metadata)
         
         # Add metsDocumentID
-        doc_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}metsDocumentID")
+        doc_id = ET.SubElement(mets_hdr, METS_METS_DOCUMENT_ID)
         doc_id.text = "info.xml"
     
-    def _add_agents(self, mets_hdr, metadata, mets_ns):
-        """Add all agent elements to metsHdr."""
-        # ARCHIVIST - Organization
-        if metadata.get('archivist_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "ARCHIVIST", 
-                          metadata['archivist_organization'])
-        
-        # ARCHIVIST - Software (system name)
-        if metadata.get('system_name'):
-            self._add_agent(mets_hdr, mets_ns, "OTHER", "ARCHIVIST", 
-                          metadata['system_name'], othertype="SOFTWARE")
-        
-        # ARCHIVIST - Software (version)
-        if metadata.get('system_version'):
-            self._add_agent(mets_hdr, mets_ns, "OTHER", "ARCHIVIST", 
-                          metadata['system_version'], othertype="SOFTWARE")
-        
-        # ARCHIVIST - Software (format)
-        if metadata.get('system_format'):
-            self._add_agent(mets_hdr, mets_ns, "OTHER", "ARCHIVIST", 
-                          metadata['system_format'], othertype="SOFTWARE")
-        
-        # CREATOR - Organization (IKA)
-        if metadata.get('creator_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "CREATOR", 
-                          metadata['creator_organization'])
-        
-        # PRODUCER - Organization
-        if metadata.get('producer_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "OTHER", 
-                          metadata['producer_organization'], otherrole="PRODUCER")
-        
-        # PRODUCER - Individual
-        if metadata.get('producer_individual'):
-            self._add_agent(mets_hdr, mets_ns, "INDIVIDUAL", "OTHER", 
-                          metadata['producer_individual'], otherrole="PRODUCER")
-        
-        # PRODUCER - Software
-        if metadata.get('producer_software'):
-            self._add_agent(mets_hdr, mets_ns, "OTHER", "OTHER", 
-                          metadata['producer_software'], othertype="SOFTWARE", otherrole="PRODUCER")
-        
-        # SUBMITTER - Organization
-        if metadata.get('submitter_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "OTHER", 
-                          metadata['submitter_organization'], otherrole="SUBMITTER")
-        
-        # SUBMITTER - Individual
-        if metadata.get('submitter_individual'):
-            self._add_agent(mets_hdr, mets_ns, "INDIVIDUAL", "OTHER", 
-                          metadata['submitter_individual'], otherrole="SUBMITTER")
-        
-        # IPOWNER - Organization
-        if metadata.get('ipowner_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "IPOWNER", 
-                          metadata['ipowner_organization'])
-        
-        # PRESERVATION - Organization
-        if metadata.get('preservation_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "PRESERVATION", 
-                          metadata['preservation_organization'])
-    
-    def _add_agent(self, parent, mets_ns, agent_type, role, name, othertype=None, otherrole=None):
-        """Add a single agent element."""
-        agent = ET.SubElement(parent, f"{{{mets_ns}}}agent")
-        agent.set("TYPE", agent_type)
-        if othertype:
-            agent.set("OTHERTYPE", othertype)
-        agent.set("ROLE", role)
-        if otherrole:
-            agent.set("OTHERROLE", otherrole)
-        
-        name_elem = ET.SubElement(agent, f"{{{mets_ns}}}name")
-        name_elem.text = name
-    
-    def _add_alt_record_ids(self, mets_hdr, metadata, mets_ns):
-        """Add altRecordID elements."""
-        # SUBMISSIONAGREEMENT
-        if metadata.get('submission_agreement'):
-            alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-            alt_id.set("TYPE", "SUBMISSIONAGREEMENT")
-            alt_id.text = metadata['submission_agreement']
-        
-        # STARTDATE
-        if metadata.get('start_date'):
-            alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-            alt_id.set("TYPE", "STARTDATE")
-            alt_id.text = metadata['start_date']
-        
-        # ENDDATE
-        if metadata.get('end_date'):
-            alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-            alt_id.set("TYPE", "ENDDATE")
-            alt_id.text = metadata['end_date']
-
-        record_status = str(metadata.get('record_status', 'NEW')).strip().upper()
-        if record_status in {'SUPPLEMENT', 'REPLACEMENT'}:
-            if metadata.get('related_aic_id'):
-                alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-                alt_id.set("TYPE", "RELATEDAIC")
-                alt_id.text = metadata['related_aic_id']
-
-            if metadata.get('related_package_id'):
-                alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-                alt_id.set("TYPE", "RELATEDPACKAGE")
-                alt_id.text = metadata['related_package_id']
-
-            relation_type = resolve_record_relation_type(metadata)
-            if relation_type:
-                alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-                alt_id.set("TYPE", "RELATIONTYPE")
-                alt_id.text = relation_type
-    
-    def _create_file_section(self, root, tar_file_info, aip_uuid, mets_ns, xlink_ns):
+    def _create_file_section(self, root, tar_file_info, aip_uuid, timestamp):
         """Create fileSec with reference to tar archive."""
-        file_sec = ET.SubElement(root, f"{{{mets_ns}}}fileSec")
-        file_grp = ET.SubElement(file_sec, f"{{{mets_ns}}}fileGrp")
+        file_sec = ET.SubElement(root, METS_FILE_SEC)
+        file_grp = ET.SubElement(file_sec, METS_FILE_GRP)
         file_grp.set("ID", "fgrp001")
         file_grp.set("USE", "FILES")
         
-        file_elem = ET.SubElement(file_grp, f"{{{mets_ns}}}file")
+        file_elem = ET.SubElement(file_grp, METS_FILE)
         file_elem.set("MIMETYPE", "application/x-tar")
         file_elem.set("CHECKSUMTYPE", "SHA-256")
-        file_elem.set("CREATED", tar_file_info.get('created', get_timestamp()))
+        file_elem.set("CREATED", tar_file_info.get('created', timestamp))
         file_elem.set("CHECKSUM", tar_file_info.get('checksum', ''))
         file_elem.set("USE", "Datafile")
         file_elem.set("ID", f"ID{generate_uuid()}")
         file_elem.set("SIZE", str(tar_file_info.get('size', 0)))
         
-        flocat = ET.SubElement(file_elem, f"{{{mets_ns}}}FLocat")
-        flocat.set(f"{{{xlink_ns}}}href", f"file:{aip_uuid}.tar")
+        flocat = ET.SubElement(file_elem, METS_FLOCAT)
+        flocat.set(XLINK_HREF, f"file:{aip_uuid}.tar")
         flocat.set("LOCTYPE", "URL")
-        flocat.set(f"{{{xlink_ns}}}type", "simple")
+        flocat.set(XLINK_TYPE, "simple")
         
         # Store file ID for structMap
         tar_file_info['file_id'] = file_elem.get("ID")
     
-    def _create_struct_map(self, root, tar_file_info, mets_ns):
+    def _create_struct_map(self, root, tar_file_info):
         """Create structMap element."""
-        struct_map = ET.SubElement(root, f"{{{mets_ns}}}structMap")
+        struct_map = ET.SubElement(root, METS_STRUCT_MAP)
         
-        div_package = ET.SubElement(struct_map, f"{{{mets_ns}}}div")
+        div_package = ET.SubElement(struct_map, METS_DIV)
         div_package.set("LABEL", "Package")
         
-        div_content = ET.SubElement(div_package, f"{{{mets_ns}}}div")
+        div_content = ET.SubElement(div_package, METS_DIV)
         div_content.set("LABEL", "Content Description")
         
-        div_datafiles = ET.SubElement(div_package, f"{{{mets_ns}}}div")
+        div_datafiles = ET.SubElement(div_package, METS_DIV)
         div_datafiles.set("LABEL", "Datafiles")
         
         if tar_file_info and tar_file_info.get('file_id'):
-            fptr = ET.SubElement(div_datafiles, f"{{{mets_ns}}}fptr")
+            fptr = ET.SubElement(div_datafiles, METS_FPTR)
             fptr.set("FILEID", tar_file_info['file_id'])
     
+    def tostring(self, element) -> bytes:
+        """Serialize the XML exactly as save() writes it."""
+        return serialize_xml(element, space="    ")
+    
     def save(self, element, output_path):
-        """Save the XML to file."""
-        tree = ET.ElementTree(element)
-        ET.indent(tree, space="    ", level=0)
-        tree.write(output_path, encoding='UTF-8', xml_declaration=True)
+        """Save the XML to file and return the bytes written."""
+        return write_xml(element, output_path, space="    ")
 
 
 class DIASMetsGenerator:
@@ -315,9 +735,9 @@ class DIASMetsGenerator:
     """
     
     NAMESPACES = {
-        'mets': 'http://www.loc.gov/METS/',
-        'xlink': 'http://www.w3.org/1999/xlink',
-        'xsi': 'http://www.w3.org/2001/XMLSchema-instance'
+        'mets': NS_METS,
+        'xlink': NS_XLINK,
+        'xsi': NS_XSI
     }
     
     def __init__(self):
@@ -334,234 +754,226 @@ class DIASMetsGenerator:
             files_info: List of file information dictionaries
             premis_file_info: Information about the premis.xml file
         """
-        mets_ns = self.NAMESPACES['mets']
-        xlink_ns = self.NAMESPACES['xlink']
-        xsi_ns = self.NAMESPACES['xsi']
+        # One timestamp for the whole document
+        timestamp = get_timestamp()
         
-        root = ET.Element(f"{{{mets_ns}}}mets")
-        root.set(f"{{{xsi_ns}}}schemaLocation", config.METS_SIP_SCHEMA_LOCATION)
-        root.set("PROFILE", config.METS_PROFILE)
-        root.set("LABEL", metadata.get('label', ''))
-        root.set("TYPE", resolve_package_type(metadata))
-        root.set("ID", f"ID{generate_uuid()}")
-        root.set("OBJID", f"UUID:{sip_uuid}")
+        root = self._create_root(metadata, sip_uuid)
         
         # Create metsHdr
-        self._create_mets_header(root, metadata, mets_ns)
+        self._create_mets_header(root, metadata, timestamp)
         
         # Create amdSec (reference to PREMIS)
-        premis_id = self._create_amd_section(root, premis_file_info, mets_ns, xlink_ns)
+        premis_id = self._create_amd_section(root, premis_file_info, timestamp)
         
         # Create fileSec
-        file_ids = self._create_file_section(root, files_info, mets_ns, xlink_ns)
+        file_ids = self._create_file_section(root, files_info, timestamp)
         
         # Create structMap
-        self._create_struct_map(root, premis_id, file_ids, mets_ns)
+        self._create_struct_map(root, premis_id, file_ids)
+        
+        return root
+    
+    def render_mets_xml(self, metadata, sip_uuid, files_info, premis_file_info=None) -> bytes:
+        """
+        Serialize mets.xml without building its fileSec and structMap as elements.
+        
+        Returns the same document as tostring(create_mets_xml(...)). The
+        header and amdSec are built with the element code above; the
+        per-file entries, which make up nearly all of a large package's
+        mets.xml, are written directly as escaped strings.
+        """
+        chunks = self._iter_mets_xml(metadata, sip_uuid, files_info, premis_file_info)
+        return "".join(chunks).encode("utf-8", "xmlcharrefreplace")
+    
+    def write_mets_xml(self, output_path, metadata, sip_uuid, files_info, premis_file_info=None) -> None:
+        """
+        Stream mets.xml to output_path, one file entry at a time.
         
+        Writes the same document as render_mets_xml, but files_info may be
+        any iterable (e.g. a generator) and only the file IDs needed for the
+        structMap are kept in memory.
+        """
+        # newline='' keeps "\n" as is on Windows
+        with open(output_path, 'w', encoding='utf-8', errors='xmlcharrefreplace',
+                  newline='') as f:
+            f.writelines(self._iter_mets_xml(metadata, sip_uuid, files_info, premis_file_info))
+    
+    def _iter_mets_xml(self, metadata, sip_uuid, files_info, premis_file_info):
+        """Yield mets.xml as text chunks for render_mets_xml and write_mets_xml."""
+        space = "    "
+        timestamp = get_timestamp()
+        
+        root = self._create_root(metadata, sip_uuid)
+        self._create_mets_header(root, metadata, timestamp)
+        premis_id = self._create_amd_section(root, premis_file_info, timestamp)
+        
+        # The amdSec already uses all three namespaces, so the root start tag
+        # rendered here declares everything fileSec and structMap need
+        parts = _render_document(root, space)
+        closing = parts.pop()
+        yield "".join(parts)
+        
+        i1, i2, i3, i4 = ("\n" + space * level for level in range(1, 5))
+        file_ids = []
+        files = iter(files_info)
+        first = next(files, None)
+        yield f'{i1}<mets:fileSec>{i2}<mets:fileGrp ID="fgrp001" USE="FILES"'
+        if first is None:
+            yield " />"
+        else:
+            yield ">"
+            for file_info in itertools.chain((first,), files):
+                file_id = f"ID{generate_uuid()}"
+                
+                mimetype = file_info.get('mimetype', 'application/octet-stream')
+                if not mimetype:
+                    mimetype = guess_mimetype(file_info.get('path', ''))
+                
+                yield (
+                    f'{i3}<mets:file MIMETYPE="{_escape_attr(mimetype)}" CHECKSUMTYPE="SHA-256"'
+                    f' CREATED="{_escape_attr(file_info.get("created", timestamp))}"'
+                    f' CHECKSUM="{_escape_attr(file_info.get("checksum", ""))}" USE="Datafile"'
+                    f' ID="{file_id}" SIZE="{_escape_attr(str(file_info.get("size", 0)))}">'
+                    f'{i4}<mets:FLocat xlink:href="{_escape_attr("file:" + file_info.get("path", ""))}"'
+                    f' LOCTYPE="URL" xlink:type="simple" />'
+                    f'{i3}</mets:file>'
+                )
+                file_ids.append(file_id)
+            yield f"{i2}</mets:fileGrp>"
+        yield f"{i1}</mets:fileSec>"
+        
+        yield (
+            f'{i1}<mets:structMap>{i2}<mets:div LABEL="Package">'
+            f'{i3}<mets:div ADMID="amdSec001" LABEL="Content Description">'
+            f'{i4}<mets:fptr FILEID="{premis_id}" />'
+            f'{i3}</mets:div>'
+            f'{i3}<mets:div ADMID="amdSec001" LABEL="Datafiles"'
+        )
+        if file_ids:
+            yield ">"
+            for file_id in file_ids:
+                yield f'{i4}<mets:fptr FILEID="{file_id}" />'
+            yield f"{i3}</mets:div>"
+        else:
+            yield " />"
+        yield f"{i2}</mets:div>{i1}</mets:structMap>"
+        yield closing
+    
+    def _create_root(self, metadata, sip_uuid):
+        """Create the root mets element with its attributes."""
+        root = ET.Element(METS_METS)
+        root.set(XSI_SCHEMA_LOCATION, config.METS_SIP_SCHEMA_LOCATION)
+        root.set("PROFILE", config.METS_PROFILE)
+        root.set("LABEL", metadata.get('label', ''))
+        root.set("TYPE", resolve_package_type(metadata))
+        root.set("ID", f"ID{generate_uuid()}")
+        root.set("OBJID", f"UUID:{sip_uuid}")
         return root
     
-    def _create_mets_header(self, root, metadata, mets_ns):
+    def _create_mets_header(self, root, metadata, timestamp):
         """Create the metsHdr element."""
-        mets_hdr = ET.SubElement(root, f"{{{mets_ns}}}metsHdr")
-        mets_hdr.set("CREATEDATE", get_timestamp())
+        mets_hdr = ET.SubElement(root, METS_METS_HDR)
+        mets_hdr.set("CREATEDATE", timestamp)
         mets_hdr.set("RECORDSTATUS", metadata.get('record_status', 'NEW'))
         
         # Add agents (same as info.xml)
-        self._add_agents(mets_hdr, metadata, mets_ns)
+        _add_agents(mets_hdr, metadata)
         
         # Add altRecordID elements
-        self._add_alt_record_ids(mets_hdr, metadata, mets_ns)
+        _add_alt_record_ids(mets_hdr, metadata)
         
         # Add metsDocumentID
-        doc_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}metsDocumentID")
+        doc_id = ET.SubElement(mets_hdr, METS_METS_DOCUMENT_ID)
         doc_id.text = "mets.xml"
     
-    def _add_agents(self, mets_hdr, metadata, mets_ns):
-        """Add all agent elements (reuse from DIASInfoGenerator)."""
-        # ARCHIVIST - Organization
-        if metadata.get('archivist_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "ARCHIVIST", 
-                          metadata['archivist_organization'])
-        
-        # ARCHIVIST - Software
-        if metadata.get('system_name'):
-            self._add_agent(mets_hdr, mets_ns, "OTHER", "ARCHIVIST", 
-                          metadata['system_name'], othertype="SOFTWARE")
-        if metadata.get('system_version'):
-            self._add_agent(mets_hdr, mets_ns, "OTHER", "ARCHIVIST", 
-                          metadata['system_version'], othertype="SOFTWARE")
-        if metadata.get('system_format'):
-            self._add_agent(mets_hdr, mets_ns, "OTHER", "ARCHIVIST", 
-                          metadata['system_format'], othertype="SOFTWARE")
-        
-        # CREATOR
-        if metadata.get('creator_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "CREATOR", 
-                          metadata['creator_organization'])
-        
-        # PRODUCER
-        if metadata.get('producer_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "OTHER", 
-                          metadata['producer_organization'], otherrole="PRODUCER")
-        if metadata.get('producer_individual'):
-            self._add_agent(mets_hdr, mets_ns, "INDIVIDUAL", "OTHER", 
-                          metadata['producer_individual'], otherrole="PRODUCER")
-        if metadata.get('producer_software'):
-            self._add_agent(mets_hdr, mets_ns, "OTHER", "OTHER", 
-                          metadata['producer_software'], othertype="SOFTWARE", otherrole="PRODUCER")
-        
-        # SUBMITTER
-        if metadata.get('submitter_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "OTHER", 
-                          metadata['submitter_organization'], otherrole="SUBMITTER")
-        if metadata.get('submitter_individual'):
-            self._add_agent(mets_hdr, mets_ns, "INDIVIDUAL", "OTHER", 
-                          metadata['submitter_individual'], otherrole="SUBMITTER")
-        
-        # IPOWNER
-        if metadata.get('ipowner_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "IPOWNER", 
-                          metadata['ipowner_organization'])
-        
-        # PRESERVATION
-        if metadata.get('preservation_organization'):
-            self._add_agent(mets_hdr, mets_ns, "ORGANIZATION", "PRESERVATION", 
-                          metadata['preservation_organization'])
-    
-    def _add_agent(self, parent, mets_ns, agent_type, role, name, othertype=None, otherrole=None):
-        """Add a single agent element."""
-        agent = ET.SubElement(parent, f"{{{mets_ns}}}agent")
-        agent.set("TYPE", agent_type)
-        if othertype:
-            agent.set("OTHERTYPE", othertype)
-        agent.set("ROLE", role)
-        if otherrole:
-            agent.set("OTHERROLE", otherrole)
-        
-        name_elem = ET.SubElement(agent, f"{{{mets_ns}}}name")
-        name_elem.text = name
-    
-    def _add_alt_record_ids(self, mets_hdr, metadata, mets_ns):
-        """Add altRecordID elements."""
-        if metadata.get('submission_agreement'):
-            alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-            alt_id.set("TYPE", "SUBMISSIONAGREEMENT")
-            alt_id.text = metadata['submission_agreement']
-        
-        if metadata.get('start_date'):
-            alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-            alt_id.set("TYPE", "STARTDATE")
-            alt_id.text = metadata['start_date']
-        
-        if metadata.get('end_date'):
-            alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-            alt_id.set("TYPE", "ENDDATE")
-            alt_id.text = metadata['end_date']
-
-        record_status = str(metadata.get('record_status', 'NEW')).strip().upper()
-        if record_status in {'SUPPLEMENT', 'REPLACEMENT'}:
-            if metadata.get('related_aic_id'):
-                alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-                alt_id.set("TYPE", "RELATEDAIC")
-                alt_id.text = metadata['related_aic_id']
-
-            if metadata.get('related_package_id'):
-                alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-                alt_id.set("TYPE", "RELATEDPACKAGE")
-                alt_id.text = metadata['related_package_id']
-
-            relation_type = resolve_record_relation_type(metadata)
-            if relation_type:
-                alt_id = ET.SubElement(mets_hdr, f"{{{mets_ns}}}altRecordID")
-                alt_id.set("TYPE", "RELATIONTYPE")
-                alt_id.text = relation_type
-    
-    def _create_amd_section(self, root, premis_file_info, mets_ns, xlink_ns):
+    def _create_amd_section(self, root, premis_file_info, timestamp):
         """Create amdSec with reference to PREMIS file."""
-        amd_sec = ET.SubElement(root, f"{{{mets_ns}}}amdSec")
+        amd_sec = ET.SubElement(root, METS_AMD_SEC)
         amd_sec.set("ID", "amdSec001")
         
-        digiprov_md = ET.SubElement(amd_sec, f"{{{mets_ns}}}digiprovMD")
+        digiprov_md = ET.SubElement(amd_sec, METS_DIGIPROV_MD)
         digiprov_id = f"ID{generate_uuid()}"
         digiprov_md.set("ID", "digiprovMD001")
         
-        md_ref = ET.SubElement(digiprov_md, f"{{{mets_ns}}}mdRef")
+        md_ref = ET.SubElement(digiprov_md, METS_MD_REF)
         md_ref.set("MIMETYPE", "text/xml")
         md_ref.set("CHECKSUMTYPE", "SHA-256")
         if premis_file_info:
             md_ref.set("CHECKSUM", premis_file_info.get('checksum', ''))
-            md_ref.set("CREATED", premis_file_info.get('created', get_timestamp()))
+            md_ref.set("CREATED", premis_file_info.get('created', timestamp))
             md_ref.set("SIZE", str(premis_file_info.get('size', 0)))
         md_ref.set("MDTYPE", "PREMIS")
-        md_ref.set(f"{{{xlink_ns}}}href", "file:administrative_metadata/premis.xml")
+        md_ref.set(XLINK_HREF, "file:administrative_metadata/premis.xml")
         md_ref.set("LOCTYPE", "URL")
-        md_ref.set(f"{{{xlink_ns}}}type", "simple")
+        md_ref.set(XLINK_TYPE, "simple")
         md_ref.set("ID", digiprov_id)
         
         return digiprov_id
     
-    def _create_file_section(self, root, files_info, mets_ns, xlink_ns):
+    def _create_file_section(self, root, files_info, timestamp):
         """Create fileSec with all package files."""
-        file_sec = ET.SubElement(root, f"{{{mets_ns}}}fileSec")
-        file_grp = ET.SubElement(file_sec, f"{{{mets_ns}}}fileGrp")
+        file_sec = ET.SubElement(root, METS_FILE_SEC)
+        file_grp = ET.SubElement(file_sec, METS_FILE_GRP)
         file_grp.set("ID", "fgrp001")
         file_grp.set("USE", "FILES")
         
         file_ids = []
         
         for file_info in files_info:
-            file_elem = ET.SubElement(file_grp, f"{{{mets_ns}}}file")
+            file_elem = ET.SubElement(file_grp, METS_FILE)
             file_id = f"ID{generate_uuid()}"
             
             mimetype = file_info.get('mimetype', 'application/octet-stream')
             if not mimetype:
-                mimetype = mimetypes.guess_type(file_info.get('path', ''))[0] or 'application/octet-stream'
+                mimetype = guess_mimetype(file_info.get('path', ''))
             
             file_elem.set("MIMETYPE", mimetype)
             file_elem.set("CHECKSUMTYPE", "SHA-256")
-            file_elem.set("CREATED", file_info.get('created', get_timestamp()))
+            file_elem.set("CREATED", file_info.get('created', timestamp))
             file_elem.set("CHECKSUM", file_info.get('checksum', ''))
             file_elem.set("USE", "Datafile")
             file_elem.set("ID", file_id)
             file_elem.set("SIZE", str(file_info.get('size', 0)))
             
-            flocat = ET.SubElement(file_elem, f"{{{mets_ns}}}FLocat")
-            flocat.set(f"{{{xlink_ns}}}href", f"file:{file_info.get('path', '')}")
+            flocat = ET.SubElement(file_elem, METS_FLOCAT)
+            flocat.set(XLINK_HREF, f"file:{file_info.get('path', '')}")
             flocat.set("LOCTYPE", "URL")
-            flocat.set(f"{{{xlink_ns}}}type", "simple")
+            flocat.set(XLINK_TYPE, "simple")
             
             file_ids.append(file_id)
         
         return file_ids
     
-    def _create_struct_map(self, root, premis_id, file_ids, mets_ns):
+    def _create_struct_map(self, root, premis_id, file_ids):
         """Create structMap element."""
-        struct_map = ET.SubElement(root, f"{{{mets_ns}}}structMap")
+        struct_map = ET.SubElement(root, METS_STRUCT_MAP)
         
-        div_package = ET.SubElement(struct_map, f"{{{mets_ns}}}div")
+        div_package = ET.SubElement(struct_map, METS_DIV)
         div_package.set("LABEL", "Package")
         
-        div_content = ET.SubElement(div_package, f"{{{mets_ns}}}div")
+        div_content = ET.SubElement(div_package, METS_DIV)
         div_content.set("ADMID", "amdSec001")
         div_content.set("LABEL", "Content Description")
         
         if premis_id:
-            fptr = ET.SubElement(div_content, f"{{{mets_ns}}}fptr")
+            fptr = ET.SubElement(div_content, METS_FPTR)
             fptr.set("FILEID", premis_id)
         
-        div_datafiles = ET.SubElement(div_package, f"{{{mets_ns}}}div")
+        div_datafiles = ET.SubElement(div_package, METS_DIV)
         div_datafiles.set("ADMID", "amdSec001")
         div_datafiles.set("LABEL", "Datafiles")
         
         for file_id in file_ids:
-            fptr = ET.SubElement(div_datafiles, f"{{{mets_ns}}}fptr")
+            fptr = ET.SubElement(div_datafiles, METS_FPTR)
             fptr.set("FILEID", file_id)
     
+    def tostring(self, element) -> bytes:
+        """Serialize the XML exactly as save() writes it."""
+        return serialize_xml(element, space="    ")
+    
     def save(self, element, output_path):
-        """Save the XML to file."""
-        tree = ET.ElementTree(element)
-        ET.indent(tree, space="    ", level=0)
-        tree.write(output_path, encoding='UTF-8', xml_declaration=True)
+        """Save the XML to file and return the bytes written."""
+        return write_xml(element, output_path, space="    ")
 
 
 class DIASLogGenerator:
@@ -571,9 +983,9 @@ class DIASLogGenerator:
     """
     
     NAMESPACES = {
-        'premis': 'http://arkivverket.no/standarder/PREMIS',
-        'xsi': 'http://www.w3.org/2001/XMLSchema-instance',
-        'xlink': 'http://www.w3.org/1999/xlink'
+        'premis': NS_PREMIS,
+        'xsi': NS_XSI,
+        'xlink': NS_XLINK
     }
     
     def __init__(self):
@@ -613,306 +1025,288 @@ class DIASLogGenerator:
             user_events: Optional list of user-defined event dicts
             agents: Optional list of agent dicts
         """
-        premis_ns = self.NAMESPACES['premis']
-        xsi_ns = self.NAMESPACES['xsi']
+        # One timestamp for the whole document
+        timestamp = get_timestamp()
         
-        root = ET.Element(f"{{{premis_ns}}}premis")
-        root.set(f"{{{xsi_ns}}}schemaLocation", config.PREMIS_SCHEMA_LOCATION)
+        root = ET.Element(PREMIS_PREMIS)
+        root.set(XSI_SCHEMA_LOCATION, config.PREMIS_SCHEMA_LOCATION)
         root.set("version", config.PREMIS_VERSION)
         
         # Create main object element
-        self._create_object(root, metadata, object_uuid, aic_uuid, premis_ns, xsi_ns)
+        self._create_object(root, metadata, object_uuid, aic_uuid, timestamp)
         
         # Create file objects if this is SIP-level premis.xml
         if is_sip_level and files_info:
             for file_info in files_info:
-                self._create_file_object(root, file_info, object_uuid, premis_ns, xsi_ns)
+                self._create_file_object(root, file_info, object_uuid)
         
         # Create automatic event (log creation)
-        self._create_event(root, object_uuid, premis_ns)
+        self._create_event(root, object_uuid, timestamp)
         
         # Create user-defined events
         if user_events:
             for user_event in user_events:
-                self._create_user_event(root, object_uuid, premis_ns, user_event)
+                self._create_user_event(root, object_uuid, user_event, timestamp)
         
         # Create agent elements
         if agents:
             for agent in agents:
-                self._create_agent(root, premis_ns, agent)
+                self._create_agent(root, agent)
         
         return root
     
-    def _create_object(self, root, metadata, object_uuid, aic_uuid, premis_ns, xsi_ns):
+    def _create_object(self, root, metadata, object_uuid, aic_uuid, timestamp):
         """Create the main PREMIS object element."""
-        obj = ET.SubElement(root, f"{{{premis_ns}}}object")
-        obj.set(f"{{{xsi_ns}}}type", "premis:file")
+        obj = ET.SubElement(root, PREMIS_OBJECT)
+        obj.set(XSI_TYPE, "premis:file")
         
         # Object identifier
-        obj_id = ET.SubElement(obj, f"{{{premis_ns}}}objectIdentifier")
-        obj_id_type = ET.SubElement(obj_id, f"{{{premis_ns}}}objectIdentifierType")
+        obj_id = ET.SubElement(obj, PREMIS_OBJECT_IDENTIFIER)
+        obj_id_type = ET.SubElement(obj_id, PREMIS_OBJECT_IDENTIFIER_TYPE)
         obj_id_type.text = "NO/RA"
-        obj_id_value = ET.SubElement(obj_id, f"{{{premis_ns}}}objectIdentifierValue")
+        obj_id_value = ET.SubElement(obj_id, PREMIS_OBJECT_IDENTIFIER_VALUE)
         obj_id_value.text = object_uuid
         
         # Preservation level
-        pres_level = ET.SubElement(obj, f"{{{premis_ns}}}preservationLevel")
-        pres_level_value = ET.SubElement(pres_level, f"{{{premis_ns}}}preservationLevelValue")
+        pres_level = ET.SubElement(obj, PREMIS_PRESERVATION_LEVEL)
+        pres_level_value = ET.SubElement(pres_level, PREMIS_PRESERVATION_LEVEL_VALUE)
         pres_level_value.text = "full"
         
         # Significant properties
-        self._add_significant_property(obj, premis_ns, "aic_object", aic_uuid or "")
-        self._add_significant_property(obj, premis_ns, "createdate", get_timestamp())
-        self._add_significant_property(obj, premis_ns, "archivist_organization", 
+        self._add_significant_property(obj, "aic_object", aic_uuid or "")
+        self._add_significant_property(obj, "createdate", timestamp)
+        self._add_significant_property(obj, "archivist_organization", 
                                        metadata.get('archivist_organization', ''))
-        self._add_significant_property(obj, premis_ns, "label", metadata.get('label', ''))
-        self._add_significant_property(obj, premis_ns, "iptype", resolve_package_type(metadata))
+        self._add_significant_property(obj, "label", metadata.get('label', ''))
+        self._add_significant_property(obj, "iptype", resolve_package_type(metadata))
 
         relation_type = resolve_record_relation_type(metadata)
-        record_status = str(metadata.get('record_status', 'NEW')).strip().upper()
-        if record_status in {'SUPPLEMENT', 'REPLACEMENT'}:
-            self._add_significant_property(obj, premis_ns, "record_status", record_status)
+        record_status = resolve_record_status(metadata)
+        if record_status in RELATED_RECORD_STATUSES:
+            self._add_significant_property(obj, "record_status", record_status)
             if relation_type:
-                self._add_significant_property(obj, premis_ns, "relation_type", relation_type)
+                self._add_significant_property(obj, "relation_type", relation_type)
             if metadata.get('related_aic_id'):
-                self._add_significant_property(obj, premis_ns, "related_aic_id", metadata['related_aic_id'])
+                self._add_significant_property(obj, "related_aic_id", metadata['related_aic_id'])
             if metadata.get('related_package_id'):
-                self._add_significant_property(obj, premis_ns, "related_package_id", metadata['related_package_id'])
+                self._add_significant_property(obj, "related_package_id", metadata['related_package_id'])
         
         # Object characteristics
-        obj_char = ET.SubElement(obj, f"{{{premis_ns}}}objectCharacteristics")
-        comp_level = ET.SubElement(obj_char, f"{{{premis_ns}}}compositionLevel")
+        obj_char = ET.SubElement(obj, PREMIS_OBJECT_CHARACTERISTICS)
+        comp_level = ET.SubElement(obj_char, PREMIS_COMPOSITION_LEVEL)
         comp_level.text = "0"
         
-        format_elem = ET.SubElement(obj_char, f"{{{premis_ns}}}format")
-        format_des = ET.SubElement(format_elem, f"{{{premis_ns}}}formatDesignation")
-        format_name = ET.SubElement(format_des, f"{{{premis_ns}}}formatName")
+        format_elem = ET.SubElement(obj_char, PREMIS_FORMAT)
+        format_des = ET.SubElement(format_elem, PREMIS_FORMAT_DESIGNATION)
+        format_name = ET.SubElement(format_des, PREMIS_FORMAT_NAME)
         format_name.text = "tar"
         
         # Storage
-        storage = ET.SubElement(obj, f"{{{premis_ns}}}storage")
-        storage_medium = ET.SubElement(storage, f"{{{premis_ns}}}storageMedium")
+        storage = ET.SubElement(obj, PREMIS_STORAGE)
+        storage_medium = ET.SubElement(storage, PREMIS_STORAGE_MEDIUM)
         storage_medium.text = config.PRESERVATION_PLATFORM
         
         # Relationship to AIC
         if aic_uuid:
-            relationship = ET.SubElement(obj, f"{{{premis_ns}}}relationship")
-            rel_type = ET.SubElement(relationship, f"{{{premis_ns}}}relationshipType")
-            rel_type.text = "structural"
-            rel_subtype = ET.SubElement(relationship, f"{{{premis_ns}}}relationshipSubType")
-            rel_subtype.text = "is part of"
-            
-            rel_obj_id = ET.SubElement(relationship, f"{{{premis_ns}}}relatedObjectIdentification")
-            rel_obj_id_type = ET.SubElement(rel_obj_id, f"{{{premis_ns}}}relatedObjectIdentifierType")
-            rel_obj_id_type.text = config.OBJECT_IDENTIFIER_TYPE
-            rel_obj_id_value = ET.SubElement(rel_obj_id, f"{{{premis_ns}}}relatedObjectIdentifierValue")
-            rel_obj_id_value.text = aic_uuid
-
-        if metadata.get('related_aic_id'):
-            relationship = ET.SubElement(obj, f"{{{premis_ns}}}relationship")
-            rel_type = ET.SubElement(relationship, f"{{{premis_ns}}}relationshipType")
-            rel_type.text = "derivation"
-            rel_subtype = ET.SubElement(relationship, f"{{{premis_ns}}}relationshipSubType")
-            rel_subtype.text = resolve_record_relation_type(metadata) or "related to"
-
-            rel_obj_id = ET.SubElement(relationship, f"{{{premis_ns}}}relatedObjectIdentification")
-            rel_obj_id_type = ET.SubElement(rel_obj_id, f"{{{premis_ns}}}relatedObjectIdentifierType")
-            rel_obj_id_type.text = config.OBJECT_IDENTIFIER_TYPE
-            rel_obj_id_value = ET.SubElement(rel_obj_id, f"{{{premis_ns}}}relatedObjectIdentifierValue")
-            rel_obj_id_value.text = metadata['related_aic_id']
-
-        if metadata.get('related_package_id'):
-            relationship = ET.SubElement(obj, f"{{{premis_ns}}}relationship")
-            rel_type = ET.SubElement(relationship, f"{{{premis_ns}}}relationshipType")
-            rel_type.text = "derivation"
-            rel_subtype = ET.SubElement(relationship, f"{{{premis_ns}}}relationshipSubType")
-            rel_subtype.text = resolve_record_relation_type(metadata) or "related to"
-
-            rel_obj_id = ET.SubElement(relationship, f"{{{premis_ns}}}relatedObjectIdentification")
-            rel_obj_id_type = ET.SubElement(rel_obj_id, f"{{{premis_ns}}}relatedObjectIdentifierType")
-            rel_obj_id_type.text = config.OBJECT_IDENTIFIER_TYPE
-            rel_obj_id_value = ET.SubElement(rel_obj_id, f"{{{premis_ns}}}relatedObjectIdentifierValue")
-            rel_obj_id_value.text = metadata['related_package_id']
-    
-    def _add_significant_property(self, parent, premis_ns, prop_type, prop_value):
+            self._add_relationship(obj, "structural", "is part of", aic_uuid)
+
+        # Same related-record keys as the RELATEDAIC/RELATEDPACKAGE altRecordIDs
+        for key, _ in _RELATED_RECORD_SPEC:
+            related_id = metadata.get(key)
+            if related_id:
+                self._add_relationship(obj, "derivation", relation_type or "related to", related_id)
+    
+    def _add_significant_property(self, parent, prop_type, prop_value):
         """Add a significant property element."""
-        sig_props = ET.SubElement(parent, f"{{{premis_ns}}}significantProperties")
-        sig_type = ET.SubElement(sig_props, f"{{{premis_ns}}}significantPropertiesType")
+        sig_props = ET.SubElement(parent, PREMIS_SIGNIFICANT_PROPERTIES)
+        sig_type = ET.SubElement(sig_props, PREMIS_SIGNIFICANT_PROPERTIES_TYPE)
         sig_type.text = prop_type
-        sig_value = ET.SubElement(sig_props, f"{{{premis_ns}}}significantPropertiesValue")
+        sig_value = ET.SubElement(sig_props, PREMIS_SIGNIFICANT_PROPERTIES_VALUE)
         sig_value.text = prop_value
     
-    def _create_file_object(self, root, file_info, parent_uuid, premis_ns, xsi_ns):
+    def _add_relationship(self, parent, rel_type, rel_subtype, related_id):
+        """Add a relationship to another object, identified by OBJECT_IDENTIFIER_TYPE."""
+        relationship = ET.SubElement(parent, PREMIS_RELATIONSHIP)
+        ET.SubElement(relationship, PREMIS_RELATIONSHIP_TYPE).text = rel_type
+        ET.SubElement(relationship, PREMIS_RELATIONSHIP_SUB_TYPE).text = rel_subtype
+        
+        related = ET.SubElement(relationship, PREMIS_RELATED_OBJECT_IDENTIFICATION)
+        ET.SubElement(related, PREMIS_RELATED_OBJECT_IDENTIFIER_TYPE).text = config.OBJECT_IDENTIFIER_TYPE
+        ET.SubElement(related, PREMIS_RELATED_OBJECT_IDENTIFIER_VALUE).text = related_id
+    
+    def _create_file_object(self, root, file_info, parent_uuid):
         """Create a PREMIS file object for individual files."""
-        obj = ET.SubElement(root, f"{{{premis_ns}}}object")
-        obj.set(f"{{{xsi_ns}}}type", "premis:file")
+        path = file_info.get('path', '')
+        
+        obj = ET.SubElement(root, PREMIS_OBJECT)
+        obj.set(XSI_TYPE, "premis:file")
         
         # Object identifier
-        obj_id = ET.SubElement(obj, f"{{{premis_ns}}}objectIdentifier")
-        obj_id_type = ET.SubElement(obj_id, f"{{{premis_ns}}}objectIdentifierType")
+        obj_id = ET.SubElement(obj, PREMIS_OBJECT_IDENTIFIER)
+        obj_id_type = ET.SubElement(obj_id, PREMIS_OBJECT_IDENTIFIER_TYPE)
         obj_id_type.text = config.OBJECT_IDENTIFIER_TYPE
-        obj_id_value = ET.SubElement(obj_id, f"{{{premis_ns}}}objectIdentifierValue")
-        obj_id_value.text = f"{parent_uuid}/{file_info.get('path', '')}"
+        obj_id_value = ET.SubElement(obj_id, PREMIS_OBJECT_IDENTIFIER_VALUE)
+        obj_id_value.text = f"{parent_uuid}/{path}"
         
         # Object characteristics
-        obj_char = ET.SubElement(obj, f"{{{premis_ns}}}objectCharacteristics")
+        obj_char = ET.SubElement(obj, PREMIS_OBJECT_CHARACTERISTICS)
         
-        comp_level = ET.SubElement(obj_char, f"{{{premis_ns}}}compositionLevel")
+        comp_level = ET.SubElement(obj_char, PREMIS_COMPOSITION_LEVEL)
         comp_level.text = "0"
         
         # Fixity
-        fixity = ET.SubElement(obj_char, f"{{{premis_ns}}}fixity")
-        msg_algo = ET.SubElement(fixity, f"{{{premis_ns}}}messageDigestAlgorithm")
+        fixity = ET.SubElement(obj_char, PREMIS_FIXITY)
+        msg_algo = ET.SubElement(fixity, PREMIS_MESSAGE_DIGEST_ALGORITHM)
         msg_algo.text = "SHA-256"
-        msg_digest = ET.SubElement(fixity, f"{{{premis_ns}}}messageDigest")
+        msg_digest = ET.SubElement(fixity, PREMIS_MESSAGE_DIGEST)
         msg_digest.text = file_info.get('checksum', '')
-        msg_orig = ET.SubElement(fixity, f"{{{premis_ns}}}messageDigestOriginator")
+        msg_orig = ET.SubElement(fixity, PREMIS_MESSAGE_DIGEST_ORIGINATOR)
         msg_orig.text = config.CHECKSUM_ORIGINATOR
         
         # Size
-        size_elem = ET.SubElement(obj_char, f"{{{premis_ns}}}size")
+        size_elem = ET.SubElement(obj_char, PREMIS_SIZE)
         size_elem.text = str(file_info.get('size', 0))
         
         # Format
-        format_elem = ET.SubElement(obj_char, f"{{{premis_ns}}}format")
-        format_des = ET.SubElement(format_elem, f"{{{premis_ns}}}formatDesignation")
-        format_name = ET.SubElement(format_des, f"{{{premis_ns}}}formatName")
+        format_elem = ET.SubElement(obj_char, PREMIS_FORMAT)
+        format_des = ET.SubElement(format_elem, PREMIS_FORMAT_DESIGNATION)
+        format_name = ET.SubElement(format_des, PREMIS_FORMAT_NAME)
         
-        # Get format from mimetype or extension
-        path = file_info.get('path', '')
-        ext = os.path.splitext(path)[1].lstrip('.').lower() or 'unknown'
-        format_name.text = ext
+        # Format from the file extension
+        format_name.text = _format_name(path)
         
         # Storage
-        storage = ET.SubElement(obj, f"{{{premis_ns}}}storage")
-        content_loc = ET.SubElement(storage, f"{{{premis_ns}}}contentLocation")
-        content_loc_type = ET.SubElement(content_loc, f"{{{premis_ns}}}contentLocationType")
+        storage = ET.SubElement(obj, PREMIS_STORAGE)
+        content_loc = ET.SubElement(storage, PREMIS_CONTENT_LOCATION)
+        content_loc_type = ET.SubElement(content_loc, PREMIS_CONTENT_LOCATION_TYPE)
         content_loc_type.text = "SIP"
-        content_loc_value = ET.SubElement(content_loc, f"{{{premis_ns}}}contentLocationValue")
+        content_loc_value = ET.SubElement(content_loc, PREMIS_CONTENT_LOCATION_VALUE)
         content_loc_value.text = parent_uuid
         
         # Relationship to parent
-        relationship = ET.SubElement(obj, f"{{{premis_ns}}}relationship")
-        rel_type = ET.SubElement(relationship, f"{{{premis_ns}}}relationshipType")
-        rel_type.text = "structural"
-        rel_subtype = ET.SubElement(relationship, f"{{{premis_ns}}}relationshipSubType")
-        rel_subtype.text = "is part of"
-        
-        rel_obj_id = ET.SubElement(relationship, f"{{{premis_ns}}}relatedObjectIdentification")
-        rel_obj_id_type = ET.SubElement(rel_obj_id, f"{{{premis_ns}}}relatedObjectIdentifierType")
-        rel_obj_id_type.text = config.OBJECT_IDENTIFIER_TYPE
-        rel_obj_id_value = ET.SubElement(rel_obj_id, f"{{{premis_ns}}}relatedObjectIdentifierValue")
-        rel_obj_id_value.text = parent_uuid
-    
-    def _create_event(self, root, object_uuid, premis_ns):
+        self._add_relationship(obj, "structural", "is part of", parent_uuid)
+    
+    def _create_event(self, root, object_uuid, timestamp):
         """Create a PREMIS event element."""
-        event = ET.SubElement(root, f"{{{premis_ns}}}event")
+        event = ET.SubElement(root, PREMIS_EVENT)
         
         # Event identifier
-        event_id = ET.SubElement(event, f"{{{premis_ns}}}eventIdentifier")
-        event_id_type = ET.SubElement(event_id, f"{{{premis_ns}}}eventIdentifierType")
+        event_id = ET.SubElement(event, PREMIS_EVENT_IDENTIFIER)
+        event_id_type = ET.SubElement(event_id, PREMIS_EVENT_IDENTIFIER_TYPE)
         event_id_type.text = config.OBJECT_IDENTIFIER_TYPE
-        event_id_value = ET.SubElement(event_id, f"{{{premis_ns}}}eventIdentifierValue")
+        event_id_value = ET.SubElement(event_id, PREMIS_EVENT_IDENTIFIER_VALUE)
         event_id_value.text = generate_uuid()
         
         # Event type (using DIAS numeric codes)
-        event_type = ET.SubElement(event, f"{{{premis_ns}}}eventType")
+        event_type = ET.SubElement(event, PREMIS_EVENT_TYPE)
         event_type.text = self._normalize_event_type(config.LOG_CREATION_EVENT_TYPE)
         
         # Event datetime
-        event_datetime = ET.SubElement(event, f"{{{premis_ns}}}eventDateTime")
-        event_datetime.text = get_timestamp()
+        event_datetime = ET.SubElement(event, PREMIS_EVENT_DATE_TIME)
+        event_datetime.text = timestamp
         
         # Event detail
-        event_detail = ET.SubElement(event, f"{{{premis_ns}}}eventDetail")
+        event_detail = ET.SubElement(event, PREMIS_EVENT_DETAIL)
         event_detail.text = "Log circular created"
         
         # Event outcome
-        event_outcome_info = ET.SubElement(event, f"{{{premis_ns}}}eventOutcomeInformation")
-        event_outcome = ET.SubElement(event_outcome_info, f"{{{premis_ns}}}eventOutcome")
+        event_outcome_info = ET.SubElement(event, PREMIS_EVENT_OUTCOME_INFORMATION)
+        event_outcome = ET.SubElement(event_outcome_info, PREMIS_EVENT_OUTCOME)
         event_outcome.text = "0"  # Success
         
-        event_outcome_detail = ET.SubElement(event_outcome_info, f"{{{premis_ns}}}eventOutcomeDetail")
-        event_outcome_note = ET.SubElement(event_outcome_detail, f"{{{premis_ns}}}eventOutcomeDetailNote")
+        event_outcome_detail = ET.SubElement(event_outcome_info, PREMIS_EVENT_OUTCOME_DETAIL)
+        event_outcome_note = ET.SubElement(event_outcome_detail, PREMIS_EVENT_OUTCOME_DETAIL_NOTE)
         event_outcome_note.text = "Success to create logfile"
         
         # Linking agent
-        linking_agent = ET.SubElement(event, f"{{{premis_ns}}}linkingAgentIdentifier")
-        linking_agent_type = ET.SubElement(linking_agent, f"{{{premis_ns}}}linkingAgentIdentifierType")
+        linking_agent = ET.SubElement(event, PREMIS_LINKING_AGENT_IDENTIFIER)
+        linking_agent_type = ET.SubElement(linking_agent, PREMIS_LINKING_AGENT_IDENTIFIER_TYPE)
         linking_agent_type.text = config.OBJECT_IDENTIFIER_TYPE
-        linking_agent_value = ET.SubElement(linking_agent, f"{{{premis_ns}}}linkingAgentIdentifierValue")
+        linking_agent_value = ET.SubElement(linking_agent, PREMIS_LINKING_AGENT_IDENTIFIER_VALUE)
         linking_agent_value.text = config.LINKING_AGENT
         
         # Linking object
-        linking_obj = ET.SubElement(event, f"{{{premis_ns}}}linkingObjectIdentifier")
-        linking_obj_type = ET.SubElement(linking_obj, f"{{{premis_ns}}}linkingObjectIdentifierType")
+        linking_obj = ET.SubElement(event, PREMIS_LINKING_OBJECT_IDENTIFIER)
+        linking_obj_type = ET.SubElement(linking_obj, PREMIS_LINKING_OBJECT_IDENTIFIER_TYPE)
         linking_obj_type.text = config.OBJECT_IDENTIFIER_TYPE
-        linking_obj_value = ET.SubElement(linking_obj, f"{{{premis_ns}}}linkingObjectIdentifierValue")
+        linking_obj_value = ET.SubElement(linking_obj, PREMIS_LINKING_OBJECT_IDENTIFIER_VALUE)
         linking_obj_value.text = object_uuid
     
-    def _create_user_event(self, root, object_uuid, premis_ns, event_data):
+    def _create_user_event(self, root, object_uuid, event_data, timestamp):
         """Create a PREMIS event element from user-provided event data."""
-        event = ET.SubElement(root, f"{{{premis_ns}}}event")
+        event = ET.SubElement(root, PREMIS_EVENT)
         
         # Event identifier
-        event_id = ET.SubElement(event, f"{{{premis_ns}}}eventIdentifier")
-        event_id_type = ET.SubElement(event_id, f"{{{premis_ns}}}eventIdentifierType")
+        event_id = ET.SubElement(event, PREMIS_EVENT_IDENTIFIER)
+        event_id_type = ET.SubElement(event_id, PREMIS_EVENT_IDENTIFIER_TYPE)
         event_id_type.text = config.OBJECT_IDENTIFIER_TYPE
-        event_id_value = ET.SubElement(event_id, f"{{{premis_ns}}}eventIdentifierValue")
+        event_id_value = ET.SubElement(event_id, PREMIS_EVENT_IDENTIFIER_VALUE)
         event_id_value.text = generate_uuid()
         
         # Event type
-        event_type = ET.SubElement(event, f"{{{premis_ns}}}eventType")
+        event_type = ET.SubElement(event, PREMIS_EVENT_TYPE)
         event_type.text = self._normalize_event_type(event_data.get('event_type', 'Creation'))
         
         # Event datetime (use user-provided date or current timestamp)
-        event_datetime = ET.SubElement(event, f"{{{premis_ns}}}eventDateTime")
-        user_date = event_data.get('event_date', '').strip()
-        event_datetime.text = user_date if user_date else get_timestamp()
+        event_datetime = ET.SubElement(event, PREMIS_EVENT_DATE_TIME)
+        # Missing or null dates (e.g. from a JSON config) fall back to the timestamp
+        user_date = event_data.get('event_date')
+        event_datetime.text = (user_date and user_date.strip()) or timestamp
         
         # Event detail
-        event_detail = ET.SubElement(event, f"{{{premis_ns}}}eventDetail")
+        event_detail = ET.SubElement(event, PREMIS_EVENT_DETAIL)
         event_detail.text = event_data.get('event_detail', '')
         
         # Event outcome
-        event_outcome_info = ET.SubElement(event, f"{{{premis_ns}}}eventOutcomeInformation")
-        event_outcome = ET.SubElement(event_outcome_info, f"{{{premis_ns}}}eventOutcome")
+        event_outcome_info = ET.SubElement(event, PREMIS_EVENT_OUTCOME_INFORMATION)
+        event_outcome = ET.SubElement(event_outcome_info, PREMIS_EVENT_OUTCOME)
         event_outcome.text = event_data.get('event_outcome', '0')
         
         outcome_detail_text = event_data.get('event_outcome_detail', '')
         if outcome_detail_text:
-            event_outcome_detail = ET.SubElement(event_outcome_info, f"{{{premis_ns}}}eventOutcomeDetail")
-            event_outcome_note = ET.SubElement(event_outcome_detail, f"{{{premis_ns}}}eventOutcomeDetailNote")
+            event_outcome_detail = ET.SubElement(event_outcome_info, PREMIS_EVENT_OUTCOME_DETAIL)
+            event_outcome_note = ET.SubElement(event_outcome_detail, PREMIS_EVENT_OUTCOME_DETAIL_NOTE)
             event_outcome_note.text = outcome_detail_text
         
         # Linking object
-        linking_obj = ET.SubElement(event, f"{{{premis_ns}}}linkingObjectIdentifier")
-        linking_obj_type = ET.SubElement(linking_obj, f"{{{premis_ns}}}linkingObjectIdentifierType")
+        linking_obj = ET.SubElement(event, PREMIS_LINKING_OBJECT_IDENTIFIER)
+        linking_obj_type = ET.SubElement(linking_obj, PREMIS_LINKING_OBJECT_IDENTIFIER_TYPE)
         linking_obj_type.text = config.OBJECT_IDENTIFIER_TYPE
-        linking_obj_value = ET.SubElement(linking_obj, f"{{{premis_ns}}}linkingObjectIdentifierValue")
+        linking_obj_value = ET.SubElement(linking_obj, PREMIS_LINKING_OBJECT_IDENTIFIER_VALUE)
         linking_obj_value.text = object_uuid
     
-    def _create_agent(self, root, premis_ns, agent_data):
+    def _create_agent(self, root, agent_data):
         """Create a PREMIS agent element."""
-        agent = ET.SubElement(root, f"{{{premis_ns}}}agent")
+        agent = ET.SubElement(root, PREMIS_AGENT)
         
         # Agent identifier
-        agent_id = ET.SubElement(agent, f"{{{premis_ns}}}agentIdentifier")
-        agent_id_type = ET.SubElement(agent_id, f"{{{premis_ns}}}agentIdentifierType")
+        agent_id = ET.SubElement(agent, PREMIS_AGENT_IDENTIFIER)
+        agent_id_type = ET.SubElement(agent_id, PREMIS_AGENT_IDENTIFIER_TYPE)
         agent_id_type.text = agent_data.get('agent_id_type', config.OBJECT_IDENTIFIER_TYPE)
-        agent_id_value = ET.SubElement(agent_id, f"{{{premis_ns}}}agentIdentifierValue")
+        agent_id_value = ET.SubElement(agent_id, PREMIS_AGENT_IDENTIFIER_VALUE)
         agent_id_value.text = agent_data.get('agent_id_value', '')
         
         # Agent name
-        agent_name = ET.SubElement(agent, f"{{{premis_ns}}}agentName")
+        agent_name = ET.SubElement(agent, PREMIS_AGENT_NAME)
         agent_name.text = agent_data.get('agent_name', '')
         
         # Agent type
-        agent_type = ET.SubElement(agent, f"{{{premis_ns}}}agentType")
+        agent_type = ET.SubElement(agent, PREMIS_AGENT_TYPE)
         agent_type.text = agent_data.get('agent_type', 'software')
     
+    def tostring(self, element) -> bytes:
+        """Serialize the XML exactly as save() writes it."""
+        return serialize_xml(element, space="  ")
+    
     def save(self, element, output_path):
-        """Save the XML to file."""
-        tree = ET.ElementTree(element)
-        ET.indent(tree, space="  ", level=0)
-        tree.write(output_path, encoding='UTF-8', xml_declaration=True)
+        """Save the XML to file and return the bytes written."""
+        return write_xml(element, output_path, space="  ")
+    
+    def save_with_checksum(self, element, output_path) -> Tuple[str, int]:
+        """
+        Stream the XML to file like save() and return its SHA-256 and size.
+        
+        For SIP-level log.xml with many files, which is never held in memory
+        as a whole document.
+        """
+        return stream_xml(element, output_path, space="  ")
@@ -6,8 +6,24 @@ from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+_METS_NS = 'http://www.loc.gov/METS/'
+_METS_HDR = f'{{{_METS_NS}}}metsHdr'
+_METS_DMD_SEC = f'{{{_METS_NS}}}dmdSec'
+
 
 class MetadataHandler:
+    # Sample values written by _save_dublin_core_template; other fields get
+    # "Sample <field>" and date the current time
+    _DC_TEMPLATE_DEFAULTS = {
+        'title': "Sample DIAS Package Title",
+        'creator': "Sample Creator",
+        'identifier': "sample-identifier-001",
+        'type': "Collection",
+        'format': "Digital",
+        'language': "en",
+        'rights': "All rights reserved",
+    }
+    
     def __init__(self) -> None:
         # Submission description specific fields
         self.submission_fields = {
@@ -23,6 +39,8 @@ class MetadataHandler:
             'contributor', 'date', 'type', 'format', 'identifier',
             'source', 'language', 'relation', 'coverage', 'rights'
         ]
+        # For membership tests while parsing; the list above keeps the order
+        self._dublin_core_field_set = frozenset(self.dublin_core_fields)
         
         # Valid values from schema
         self.valid_package_types = ["SIP", "AIP", "DIP", "AIU", "AIC"]
@@ -132,24 +150,27 @@ class MetadataHandler:
     def load_metadata_from_xml(self, xml_file_path):
         """Load submission description metadata from XML file"""
         try:
-            tree = ET.parse(xml_file_path)
-            root = tree.getroot()
-            
-            metadata = {}
+            events = ET.iterparse(xml_file_path, events=('start', 'end'))
+            _, root = next(events)
             
-            # Handle submission description METS structure
+            # Handle submission description METS structure, read section by
+            # section so a large fileSec is never held in memory
             if root.tag.endswith('mets'):
-                metadata = self._parse_submission_mets(root)
-            # Handle simple Dublin Core structure
-            elif root.tag.endswith('dublin_core') or root.tag.endswith('metadata'):
-                metadata = self._parse_dublin_core_xml(root)
+                metadata = self._iterparse_submission_mets(root, events)
             else:
-                # Try to find METS or Dublin Core elements
-                mets_elem = root.find('.//{http://www.loc.gov/METS/}mets')
-                if mets_elem is not None:
-                    metadata = self._parse_submission_mets(mets_elem)
-                else:
+                # Other layouts are searched as a whole tree
+                for _ in events:
+                    pass
+                # Handle simple Dublin Core structure
+                if root.tag.endswith('dublin_core') or root.tag.endswith('metadata'):
                     metadata = self._parse_dublin_core_xml(root)
+                else:
+                    # Try to find METS or Dublin Core elements
+                    mets_elem = root.find(f'.//{{{_METS_NS}}}mets')
+                    if mets_elem is not None:
+                        metadata = self._parse_submission_mets(mets_elem)
+                    else:
+                        metadata = self._parse_dublin_core_xml(root)
             
             # Ensure required fields
             self._ensure_required_fields(metadata)
@@ -169,74 +190,114 @@ class MetadataHandler:
     
     def _parse_submission_mets(self, mets_root):
         """Parse submission description METS XML"""
-        metadata = {}
-        ns = {'mets': 'http://www.loc.gov/METS/'}
+        ns = {'mets': _METS_NS}
+        metadata = self._parse_mets_attributes(mets_root)
+        
+        mets_hdr = mets_root.find('.//mets:metsHdr', ns)
+        if mets_hdr is not None:
+            self._parse_mets_hdr(mets_hdr, metadata)
+        
+        dmd_sec = mets_root.find('.//mets:dmdSec', ns)
+        if dmd_sec is not None:
+            self._parse_dmd_sec(dmd_sec, metadata)
+        
+        return metadata
+    
+    def _iterparse_submission_mets(self, mets_root, events):
+        """
+        Parse submission description METS XML from ET.iterparse events.
         
-        # Get root attributes
+        mets_root comes from the first 'start' event. Only the first top-level
+        metsHdr and dmdSec are kept until read; every other element is
+        dropped as soon as it ends, so a large fileSec is never built.
+        """
+        metadata = self._parse_mets_attributes(mets_root)
+        sections = {_METS_HDR: self._parse_mets_hdr, _METS_DMD_SEC: self._parse_dmd_sec}
+        open_elements = [mets_root]
+        reading = None
+        for event, elem in events:
+            if event == 'start':
+                if reading is None and len(open_elements) == 1 and elem.tag in sections:
+                    reading = elem
+                open_elements.append(elem)
+                continue
+            open_elements.pop()
+            if elem is reading:
+                sections.pop(elem.tag)(elem, metadata)
+                reading = None
+            elif reading is not None:
+                continue
+            # Children were removed when they ended, so this is the only one
+            if open_elements:
+                open_elements[-1].remove(elem)
+        return metadata
+    
+    def _parse_mets_attributes(self, mets_root):
+        """Read the submission fields stored as attributes of the METS root"""
+        metadata = {}
         metadata['objid'] = mets_root.get('OBJID', f"SUBMISSION_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
         package_type = mets_root.get('TYPE', 'SIP')
         metadata['package_type'] = package_type
         metadata['type'] = package_type
         metadata['profile'] = mets_root.get('PROFILE', 'DIAS_SUBMISSION_DESCRIPTION')
         metadata['label'] = mets_root.get('LABEL', '')
+        return metadata
+    
+    def _parse_mets_hdr(self, mets_hdr, metadata):
+        """Read record status, agents, altRecordIDs and metsDocumentID from metsHdr"""
+        ns = {'mets': _METS_NS}
+        metadata['record_status'] = mets_hdr.get('RECORDSTATUS', 'NEW')
         
-        # Get metsHdr information
-        mets_hdr = mets_root.find('.//mets:metsHdr', ns)
-        if mets_hdr is not None:
-            metadata['record_status'] = mets_hdr.get('RECORDSTATUS', 'NEW')
-            
-            # Get agents
-            agents = []
-            for agent in mets_hdr.findall('.//mets:agent', ns):
-                agent_data = {
-                    'role': agent.get('ROLE', 'OTHER'),
-                    'type': agent.get('TYPE', 'ORGANIZATION'),
-                    'name': agent.find('mets:name', ns).text if agent.find('mets:name', ns) is not None else 'Unknown'
-                }
-                if agent.get('OTHERROLE'):
-                    agent_data['otherrole'] = agent.get('OTHERROLE')
-                if agent.get('OTHERTYPE'):
-                    agent_data['othertype'] = agent.get('OTHERTYPE')
-                note_elem = agent.find('mets:note', ns)
-                if note_elem is not None:
-                    agent_data['note'] = note_elem.text
-                agents.append(agent_data)
-            metadata['agents'] = agents
-            
-            # Get altRecordIDs
-            alt_records = []
-            for alt_record in mets_hdr.findall('.//mets:altRecordID', ns):
-                alt_type = alt_record.get('TYPE', '')
-                alt_value = alt_record.text or ''
-                alt_records.append({'type': alt_type, 'value': alt_value})
+        # Get agents
+        agents = []
+        for agent in mets_hdr.findall('.//mets:agent', ns):
+            name_elem = agent.find('mets:name', ns)
+            agent_data = {
+                'role': agent.get('ROLE', 'OTHER'),
+                'type': agent.get('TYPE', 'ORGANIZATION'),
+                'name': name_elem.text if name_elem is not None else 'Unknown'
+            }
+            if agent.get('OTHERROLE'):
+                agent_data['otherrole'] = agent.get('OTHERROLE')
+            if agent.get('OTHERTYPE'):
+                agent_data['othertype'] = agent.get('OTHERTYPE')
+            note_elem = agent.find('mets:note', ns)
+            if note_elem is not None:
+                agent_data['note'] = note_elem.text
+            agents.append(agent_data)
+        metadata['agents'] = agents
+        
+        # Get altRecordIDs
+        alt_records = []
+        for alt_record in mets_hdr.findall('.//mets:altRecordID', ns):
+            alt_type = alt_record.get('TYPE', '')
+            alt_value = alt_record.text or ''
+            alt_records.append({'type': alt_type, 'value': alt_value})
 
-                if alt_type == 'RELATEDAIC':
-                    metadata['related_aic_id'] = alt_value
-                elif alt_type == 'RELATEDPACKAGE':
-                    metadata['related_package_id'] = alt_value
-                elif alt_type == 'RELATIONTYPE':
-                    metadata['relation_type'] = alt_value
-            metadata['alt_record_ids'] = alt_records
-            
-            # Get metsDocumentID
-            mets_doc_id = mets_hdr.find('.//mets:metsDocumentID', ns)
-            if mets_doc_id is not None:
-                metadata['mets_document_id'] = mets_doc_id.text
-                metadata['mets_document_id_type'] = mets_doc_id.get('TYPE', 'UUID')
-        
-        # Get descriptive metadata
-        dmd_sec = mets_root.find('.//mets:dmdSec', ns)
-        if dmd_sec is not None:
-            xml_data = dmd_sec.find('.//mets:xmlData', ns)
-            if xml_data is not None:
-                descriptive_metadata = {}
-                for child in xml_data:
-                    field_name = child.tag.split('}')[-1]  # Remove namespace
-                    if field_name in self.dublin_core_fields:
-                        descriptive_metadata[field_name] = child.text or ""
-                metadata['descriptive_metadata'] = descriptive_metadata
-        
-        return metadata
+            if alt_type == 'RELATEDAIC':
+                metadata['related_aic_id'] = alt_value
+            elif alt_type == 'RELATEDPACKAGE':
+                metadata['related_package_id'] = alt_value
+            elif alt_type == 'RELATIONTYPE':
+                metadata['relation_type'] = alt_value
+        metadata['alt_record_ids'] = alt_records
+        
+        # Get metsDocumentID
+        mets_doc_id = mets_hdr.find('.//mets:metsDocumentID', ns)
+        if mets_doc_id is not None:
+            metadata['mets_document_id'] = mets_doc_id.text
+            metadata['mets_document_id_type'] = mets_doc_id.get('TYPE', 'UUID')
+    
+    def _parse_dmd_sec(self, dmd_sec, metadata):
+        """Read Dublin Core descriptive metadata from a dmdSec"""
+        xml_data = dmd_sec.find('.//mets:xmlData', {'mets': _METS_NS})
+        if xml_data is not None:
+            descriptive_metadata = {}
+            for child in xml_data:
+                field_name = child.tag.rpartition('}')[2]  # Remove namespace
+                if field_name in self._dublin_core_field_set:
+                    descriptive_metadata[field_name] = child.text or ""
+            metadata['descriptive_metadata'] = descriptive_metadata
     
     def _parse_dublin_core_xml(self, root):
         """Parse simple Dublin Core XML structure"""
@@ -258,8 +319,8 @@ class MetadataHandler:
         if root.tag.endswith('metadata') or root.tag.endswith('dublin_core'):
             # Direct Dublin Core structure
             for child in root:
-                field_name = child.tag.split('}')[-1]  # Remove namespace
-                if field_name in self.dublin_core_fields:
+                field_name = child.tag.rpartition('}')[2]  # Remove namespace
+                if field_name in self._dublin_core_field_set:
                     descriptive_metadata[field_name] = child.text or ""
         else:
             # Look for Dublin Core elements anywhere in the XML
@@ -399,26 +460,10 @@ class MetadataHandler:
         root = ET.Element("dublin_core")
         root.set("xmlns:dc", "http://purl.org/dc/elements/1.1/")
         
+        defaults = {**self._DC_TEMPLATE_DEFAULTS, 'date': datetime.now().isoformat()}
         for field in self.dublin_core_fields:
             element = ET.SubElement(root, field)
-            if field == 'title':
-                element.text = "Sample DIAS Package Title"
-            elif field == 'creator':
-                element.text = "Sample Creator"
-            elif field == 'identifier':
-                element.text = "sample-identifier-001"
-            elif field == 'date':
-                element.text = datetime.now().isoformat()
-            elif field == 'type':
-                element.text = "Collection"
-            elif field == 'format':
-                element.text = "Digital"
-            elif field == 'language':
-                element.text = "en"
-            elif field == 'rights':
-                element.text = "All rights reserved"
-            else:
-                element.text = f"Sample {field}"
+            element.text = defaults.get(field) or f"Sample {field}"
         
         tree = ET.ElementTree(root)
         ET.indent(tree, space="  ", level=0)
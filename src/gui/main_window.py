@@ -40,22 +40,12 @@ class MainWindow:
         self._create_menu()
         self._create_main_layout()
         
-        # Bind controller callbacks (wrapped with root.after for thread-safety)
-        self.controller.set_progress_callback(self._thread_safe_progress)
-        self.controller.set_log_callback(self._thread_safe_log)
-        self.controller.set_completion_callback(self._thread_safe_completion)
-
-    def _thread_safe_progress(self, value, status=None):
-        """Thread-safe progress update via root.after()."""
-        self.root.after(0, self.progress_frame.update_progress, value, status)
-
-    def _thread_safe_log(self, message, level="INFO"):
-        """Thread-safe log update via root.after()."""
-        self.root.after(0, self.log_frame.log, message, level)
-
-    def _thread_safe_completion(self, success, message):
-        """Thread-safe completion callback via root.after()."""
-        self.root.after(0, self._on_completion, success, message)
+        # Bind controller callbacks; the job manager delivers them on the
+        # Tk thread by draining its queue from root.after()
+        self.controller.set_progress_callback(self.progress_frame.update_progress)
+        self.controller.set_log_callback(self.log_frame.log)
+        self.controller.set_completion_callback(self._on_completion)
+        self.controller.job_manager.attach_root(self.root)
         
     def _configure_style(self):
         """Configure ttk styles for the application."""
@@ -646,3 +636,5 @@ class MainWindow:
     def run(self):
         """Start the main event loop."""
         self.root.mainloop()
+        # Ask a still-running job to stop so the job thread lets the process exit
+        self.controller.job_manager.shutdown(wait=False)
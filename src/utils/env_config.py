@@ -121,7 +121,15 @@ def _get_package_version() -> str:
 
 
 class AppConfig:
-    """Application configuration from environment variables."""
+    """
+    Application configuration from environment variables.
+    
+    Values are resolved once at import time and stored as class attributes.
+    The empty ``__slots__`` gives the shared ``config`` instance no ``__dict__``,
+    so it is read-only: assigning an attribute on it raises AttributeError.
+    """
+    
+    __slots__ = ()
     
     # Application settings
     APP_NAME = get_env('APP_NAME', 'DIAS Package Creator')
@@ -154,12 +162,14 @@ class AppConfig:
     # File processing settings
     DISK_SPACE_SAFETY_MARGIN = get_env_float('DISK_SPACE_SAFETY_MARGIN', 1.5)
     PACKAGE_SIZE_MULTIPLIER = get_env_float('PACKAGE_SIZE_MULTIPLIER', 3.0)
-    SHA256_CHUNK_SIZE = get_env_int('SHA256_CHUNK_SIZE', 65536)
+    SHA256_CHUNK_SIZE = get_env_int('SHA256_CHUNK_SIZE', 1024 * 1024)
     FILE_PROCESSOR_CHUNK_SIZE = get_env_int('FILE_PROCESSOR_CHUNK_SIZE', 8 * 1024 * 1024)
+    USE_NATIVE_TAR = get_env_bool('USE_NATIVE_TAR', False)
     
     # Logging settings
     LOG_DIRECTORY = get_env('LOG_DIRECTORY', '')
-    LOG_LEVEL = get_env('LOG_LEVEL', 'DEBUG')
+    # Upper-cased here so the log file and the GUI filter read the same level
+    LOG_LEVEL = (get_env('LOG_LEVEL') or 'DEBUG').upper()
     LOG_MAX_AGE_DAYS = get_env_int('LOG_MAX_AGE_DAYS', 30)
     LOG_MAX_FILES = get_env_int('LOG_MAX_FILES', 50)
     
@@ -87,8 +87,8 @@ def setup_logging(log_dir=None, log_level=None):
     # Log startup
     root_logger.info("="*70)
     root_logger.info("DIAS Package Creator - Logging Started")
-    root_logger.info(f"Log file: {log_file}")
-    root_logger.info(f"Log level: {logging.getLevelName(log_level)}")
+    root_logger.info("Log file: %s", log_file)
+    root_logger.info("Log level: %s", logging.getLevelName(log_level))
     root_logger.info("="*70)
     
     return log_file
@@ -139,9 +139,9 @@ def cleanup_old_logs(log_dir=None, max_age_days=None, max_files=None):
             try:
                 log_file.unlink()
                 removed += 1
-                logger.debug(f"Removed old log file: {log_file.name}")
+                logger.debug("Removed old log file: %s", log_file.name)
             except Exception as e:
-                logger.warning(f"Could not remove {log_file.name}: {e}")
+                logger.warning("Could not remove %s: %s", log_file.name, e)
     
     # Keep only max_files most recent logs
     if len(log_files) > max_files:
@@ -149,12 +149,12 @@ def cleanup_old_logs(log_dir=None, max_age_days=None, max_files=None):
             try:
                 log_file.unlink()
                 removed += 1
-                logger.debug(f"Removed excess log file: {log_file.name}")
+                logger.debug("Removed excess log file: %s", log_file.name)
             except Exception as e:
-                logger.warning(f"Could not remove {log_file.name}: {e}")
+                logger.warning("Could not remove %s: %s", log_file.name, e)
     
     if removed > 0:
-        logger.info(f"Cleaned up {removed} old log files")
+        logger.info("Cleaned up %d old log files", removed)
 
 
 def get_memory_usage():
@@ -178,4 +178,4 @@ def log_memory_usage(logger, message="Memory usage"):
     """
     rss, vms = get_memory_usage()
     if rss > 0:
-        logger.debug(f"{message}: RSS={rss:.2f} MB, VMS={vms:.2f} MB")
+        logger.debug("%s: RSS=%.2f MB, VMS=%.2f MB", message, rss, vms)
@@ -3,12 +3,17 @@ Tests for DIAS Package Controller.
 Tests validate_inputs, callback wiring, cancellation, and file processing utilities.
 """
 
+import hashlib
 import os
 import shutil
+import tarfile
 import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 
-from src.core.dias_controller import PackageController
+from src.core.dias_controller import PackageController, _resolve_schema, _scan_source
+from src.utils.env_config import AppConfig
 from src.utils.validation import ValidationResult
 
 
@@ -23,6 +28,7 @@ class TestControllerInit(unittest.TestCase):
         self.assertIsNotNone(controller.info_generator)
         self.assertIsNotNone(controller.mets_generator)
         self.assertIsNotNone(controller.log_generator)
+        self.assertIsNotNone(controller.metadata_handler)
     
     def test_callbacks_initially_none(self):
         """Callbacks should be None before being set."""
@@ -32,6 +38,29 @@ class TestControllerInit(unittest.TestCase):
         self.assertIsNone(controller._completion_callback)
 
 
+class TestControllerMetadataTemplates(unittest.TestCase):
+    """Tests for loading and saving metadata templates."""
+    
+    def setUp(self):
+        self.controller = PackageController()
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_templates_use_shared_handler(self):
+        """Save and load delegate to the controller's single MetadataHandler."""
+        path = os.path.join(self.temp_dir, 'template.xml')
+        handler = self.controller.metadata_handler
+        with mock.patch.object(handler, 'save_metadata_to_xml') as save, \
+                mock.patch.object(handler, 'load_metadata_from_xml',
+                                  return_value={'label': 'x'}) as load:
+            self.controller.save_metadata_template(path, {'label': 'x'})
+            self.assertEqual(self.controller.load_metadata_template(path), {'label': 'x'})
+        save.assert_called_once_with(path, {'label': 'x'})
+        load.assert_called_once_with(path)
+
+
 class TestControllerCallbacks(unittest.TestCase):
     """Tests for callback registration."""
     
@@ -200,6 +229,32 @@ class TestControllerCopyFile(unittest.TestCase):
         info = self.controller._copy_file_with_info(src, dest, base)
         self.assertEqual(len(info['checksum']), 64)
     
+    def test_copy_falls_back_when_copy_file_range_unsupported(self):
+        """Cross-device copies fall back to the streaming copy-and-hash loop."""
+        import errno
+        src = Path(self.src_file)
+        dest = Path(self.dest_dir) / 'test.txt'
+        
+        def unsupported(*args, **kwargs):
+            raise OSError(errno.EXDEV, 'Invalid cross-device link')
+        
+        with mock.patch('os.copy_file_range', unsupported, create=True):
+            info = self.controller._copy_file_with_info(src, dest, Path(self.dest_dir))
+        
+        self.assertEqual(dest.read_text(), 'Hello World')
+        self.assertEqual(info['checksum'], hashlib.sha256(b'Hello World').hexdigest())
+    
+    def test_copy_falls_back_when_copy_file_range_copies_nothing(self):
+        """A copy_file_range that reports end of file at once is not trusted."""
+        src = Path(self.src_file)
+        dest = Path(self.dest_dir) / 'test.txt'
+        
+        with mock.patch('os.copy_file_range', return_value=0, create=True):
+            info = self.controller._copy_file_with_info(src, dest, Path(self.dest_dir))
+        
+        self.assertEqual(dest.read_text(), 'Hello World')
+        self.assertEqual(info['checksum'], hashlib.sha256(b'Hello World').hexdigest())
+    
     def test_copy_nonexistent_file(self):
         """Copying a nonexistent file should return None."""
         from pathlib import Path
@@ -211,6 +266,206 @@ class TestControllerCopyFile(unittest.TestCase):
         self.assertIsNone(info)
 
 
+class TestControllerProcessSourceFiles(unittest.TestCase):
+    """Tests for _process_source_files."""
+    
+    def setUp(self):
+        self.controller = PackageController()
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = Path(self.temp_dir) / 'source'
+        (self.source / 'nested' / 'deeper').mkdir(parents=True)
+        (self.source / 'empty').mkdir()
+        for i in range(20):
+            (self.source / f'file_{i:02d}.txt').write_text('x' * i)
+        (self.source / 'nested' / 'deeper' / 'doc.xml').write_text('<a/>')
+        self.content_dir = Path(self.temp_dir) / 'content'
+        self.content_dir.mkdir()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_results_follow_source_order(self):
+        """Parallel copying must still return files in directory-walk order."""
+        files_info = self.controller._process_source_files(str(self.source), self.content_dir)
+        
+        expected = [
+            'content/' + str(p.relative_to(self.source))
+            for p in self.source.rglob('*') if p.is_file()
+        ]
+        self.assertEqual([info['path'] for info in files_info], expected)
+        for info in files_info:
+            data = (self.content_dir / info['path'][len('content/'):]).read_bytes()
+            self.assertEqual(info['checksum'], hashlib.sha256(data).hexdigest())
+        self.assertTrue((self.content_dir / 'empty').is_dir())
+    
+    def test_scan_source_totals_and_links(self):
+        """The single source scan sizes files and treats links like is_file()/is_dir()."""
+        expected_size = sum(range(20)) + len('<a/>')
+        try:
+            os.symlink(self.source / 'file_05.txt', self.source / 'link.txt')
+            os.symlink(self.source / 'missing', self.source / 'broken')
+            expected_size += 5
+        except (OSError, NotImplementedError):
+            pass
+        
+        entries, total_size = _scan_source(self.source)
+        names = {rel_path for _, rel_path, _ in entries}
+        for path, rel_path, _ in entries:
+            self.assertEqual(Path(path), self.source / rel_path)
+        
+        self.assertEqual(total_size, expected_size)
+        self.assertNotIn('broken', names)
+        self.assertIn('empty', names)
+        self.assertEqual({p for p in names if not (self.source / p).is_dir()},
+                         {str(p.relative_to(self.source)) for p in self.source.rglob('*') if p.is_file()})
+    
+    def test_progress_is_byte_based_and_throttled(self):
+        """Copy progress is reported by bytes, not once per file, and ends at 40%."""
+        updates = []
+        self.controller.set_progress_callback(lambda value, status: updates.append(value))
+        
+        self.controller._process_source_files(str(self.source), self.content_dir)
+        
+        self.assertLess(len(updates), 21)
+        self.assertEqual(updates, sorted(updates))
+        self.assertAlmostEqual(updates[-1], 40)
+    
+    def test_cancellation_stops_processing(self):
+        self.controller.job_manager.cancel_job()
+        with self.assertRaises(InterruptedError):
+            self.controller._process_source_files(str(self.source), self.content_dir)
+
+
+class TestControllerTarArchive(unittest.TestCase):
+    """Tests for _create_sip_tar_archive."""
+    
+    def setUp(self):
+        self.controller = PackageController()
+        self.temp_dir = tempfile.mkdtemp()
+        self.sip_root = Path(self.temp_dir) / 'sip-uuid' / 'sip-uuid'
+        (self.sip_root / 'content' / 'sub').mkdir(parents=True)
+        (self.sip_root / 'content' / 'a.txt').write_text('alpha')
+        (self.sip_root / 'content' / 'sub' / 'b.bin').write_bytes(os.urandom(4096))
+        self.out_dir = Path(self.temp_dir) / 'out'
+        self.out_dir.mkdir()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_checksum_and_size_match_written_archive(self):
+        """Checksum computed while writing must match the archive on disk."""
+        info = self.controller._create_sip_tar_archive(self.sip_root, self.out_dir, 'sip-uuid')
+        tar_path = self.out_dir / 'sip-uuid.tar'
+        data = tar_path.read_bytes()
+        
+        self.assertEqual(info['checksum'], hashlib.sha256(data).hexdigest())
+        self.assertEqual(info['size'], len(data))
+        with tarfile.open(tar_path) as tar:
+            names = tar.getnames()
+        self.assertIn('sip-uuid/content/a.txt', names)
+        self.assertIn('sip-uuid/content/sub/b.bin', names)
+    
+    def test_headers_match_tarfile_gettarinfo(self):
+        """Headers built from the cached stats match what tar.add would write."""
+        self.controller._create_sip_tar_archive(self.sip_root, self.out_dir, 'sip-uuid')
+        with tarfile.open(self.out_dir / 'sip-uuid.tar') as tar, \
+                tarfile.open(os.devnull, 'w') as reference:
+            members = tar.getmembers()
+            for member in members:
+                path = self.sip_root.parent / member.name
+                expected = reference.gettarinfo(str(path), arcname=member.name)
+                self.assertEqual(
+                    (member.type, member.size, member.mode, member.uid, member.gid,
+                     member.uname, member.gname, int(member.mtime)),
+                    (expected.type, expected.size, expected.mode & 0o7777, expected.uid, expected.gid,
+                     expected.uname, expected.gname, int(expected.mtime)))
+            self.assertEqual(tar.extractfile('sip-uuid/content/a.txt').read(), b'alpha')
+        # Parents are listed before their contents, and empty directories are kept
+        names = [m.name for m in members]
+        self.assertLess(names.index('sip-uuid/content'), names.index('sip-uuid/content/sub'))
+        self.assertLess(names.index('sip-uuid/content/sub'), names.index('sip-uuid/content/sub/b.bin'))
+    
+    @unittest.skipIf(shutil.which('tar') is None, "tar program not available")
+    def test_native_tar_backend(self):
+        """The optional system tar backend produces an equivalent archive."""
+        with mock.patch.object(AppConfig, 'USE_NATIVE_TAR', True):
+            info = self.controller._create_sip_tar_archive(self.sip_root, self.out_dir, 'sip-uuid')
+        tar_path = self.out_dir / 'sip-uuid.tar'
+        data = tar_path.read_bytes()
+        
+        self.assertEqual(info['checksum'], hashlib.sha256(data).hexdigest())
+        self.assertEqual(info['size'], len(data))
+        with tarfile.open(tar_path) as tar:
+            self.assertEqual(tar.extractfile('sip-uuid/content/a.txt').read(), b'alpha')
+            self.assertIn('sip-uuid/content/sub/b.bin', tar.getnames())
+
+
+class TestControllerFindSchema(unittest.TestCase):
+    """Tests for schema lookup."""
+    
+    def test_lookup_is_cached(self):
+        controller = PackageController()
+        _resolve_schema.cache_clear()
+        real_exists = Path.exists
+        
+        with mock.patch.object(Path, 'exists', autospec=True, side_effect=real_exists) as exists:
+            first = controller._find_schema('dias_mets.xsd')
+            calls = exists.call_count
+            second = controller._find_schema('dias_mets.xsd')
+        
+        self.assertIsNotNone(first)
+        self.assertEqual(first, second)
+        self.assertGreater(calls, 0)
+        self.assertEqual(exists.call_count, calls)
+
+
+class TestControllerGatherSipFilesInfo(unittest.TestCase):
+    """Tests for _gather_sip_files_info."""
+    
+    def setUp(self):
+        self.controller = PackageController()
+        self.temp_dir = tempfile.mkdtemp()
+        self.sip_root = Path(self.temp_dir) / 'sip'
+        (self.sip_root / 'content' / 'sub').mkdir(parents=True)
+        (self.sip_root / 'administrative_metadata').mkdir()
+        (self.sip_root / 'descriptive_metadata').mkdir()
+        (self.sip_root / 'content' / 'sub' / 'a.txt').write_text('alpha')
+        (self.sip_root / 'administrative_metadata' / 'premis.xml').write_text('<premis/>')
+        (self.sip_root / 'descriptive_metadata' / 'ead.xml').write_text('<ead/>')
+        (self.sip_root / 'log.xml').write_text('<log/>')
+        (self.sip_root / 'mets.xsd').write_text('<xsd/>')
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_lists_sections_in_mets_order(self):
+        files_info = self.controller._gather_sip_files_info(self.sip_root)
+        paths = [Path(info['path']).as_posix() for info in files_info]
+        
+        self.assertEqual(paths, ['mets.xsd', 'log.xml', 'content/sub/a.txt',
+                                 'descriptive_metadata/ead.xml'])
+        self.assertEqual(files_info[2]['checksum'], hashlib.sha256(b'alpha').hexdigest())
+        self.assertEqual(files_info[2]['size'], 5)
+    
+    def test_precomputed_files_are_not_rehashed(self):
+        precomputed = {os.path.join('content', 'sub', 'a.txt'): {
+            'path': 'content/sub/a.txt', 'checksum': 'cached', 'size': 5,
+            'created': 'then', 'mimetype': 'text/plain', 'name': 'a.txt',
+        }}
+        
+        with mock.patch('src.core.dias_controller.calculate_sha256_many',
+                        side_effect=lambda paths: ['fresh'] * len(paths)) as sha:
+            files_info = self.controller._gather_sip_files_info(self.sip_root, precomputed)
+        
+        by_name = {info['name']: info for info in files_info}
+        self.assertEqual(by_name['a.txt']['checksum'], 'cached')
+        self.assertEqual(by_name['log.xml']['checksum'], 'fresh')
+        # Everything else is hashed in a single batch
+        sha.assert_called_once()
+        hashed = {Path(path).name for path in sha.call_args.args[0]}
+        self.assertEqual(hashed, {'mets.xsd', 'log.xml', 'ead.xml'})
+
+
 class TestControllerPremisAgentFiltering(unittest.TestCase):
     """Tests for PREMIS agent inclusion filtering by SIP/AIP level."""
 
@@ -297,5 +552,148 @@ class TestControllerPremisAgentFiltering(unittest.TestCase):
         self.assertEqual({a['agent_name'] for a in aip_log_agents}, {'Both Agent', 'AIP Only Agent'})
 
 
+class TestControllerStreamedSip(unittest.TestCase):
+    """Tests for writing the SIP tar archive straight from the source."""
+    
+    def setUp(self):
+        self.controller = PackageController()
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = Path(self.temp_dir) / 'source'
+        (self.source_dir / 'sub').mkdir(parents=True)
+        (self.source_dir / 'doc.txt').write_text('test content')
+        (self.source_dir / 'sub' / 'data.bin').write_bytes(os.urandom(3000))
+        self.metadata = {
+            'package_type': 'SIP',
+            'label': 'Streamed Package',
+            'archivist_organization': 'Test Archive',
+            'system_name': 'Test System',
+            'creator_organization': 'Test Creator',
+            'submission_agreement': 'AGR-001',
+            'start_date': '2020-01-01',
+            'end_date': '2023-12-31',
+        }
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _create(self, output_name):
+        output_dir = Path(self.temp_dir) / output_name
+        output_dir.mkdir()
+        success, message = self.controller._create_package_task(
+            str(self.source_dir), str(output_dir), 'streamed', dict(self.metadata)
+        )
+        self.assertTrue(success, message)
+        tar_path = next(output_dir.rglob('*.tar'))
+        with tarfile.open(tar_path) as tar:
+            members = {m.name.split('/', 1)[1]: m for m in tar.getmembers() if '/' in m.name}
+            mets = tar.extractfile(f"{tar_path.stem}/mets.xml").read().decode('utf-8')
+        return tar_path, members, mets
+    
+    def test_archive_built_without_staging_copy(self):
+        tar_path, members, mets = self._create('out')
+        
+        # Only the tar file is left in the AIP content directory
+        self.assertEqual(list(tar_path.parent.iterdir()), [tar_path])
+        for name in ('content/doc.txt', 'content/sub/data.bin', 'mets.xml', 'mets.xsd', 'log.xml',
+                     'administrative_metadata/premis.xml', 'administrative_metadata/DIAS_PREMIS.xsd'):
+            self.assertIn(name, members)
+        self.assertEqual(members['content/sub/data.bin'].size, 3000)
+        self.assertIn(hashlib.sha256(b'test content').hexdigest(), mets)
+    
+    def test_unchanged_files_are_not_rehashed(self):
+        """A second build reuses the checksums of unchanged source files."""
+        from src.dias_package_creator import dias_xml_generators
+        with mock.patch.object(dias_xml_generators, '_CHECKSUM_RACY_NS', 0), \
+                mock.patch.dict(dias_xml_generators._CHECKSUM_CACHE, clear=True):
+            _, _, first_mets = self._create('first')
+            with mock.patch('src.core.dias_controller._HashingReader') as reader:
+                _, members, second_mets = self._create('second')
+        
+        reader.assert_not_called()
+        self.assertEqual(members['content/sub/data.bin'].size, 3000)
+        for content in (b'test content', (self.source_dir / 'sub' / 'data.bin').read_bytes()):
+            checksum = hashlib.sha256(content).hexdigest()
+            self.assertIn(checksum, first_mets)
+            self.assertIn(checksum, second_mets)
+    
+    def test_file_growing_after_scan_is_not_cached(self):
+        """A file that grows after the scan is archived as scanned and its hash is not cached."""
+        from src.dias_package_creator import dias_xml_generators
+        from src.core import dias_controller
+        data_file = self.source_dir / 'sub' / 'data.bin'
+        scanned = data_file.read_bytes()
+        real_scan = dias_controller._scan_source
+        
+        def scan_then_grow(source):
+            result = real_scan(source)
+            with open(data_file, 'ab') as f:
+                f.write(b'appended after the scan')
+            return result
+        
+        with mock.patch.object(dias_xml_generators, '_CHECKSUM_RACY_NS', 0), \
+                mock.patch.dict(dias_xml_generators._CHECKSUM_CACHE, clear=True), \
+                mock.patch.object(dias_controller, '_scan_source', side_effect=scan_then_grow):
+            _, members, mets = self._create('grown')
+            full_checksum = dias_xml_generators.calculate_sha256(data_file)
+        
+        self.assertEqual(members['content/sub/data.bin'].size, len(scanned))
+        self.assertIn(hashlib.sha256(scanned).hexdigest(), mets)
+        self.assertEqual(full_checksum, hashlib.sha256(data_file.read_bytes()).hexdigest())
+    
+    def test_single_file_source_read_once(self):
+        """A single source file is streamed into the archive and hashed in one read."""
+        source_file = self.source_dir / 'sub' / 'data.bin'
+        self.source_dir = source_file
+        real_open = open
+        opened = []
+        
+        def tracking_open(file, *args, **kwargs):
+            opened.append(Path(file) if isinstance(file, (str, os.PathLike)) else file)
+            return real_open(file, *args, **kwargs)
+        
+        with mock.patch('builtins.open', side_effect=tracking_open):
+            tar_path, members, mets = self._create('single')
+        
+        self.assertEqual(opened.count(source_file), 1)
+        self.assertEqual(members['content/data.bin'].size, 3000)
+        self.assertIn(hashlib.sha256(source_file.read_bytes()).hexdigest(), mets)
+        with tarfile.open(tar_path) as tar:
+            data = tar.extractfile(f"{tar_path.stem}/content/data.bin").read()
+        self.assertEqual(data, source_file.read_bytes())
+    
+    def test_archive_failure_is_logged_with_traceback(self):
+        output_dir = Path(self.temp_dir) / 'out'
+        output_dir.mkdir()
+        gui_log = []
+        self.controller.set_log_callback(lambda msg, level: gui_log.append((level, msg)))
+        self.controller.job_manager.set_min_level('DEBUG')
+        
+        with mock.patch.object(PackageController, '_archive_source_files', side_effect=OSError('disk gone')), \
+                self.assertLogs('src.core.dias_controller', level='ERROR') as logs:
+            success, message = self.controller._create_package_task(
+                str(self.source_dir), str(output_dir), 'streamed', dict(self.metadata)
+            )
+        
+        self.assertFalse(success)
+        self.assertIn('disk gone', message)
+        self.assertIn('Traceback', logs.output[0])
+        self.assertEqual([level for level, _ in gui_log[-2:]], ['ERROR', 'DEBUG'])
+        self.assertIn('disk gone', gui_log[-2][1])
+        self.assertIn('Traceback', gui_log[-1][1])
+    
+    @unittest.skipIf(shutil.which('tar') is None, "tar program not available")
+    def test_matches_staged_archive(self):
+        """The streamed archive holds the same files as the staged system-tar one."""
+        _, streamed, _ = self._create('streamed')
+        with mock.patch.object(AppConfig, 'USE_NATIVE_TAR', True):
+            _, staged, _ = self._create('staged')
+        
+        self.assertEqual(set(streamed), set(staged))
+        for name, member in streamed.items():
+            # Generated XML differs in UUIDs and timestamps; copied files must not
+            if not name.endswith('.xml'):
+                self.assertEqual(member.size, staged[name].size, name)
+
+
 if __name__ == '__main__':
     unittest.main()
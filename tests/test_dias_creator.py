@@ -3,10 +3,13 @@ Unit tests for DIAS Package Creator.
 Tests cover XML generators, file processor, and controller components.
 """
 
+import hashlib
+import mimetypes
 import unittest
 import tempfile
 import shutil
 import os
+import sys
 from pathlib import Path
 from datetime import datetime
 
@@ -14,7 +17,14 @@ from datetime import datetime
 from src.dias_package_creator.dias_xml_generators import (
     DIASMetsGenerator, 
     DIASLogGenerator,
-    DIASInfoGenerator
+    DIASInfoGenerator,
+    calculate_sha256,
+    calculate_sha256_many,
+    generate_uuid,
+    guess_mimetype,
+    serialize_xml,
+    stream_xml,
+    MMAP_HASH_THRESHOLD
 )
 from src.dias_package_creator.metadata_handler import MetadataHandler
 from src.utils.file_processor import FileProcessor
@@ -83,8 +93,11 @@ class TestDIASMetsGenerator(unittest.TestCase):
             temp_path = f.name
             
         try:
-            self.generator.save(mets, temp_path)
+            data = self.generator.save(mets, temp_path)
             self.assertTrue(os.path.exists(temp_path))
+            # save returns exactly the bytes it wrote
+            with open(temp_path, 'rb') as f:
+                self.assertEqual(f.read(), data)
             
             # Verify XML content
             with open(temp_path, 'r', encoding='utf-8') as f:
@@ -128,6 +141,109 @@ class TestDIASMetsGenerator(unittest.TestCase):
         self.assertEqual(alt_map.get('RELATEDPACKAGE'), 'pkg-def')
         self.assertEqual(alt_map.get('RELATIONTYPE'), 'supplements')
 
+    def test_record_status_is_normalized(self):
+        """Record status should be matched regardless of case and surrounding spaces."""
+        metadata = {**self.sample_metadata, 'record_status': ' replacement ',
+                    'related_package_id': 'pkg-def'}
+        mets = self.generator.create_mets_xml(
+            metadata=metadata,
+            sip_uuid='test-uuid-123',
+            files_info=[]
+        )
+        alt_map = {
+            elem.get('TYPE'): elem.text for elem in mets.iter()
+            if elem.tag.split('}')[-1] == 'altRecordID'
+        }
+        self.assertEqual(alt_map.get('RELATEDPACKAGE'), 'pkg-def')
+        self.assertEqual(alt_map.get('RELATIONTYPE'), 'replaces')
+
+    @staticmethod
+    def _deterministic(render):
+        """Call render() with predictable UUIDs and timestamps."""
+        import itertools
+        from unittest import mock
+        from src.dias_package_creator import dias_xml_generators
+
+        counter = itertools.count()
+        with mock.patch.object(dias_xml_generators, 'generate_uuid',
+                               lambda: f"uuid-{next(counter)}"), \
+                mock.patch.object(dias_xml_generators, 'get_timestamp',
+                                  lambda: '2024-01-01T00:00:00+01:00'):
+            return render()
+
+    def _render_both(self, metadata, files_info, premis_file_info=None):
+        """Serialize the same METS through ElementTree and render_mets_xml."""
+        return [
+            self._deterministic(lambda: self.generator.tostring(self.generator.create_mets_xml(
+                metadata, 'test-uuid-123', files_info, premis_file_info))),
+            self._deterministic(lambda: self.generator.render_mets_xml(
+                metadata, 'test-uuid-123', files_info, premis_file_info)),
+        ]
+
+    def test_render_mets_xml_matches_element_tree(self):
+        """render_mets_xml should produce the same bytes as create_mets_xml."""
+        premis = {'checksum': 'abc', 'size': 10, 'created': '2024-01-01T00:00:00'}
+        expected, rendered = self._render_both(self.sample_metadata, self.sample_files, premis)
+        self.assertEqual(rendered, expected)
+
+    def test_render_mets_xml_escapes_values(self):
+        """Special characters should be escaped like ElementTree does."""
+        metadata = {**self.sample_metadata, 'label': 'A & B <"quoted">\n\ttab \u00e6\u00f8\u00e5'}
+        files_info = [
+            {'path': 'content/R&D <draft>.txt', 'checksum': 'c', 'size': 1,
+             'created': 't', 'mimetype': ''},
+            {},
+        ]
+        expected, rendered = self._render_both(metadata, files_info)
+        self.assertEqual(rendered, expected)
+
+    def test_render_mets_xml_without_files(self):
+        """An empty file list should still match the ElementTree output."""
+        expected, rendered = self._render_both(self.sample_metadata, [])
+        self.assertEqual(rendered, expected)
+
+    def test_write_mets_xml_streams_rendered_document(self):
+        """write_mets_xml should write the render_mets_xml bytes, also from a generator."""
+        files_info = self.sample_files + [{'path': 'content/\u00e6\u00f8\u00e5 & co.txt'}]
+        expected = self._deterministic(lambda: self.generator.render_mets_xml(
+            self.sample_metadata, 'test-uuid-123', files_info))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'mets.xml')
+            self._deterministic(lambda: self.generator.write_mets_xml(
+                path, self.sample_metadata, 'test-uuid-123', (info for info in files_info)))
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), expected)
+        self.assertTrue(expected.startswith(b"<?xml version='1.0' encoding='UTF-8'?>"))
+
+    def test_timestamp_taken_once_per_document(self):
+        """Every default date in a document should come from one get_timestamp() call."""
+        from unittest import mock
+        from src.dias_package_creator import dias_xml_generators
+
+        files_info = [{'path': f'content/file{i}.txt'} for i in range(5)]
+        for build in (
+            lambda: self.generator.create_mets_xml(self.sample_metadata, 'sip', files_info),
+            lambda: self.generator.render_mets_xml(self.sample_metadata, 'sip', files_info),
+            lambda: DIASLogGenerator().create_log_xml(
+                self.sample_metadata, 'obj', files_info=files_info,
+                user_events=[{'event_type': 'Creation'}]),
+        ):
+            with mock.patch.object(dias_xml_generators, 'get_timestamp',
+                                   return_value='2024-01-01T00:00:00+01:00') as timestamp:
+                build()
+            self.assertEqual(timestamp.call_count, 1)
+
+    def test_tag_constants_match_namespaces(self):
+        """Precomputed tag names should be interned and use the generator namespaces."""
+        from src.dias_package_creator import dias_xml_generators as generators
+
+        mets_ns = self.generator.NAMESPACES['mets']
+        self.assertEqual(generators.METS_FILE, f"{{{mets_ns}}}file")
+        self.assertEqual(generators.XLINK_HREF, f"{{{self.generator.NAMESPACES['xlink']}}}href")
+        self.assertEqual(generators.PREMIS_OBJECT,
+                         f"{{{DIASLogGenerator.NAMESPACES['premis']}}}object")
+        self.assertIs(generators.METS_FILE, sys.intern(f"{{{mets_ns}}}file"))
+
 
 class TestDIASLogGenerator(unittest.TestCase):
     """Tests for Log (PREMIS) XML generation."""
@@ -245,6 +361,301 @@ class TestDIASInfoGenerator(unittest.TestCase):
         )
         self.assertEqual(info.get('TYPE'), 'DIP')
 
+    def test_header_matches_mets_header(self):
+        """info.xml and mets.xml should list the same agents and altRecordIDs."""
+        metadata = {
+            **self.sample_metadata,
+            'producer_software': 'Producer App',
+            'submitter_individual': 'Jane Doe',
+            'start_date': '2020-01-01',
+            'record_status': 'SUPPLEMENT',
+            'related_aic_id': 'aic-abc'
+        }
+
+        def header(root):
+            mets_hdr = next(child for child in root if child.tag.endswith('metsHdr'))
+            return [
+                (child.tag.split('}')[-1], sorted(child.attrib.items()),
+                 child.text if len(child) == 0 else child[0].text)
+                for child in mets_hdr if not child.tag.endswith('metsDocumentID')
+            ]
+
+        info = self.generator.create_info_xml(metadata, 'aip-uuid-123', 'aic-uuid-123')
+        mets = DIASMetsGenerator().create_mets_xml(metadata, 'sip-uuid-123', [])
+        self.assertEqual(header(info), header(mets))
+        self.assertIn(
+            ('agent', [('OTHERROLE', 'PRODUCER'), ('OTHERTYPE', 'SOFTWARE'),
+                       ('ROLE', 'OTHER'), ('TYPE', 'OTHER')], 'Producer App'),
+            header(info)
+        )
+        self.assertIn(('altRecordID', [('TYPE', 'RELATIONTYPE')], 'supplements'), header(info))
+
+
+class TestSerializeXml(unittest.TestCase):
+    """Tests for the single-pass XML serializer."""
+
+    @staticmethod
+    def _element_tree_bytes(element, space):
+        import copy
+        import xml.etree.ElementTree as ET
+
+        element = copy.deepcopy(element)
+        ET.indent(element, space=space, level=0)
+        return ET.tostring(element, encoding='UTF-8', xml_declaration=True)
+
+    def test_matches_element_tree_for_premis(self):
+        """Generated PREMIS should serialize exactly like ET.indent + ET.tostring."""
+        generator = DIASLogGenerator()
+        log = generator.create_log_xml(
+            {'label': 'A & B <test> "\u00e6\u00f8\u00e5"', 'archivist_organization': 'Org\nline'},
+            'obj-uuid', aic_uuid='aic-uuid',
+            files_info=[{'path': 'content/a&b.txt', 'checksum': 'abc', 'size': 3}],
+            user_events=[{'event_type': 'Creation', 'event_detail': '',
+                          'event_outcome_detail': 'done'}],
+            agents=[{'agent_name': 'Tester'}]
+        )
+        expected = self._element_tree_bytes(log, "  ")
+        self.assertEqual(serialize_xml(log, "  "), expected)
+
+    def test_does_not_modify_element(self):
+        """Serializing should not add indentation whitespace to the tree."""
+        generator = DIASInfoGenerator()
+        info = generator.create_info_xml({'label': 'Test'}, 'aip-uuid', 'aic-uuid')
+        serialize_xml(info, "    ")
+        self.assertIsNone(info.text)
+        self.assertTrue(all(elem.tail is None for elem in info.iter()))
+
+    def test_falls_back_for_unsupported_trees(self):
+        """Comments, foreign namespaces and mixed content should still serialize like ET."""
+        import xml.etree.ElementTree as ET
+
+        comment = ET.Element('root')
+        comment.append(ET.Comment('note'))
+        foreign = ET.Element('{urn:example}root')
+        ET.SubElement(foreign, 'child')
+        mixed = ET.Element('root')
+        mixed.text = 'text'
+        ET.SubElement(mixed, 'child').tail = 'tail'
+
+        for element in (comment, foreign, mixed):
+            expected = self._element_tree_bytes(element, "  ")
+            self.assertEqual(serialize_xml(element, "  "), expected)
+
+    def test_stream_xml_writes_serialized_document(self):
+        """stream_xml should write serialize_xml's bytes and return their hash and size."""
+        import hashlib
+        import xml.etree.ElementTree as ET
+
+        generator = DIASLogGenerator()
+        log = generator.create_log_xml(
+            {'label': 'A & B \u00e6\u00f8\u00e5'}, 'obj-uuid',
+            files_info=[{'path': 'content/a.txt', 'checksum': 'abc', 'size': 3}]
+        )
+        leaf = ET.Element('root')
+        leaf.text = 'only text'
+        mixed = ET.Element('root')
+        ET.SubElement(mixed, 'child').tail = 'tail'
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, 'log.xml')
+            for element in (log, leaf, mixed):
+                expected = serialize_xml(element, "  ")
+                checksum, size = stream_xml(element, output_path, "  ")
+                with open(output_path, 'rb') as f:
+                    self.assertEqual(f.read(), expected)
+                self.assertEqual(checksum, hashlib.sha256(expected).hexdigest())
+                self.assertEqual(size, len(expected))
+
+
+class TestCalculateSha256(unittest.TestCase):
+    """Tests for the calculate_sha256 helper."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_matches_hashlib_across_chunk_boundaries(self):
+        """Checksums must be correct for empty, sub-chunk and multi-chunk files."""
+        for size in (0, 1, 65535, 65536, 65537, 300000):
+            path = os.path.join(self.temp_dir, f'file_{size}.bin')
+            data = os.urandom(size)
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.assertEqual(calculate_sha256(path), hashlib.sha256(data).hexdigest())
+    
+    def test_falls_back_to_reading_when_mmap_fails(self):
+        """Files that cannot be memory-mapped are hashed with the read loop."""
+        from unittest import mock
+        path = os.path.join(self.temp_dir, 'large.bin')
+        data = os.urandom(MMAP_HASH_THRESHOLD + 1)
+        with open(path, 'wb') as f:
+            f.write(data)
+        with mock.patch('mmap.mmap', side_effect=OSError('cannot map')) as mapped:
+            self.assertEqual(calculate_sha256(path), hashlib.sha256(data).hexdigest())
+        mapped.assert_called_once()
+    
+    def test_only_large_files_are_mapped(self):
+        """Files below MMAP_HASH_THRESHOLD are read; larger ones are mapped."""
+        from unittest import mock
+        import mmap
+        for size, expect_mapped in ((MMAP_HASH_THRESHOLD - 1, False),
+                                    (MMAP_HASH_THRESHOLD, True)):
+            path = os.path.join(self.temp_dir, f'map_{size}.bin')
+            data = os.urandom(size)
+            with open(path, 'wb') as f:
+                f.write(data)
+            with mock.patch('mmap.mmap', wraps=mmap.mmap) as mapped:
+                self.assertEqual(calculate_sha256(path), hashlib.sha256(data).hexdigest())
+            self.assertEqual(mapped.called, expect_mapped)
+    
+    def test_read_loop_across_default_chunk_boundary(self):
+        """The read loop is correct around the 1 MiB default read size."""
+        from unittest import mock
+        chunk = 1024 * 1024
+        for size in (chunk - 1, chunk, chunk + 1):
+            path = os.path.join(self.temp_dir, f'read_{size}.bin')
+            data = os.urandom(size)
+            with open(path, 'wb') as f:
+                f.write(data)
+            with mock.patch('mmap.mmap', side_effect=OSError('cannot map')):
+                self.assertEqual(calculate_sha256(path), hashlib.sha256(data).hexdigest())
+    
+    def test_missing_file_returns_none(self):
+        self.assertIsNone(calculate_sha256(os.path.join(self.temp_dir, 'missing.bin')))
+    
+    def test_unchanged_file_uses_cached_checksum(self):
+        """A file whose stat is unchanged is not hashed again."""
+        from unittest import mock
+        from src.dias_package_creator import dias_xml_generators
+        path = os.path.join(self.temp_dir, 'cached.bin')
+        data = os.urandom(5000)
+        with open(path, 'wb') as f:
+            f.write(data)
+        
+        with mock.patch.object(dias_xml_generators, '_CHECKSUM_RACY_NS', 0), \
+                mock.patch.dict(dias_xml_generators._CHECKSUM_CACHE, clear=True):
+            self.assertEqual(calculate_sha256(path), hashlib.sha256(data).hexdigest())
+            key = dias_xml_generators._checksum_key(os.stat(path))
+            self.assertIn(key, dias_xml_generators._CHECKSUM_CACHE)
+            dias_xml_generators._CHECKSUM_CACHE[key] = 'cached'
+            self.assertEqual(calculate_sha256(path), 'cached')
+    
+    def test_recently_modified_file_is_not_cached(self):
+        """Files changed within the racy window are always hashed."""
+        from unittest import mock
+        from src.dias_package_creator import dias_xml_generators
+        path = os.path.join(self.temp_dir, 'fresh.bin')
+        with open(path, 'wb') as f:
+            f.write(b'fresh')
+        
+        with mock.patch.dict(dias_xml_generators._CHECKSUM_CACHE, clear=True):
+            calculate_sha256(path)
+            self.assertEqual(dias_xml_generators._CHECKSUM_CACHE, {})
+    
+    def test_checksum_cache_is_bounded(self):
+        """The oldest entry is evicted once the cache is full."""
+        from unittest import mock
+        from src.dias_package_creator import dias_xml_generators
+        paths = []
+        for index in range(3):
+            path = os.path.join(self.temp_dir, f'bounded_{index}.bin')
+            with open(path, 'wb') as f:
+                f.write(bytes([index]))
+            paths.append(path)
+        
+        with mock.patch.object(dias_xml_generators, '_CHECKSUM_RACY_NS', 0), \
+                mock.patch.object(dias_xml_generators, '_CHECKSUM_CACHE_SIZE', 2), \
+                mock.patch.dict(dias_xml_generators._CHECKSUM_CACHE, clear=True):
+            for path in paths:
+                calculate_sha256(path)
+            keys = [dias_xml_generators._checksum_key(os.stat(path)) for path in paths]
+            self.assertEqual(list(dias_xml_generators._CHECKSUM_CACHE), keys[1:])
+    
+    def test_many_keeps_input_order(self):
+        """calculate_sha256_many returns one checksum per path, in order."""
+        paths, expected = [], []
+        for index in range(12):
+            path = os.path.join(self.temp_dir, f'file_{index}.bin')
+            data = os.urandom(1000 * (12 - index))
+            with open(path, 'wb') as f:
+                f.write(data)
+            paths.append(path)
+            expected.append(hashlib.sha256(data).hexdigest())
+        paths.append(os.path.join(self.temp_dir, 'missing.bin'))
+        expected.append(None)
+        
+        self.assertEqual(calculate_sha256_many(paths), expected)
+        self.assertEqual(calculate_sha256_many(paths[:1]), expected[:1])
+        self.assertEqual(calculate_sha256_many([]), [])
+    
+    def test_debug_messages_only_when_enabled(self):
+        """Debug lines are only logged when the module logger has DEBUG enabled."""
+        from unittest import mock
+        from src.dias_package_creator import dias_xml_generators
+        
+        path = os.path.join(self.temp_dir, 'file.bin')
+        with open(path, 'wb') as f:
+            f.write(b'data')
+        logger = dias_xml_generators.logger
+        
+        with mock.patch.dict(dias_xml_generators._CHECKSUM_CACHE, clear=True), \
+                self.assertLogs(logger, level='DEBUG') as logs:
+            calculate_sha256(path)
+        self.assertTrue(any('Calculating SHA-256' in line for line in logs.output))
+        
+        with mock.patch.object(logger, 'debug') as debug, \
+                mock.patch.object(logger, 'isEnabledFor', return_value=False):
+            calculate_sha256(path)
+        debug.assert_not_called()
+
+
+class TestGenerateUuid(unittest.TestCase):
+    """Tests for pooled UUID generation."""
+
+    def test_uuids_are_unique_version_4(self):
+        """UUIDs should look like uuid4() output, also across buffer refills."""
+        import uuid
+        from src.dias_package_creator import dias_xml_generators
+
+        values = [generate_uuid() for _ in range(dias_xml_generators._UUID_BATCH * 2 + 1)]
+        self.assertEqual(len(set(values)), len(values))
+        for value in values:
+            parsed = uuid.UUID(value)
+            self.assertEqual(str(parsed), value)
+            self.assertEqual(parsed.version, 4)
+            self.assertEqual(parsed.variant, uuid.RFC_4122)
+
+    def test_threads_get_distinct_uuids(self):
+        """Each thread should draw from its own buffer."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            batches = list(executor.map(
+                lambda _: [generate_uuid() for _ in range(300)], range(4)))
+        values = [value for batch in batches for value in batch]
+        self.assertEqual(len(set(values)), len(values))
+
+
+class TestGuessMimetype(unittest.TestCase):
+    """Tests for the cached guess_mimetype helper."""
+    
+    def test_matches_mimetypes_guess_type(self):
+        names = ['doc.pdf', 'DOC.PDF', 'archive.tar.gz', 'archive.tgz', 'report.v2.xml',
+                 'no_extension', 'dir.d/file.txt', 'data.unknownext', '.hidden.txt',
+                 '.bashrc', 'trailing.', 'double..dot.txt', Path('content/a.b.c.json')]
+        for name in names:
+            # Twice: the second lookup is served from the cache
+            for _ in range(2):
+                self.assertEqual(
+                    guess_mimetype(name),
+                    mimetypes.guess_type(str(name))[0] or 'application/octet-stream',
+                    name)
+    
+    def test_unknown_defaults_to_octet_stream(self):
+        self.assertEqual(guess_mimetype('file.unknownext'), 'application/octet-stream')
+
 
 class TestFileProcessor(unittest.TestCase):
     """Tests for file processing utilities."""
@@ -413,6 +824,61 @@ class TestMetadataHandler(unittest.TestCase):
         self.assertIn('RELATEDPACKAGE', alt_types)
         self.assertIn('RELATIONTYPE', alt_types)
 
+    def test_load_metadata_from_mets_xml(self):
+        """METS files are read section by section with the same result as a full parse."""
+        import xml.etree.ElementTree as ET
+
+        files = ''.join(
+            f'<mets:file ID="F{i}"><mets:FLocat xlink:href="file:{i}.txt"/></mets:file>'
+            for i in range(50)
+        )
+        mets_path = os.path.join(self.temp_dir, 'mets.xml')
+        with open(mets_path, 'w', encoding='utf-8') as f:
+            f.write(
+                '<mets:mets xmlns:mets="http://www.loc.gov/METS/" '
+                'xmlns:xlink="http://www.w3.org/1999/xlink" '
+                'xmlns:dc="http://purl.org/dc/elements/1.1/" '
+                'OBJID="OBJ-1" TYPE="AIP" PROFILE="P" LABEL="Label">'
+                '<mets:metsHdr RECORDSTATUS="SUPPLEMENT">'
+                '<mets:agent ROLE="ARCHIVIST" TYPE="ORGANIZATION"><mets:name>Archive</mets:name>'
+                '<mets:note>Note</mets:note></mets:agent>'
+                '<mets:agent ROLE="OTHER" OTHERROLE="PRODUCER" TYPE="OTHER" OTHERTYPE="SOFTWARE">'
+                '<mets:name>Tool</mets:name></mets:agent>'
+                '<mets:altRecordID TYPE="SUBMISSIONAGREEMENT">AGR-001</mets:altRecordID>'
+                '<mets:altRecordID TYPE="RELATEDAIC">aic-prev</mets:altRecordID>'
+                '<mets:metsDocumentID TYPE="UUID">doc-1</mets:metsDocumentID>'
+                '</mets:metsHdr>'
+                '<mets:dmdSec ID="D1"><mets:mdWrap><mets:xmlData>'
+                '<dc:title>Title</dc:title><dc:creator>Creator</dc:creator><dc:identifier>ID-1</dc:identifier>'
+                '<dc:date>2024-01-01</dc:date><dc:unknown>x</dc:unknown>'
+                '</mets:xmlData></mets:mdWrap></mets:dmdSec>'
+                f'<mets:fileSec><mets:fileGrp>{files}</mets:fileGrp></mets:fileSec>'
+                '</mets:mets>'
+            )
+
+        metadata = self.handler.load_metadata_from_xml(mets_path)
+        expected = self.handler._parse_submission_mets(ET.parse(mets_path).getroot())
+        self.handler._ensure_required_fields(expected)
+        self.assertEqual(metadata, expected)
+        self.assertEqual(metadata['objid'], 'OBJ-1')
+        self.assertEqual(metadata['record_status'], 'SUPPLEMENT')
+        self.assertEqual([agent['name'] for agent in metadata['agents']], ['Archive', 'Tool'])
+        self.assertEqual(metadata['related_aic_id'], 'aic-prev')
+        self.assertEqual(metadata['descriptive_metadata']['title'], 'Title')
+
+    def test_dublin_core_template_round_trip(self):
+        """The Dublin Core template should load back with its sample values."""
+        template_path = os.path.join(self.temp_dir, 'template_dublin_core.xml')
+        self.handler._save_dublin_core_template(template_path)
+
+        desc_meta = self.handler.load_metadata_from_xml(template_path)['descriptive_metadata']
+
+        self.assertEqual(list(desc_meta), self.handler.dublin_core_fields)
+        self.assertEqual(desc_meta['title'], 'Sample DIAS Package Title')
+        self.assertEqual(desc_meta['rights'], 'All rights reserved')
+        self.assertEqual(desc_meta['subject'], 'Sample subject')
+        datetime.fromisoformat(desc_meta['date'])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -3,7 +3,10 @@ Tests for environment configuration (AppConfig and helper functions).
 """
 
 import os
+import subprocess
+import sys
 import unittest
+from pathlib import Path
 
 from src.utils.env_config import (
     get_env, get_env_int, get_env_float, get_env_bool, get_env_list,
@@ -136,6 +139,22 @@ class TestAppConfig(unittest.TestCase):
         self.assertIsInstance(AppConfig.DEFAULT_CREATOR_ORGANIZATIONS, list)
         self.assertIsInstance(AppConfig.DEFAULT_SYSTEM_NAMES, list)
         self.assertIsInstance(AppConfig.DEFAULT_CONTENT_FORMATS, list)
+    
+    def test_log_level_is_upper_cased(self):
+        """A lowercase LOG_LEVEL is normalized once, for logging and the GUI alike."""
+        result = subprocess.run(
+            [sys.executable, '-c', 'from src.utils.env_config import AppConfig; print(AppConfig.LOG_LEVEL)'],
+            cwd=Path(__file__).parent.parent, env=dict(os.environ, LOG_LEVEL='info'),
+            capture_output=True, text=True, timeout=30
+        )
+        self.assertEqual(result.stdout.strip(), 'INFO', result.stderr)
+    
+    def test_config_instance_is_read_only(self):
+        from src.utils.env_config import config
+        self.assertFalse(hasattr(config, '__dict__'))
+        with self.assertRaises(AttributeError):
+            config.APP_NAME = 'Changed'
+        self.assertEqual(config.APP_NAME, AppConfig.APP_NAME)
 
 
 class TestGetPackageVersion(unittest.TestCase):
@@ -6,6 +6,7 @@ Tests for background job execution functionality.
 import pytest
 import time
 import threading
+from src.core import job_manager
 from src.core.job_manager import JobManager
 
 
@@ -15,11 +16,11 @@ class TestJobManager:
     def test_init(self):
         """Test JobManager initialization."""
         manager = JobManager()
-        assert manager._current_thread is None
+        assert manager._jobs == {}
         assert manager._progress_callback is None
         assert manager._log_callback is None
-        assert not manager._is_running
-        assert not manager._cancel_requested
+        assert not manager.is_running
+        assert not manager.is_cancelled()
         
     def test_set_progress_callback(self):
         """Test setting progress callback."""
@@ -119,27 +120,170 @@ class TestJobManager:
         assert len(results) == 1
         assert results[0] == (True, "Sum: 6")
         
-    def test_cannot_start_job_when_running(self):
-        """Test that starting a job while one is running logs a warning."""
+    def test_jobs_run_concurrently(self):
+        """A second job starts while the first is still running."""
+        manager = JobManager(max_workers=2)
+        both_started = threading.Barrier(2, timeout=2.0)
+        
+        def job(name):
+            both_started.wait()
+            return (True, name)
+        
+        first = manager.start_job(job, args=("first",))
+        second = manager.start_job(job, args=("second",))
+        
+        assert first != second
+        assert manager.wait(first, timeout=2.0) == (True, "first")
+        assert manager.wait(second, timeout=2.0) == (True, "second")
+        assert not manager.is_running
+        
+    def test_cancel_job_by_id(self):
+        """Cancelling one job leaves the others running."""
+        manager = JobManager(max_workers=2)
+        started = threading.Barrier(3, timeout=2.0)
+        
+        def job():
+            started.wait()
+            if manager.wait_or_cancel(2.0):
+                return (False, "Cancelled")
+            return (True, "Finished")
+        
+        first = manager.start_job(job)
+        second = manager.start_job(job)
+        started.wait()
+        manager.cancel_job(first)
+        
+        assert manager.wait(first, timeout=2.0) == (False, "Cancelled")
+        assert manager.is_job_running(second)
+        manager.cancel_job(second)
+        assert manager.wait(second, timeout=2.0) == (False, "Cancelled")
+        
+    def test_cancel_job_defaults_to_latest(self):
+        """cancel_job() without an id cancels the most recent job."""
+        manager = JobManager(max_workers=2)
+        started = threading.Barrier(3, timeout=2.0)
+        release = threading.Event()
+        
+        def job():
+            started.wait()
+            release.wait(2.0)
+            return (not manager.is_cancelled(), "Done")
+        
+        first = manager.start_job(job)
+        second = manager.start_job(job)
+        started.wait()
+        manager.cancel_job()
+        release.set()
+        
+        assert manager.wait(first, timeout=2.0) == (True, "Done")
+        assert manager.wait(second, timeout=2.0) == (False, "Done")
+        
+    def test_finished_jobs_are_forgotten(self, monkeypatch):
+        """Finished jobs beyond the history limit are dropped from the registry."""
+        monkeypatch.setattr(job_manager, '_JOB_HISTORY', 1)
         manager = JobManager()
-        log_messages = []
-        started = threading.Event()
+        first = manager.start_job(lambda: (True, "Done"))
+        manager.wait(first, timeout=2.0)
+        
+        second = manager.start_job(lambda: (True, "Done"))
+        manager.wait(second, timeout=2.0)
+        
+        assert first not in manager._jobs
+        assert not manager.is_job_running(first)
+        with pytest.raises(KeyError):
+            manager.wait(first)
+        # Cancelling a forgotten job is a no-op
+        manager.cancel_job(first)
+        
+    def test_is_running_while_jobs_start_and_finish(self):
+        """is_running stays consistent while other threads start jobs."""
+        manager = JobManager(max_workers=4)
+        errors = []
+        stop = threading.Event()
+        
+        def poll():
+            try:
+                while not stop.is_set():
+                    manager.is_running
+            except Exception as e:
+                errors.append(e)
+        
+        poller = threading.Thread(target=poll, daemon=True)
+        poller.start()
+        try:
+            job_ids = [manager.start_job(lambda: (True, "Done")) for _ in range(50)]
+            for job_id in job_ids:
+                assert manager.wait(job_id, timeout=2.0) == (True, "Done")
+        finally:
+            stop.set()
+            poller.join(timeout=2.0)
+            manager.shutdown()
+        
+        assert errors == []
+        assert not manager.is_running
         
-        def long_job():
-            started.set()
-            time.sleep(1.0)
+    def test_jobs_reuse_worker_thread(self):
+        """Consecutive jobs run on the same persistent worker thread."""
+        manager = JobManager(max_workers=1)
+        threads = []
+        
+        def record_thread():
+            threads.append(threading.current_thread())
             return (True, "Done")
         
-        manager.set_log_callback(lambda msg, level: log_messages.append((msg, level)))
+        for _ in range(3):
+            completed = threading.Event()
+            manager.start_job(record_thread,
+                              completion_callback=lambda s, m: completed.set())
+            assert completed.wait(timeout=2.0)
+            # The done callback fires just after the future resolves
+            while manager.is_running:
+                time.sleep(0.01)
+        
+        manager.shutdown()
+        assert len(threads) == 3
+        assert len(set(threads)) == 1
+        assert threads[0] is not threading.main_thread()
+        
+    def test_completion_callback_runs_on_worker_thread(self):
+        """Completion is dispatched by the worker itself, not a monitor thread."""
+        manager = JobManager()
+        seen = {}
+        completed = threading.Event()
+        
+        def job():
+            seen['job'] = threading.current_thread()
+            return (True, "Done")
+        
+        def on_complete(success, message):
+            seen['callback'] = threading.current_thread()
+            completed.set()
         
-        # Start first job
-        manager.start_job(long_job)
-        started.wait(timeout=1.0)
+        manager.start_job(job, completion_callback=on_complete)
+        assert completed.wait(timeout=2.0)
+        manager.shutdown()
         
-        # Try to start second job
-        manager.start_job(long_job)
+        assert seen['callback'] is seen['job']
         
-        assert any("already running" in msg.lower() for msg, _ in log_messages)
+    def test_shutdown_requests_cancellation(self):
+        """shutdown() asks a running job to stop and waits for it."""
+        manager = JobManager()
+        results = []
+        started = threading.Event()
+        
+        def cancellable_job():
+            started.set()
+            while not manager.is_cancelled():
+                time.sleep(0.01)
+            return (False, "Cancelled")
+        
+        manager.start_job(cancellable_job,
+                          completion_callback=lambda s, m: results.append((s, m)))
+        assert started.wait(timeout=2.0)
+        manager.shutdown()
+        
+        assert results == [(False, "Cancelled")]
+        assert not manager.is_running
         
     def test_cancel_job(self):
         """Test requesting job cancellation."""
@@ -149,17 +293,310 @@ class TestJobManager:
         manager.set_log_callback(lambda msg, level: log_messages.append((msg, level)))
         manager.cancel_job()
         
-        assert manager._cancel_requested is True
+        assert manager.is_cancelled() is True
         assert any("cancel" in msg.lower() for msg, _ in log_messages)
         
+    def test_cancel_job_message_goes_through_ui_queue(self):
+        """The cancellation notice respects the level filter and the UI queue."""
+        manager = JobManager()
+        messages = []
+        manager.set_log_callback(lambda msg, level: messages.append(level))
+        manager.set_min_level("ERROR")
+        manager.cancel_job()
+        assert messages == []
+        
+        manager.set_min_level("WARNING")
+        manager.attach_root(_FakeRoot())
+        manager.cancel_job()
+        assert messages == []
+        assert manager._ui_queue.qsize() == 1
+        
     def test_is_cancelled(self):
         """Test is_cancelled method."""
         manager = JobManager()
         
         assert not manager.is_cancelled()
         
-        manager._cancel_requested = True
+        manager.cancel_job()
         assert manager.is_cancelled()
+        
+    def test_wait_or_cancel_times_out(self):
+        """wait_or_cancel returns False when the timeout expires."""
+        manager = JobManager()
+        assert manager.wait_or_cancel(0.01) is False
+        
+    def test_wait_or_cancel_wakes_on_cancel(self):
+        """A job blocked in wait_or_cancel wakes as soon as it is cancelled."""
+        manager = JobManager()
+        results = []
+        completed = threading.Event()
+        
+        def waiting_job():
+            if manager.wait_or_cancel(10.0):
+                return (False, "Cancelled")
+            return (True, "Timed out")
+        
+        def on_complete(success, message):
+            results.append((success, message))
+            completed.set()
+        
+        manager.start_job(waiting_job, completion_callback=on_complete)
+        start = time.monotonic()
+        manager.cancel_job()
+        assert completed.wait(timeout=2.0)
+        
+        assert results == [(False, "Cancelled")]
+        assert time.monotonic() - start < 2.0
+        
+    def test_start_job_clears_cancellation(self):
+        """A cancellation request does not carry over to the next job."""
+        manager = JobManager()
+        manager.cancel_job()
+        completed = threading.Event()
+        seen = []
+        
+        def job():
+            seen.append(manager.is_cancelled())
+            return (True, "Done")
+        
+        manager.start_job(job, completion_callback=lambda s, m: completed.set())
+        assert completed.wait(timeout=2.0)
+        assert seen == [False]
+
+
+class TestJobManagerLogLevels:
+    """Tests for log level filtering and shortcuts."""
+    
+    def test_shortcuts_use_their_level(self):
+        """debug/info/warning/error log with the matching level."""
+        manager = JobManager()
+        messages = []
+        manager.set_log_callback(lambda msg, level: messages.append((msg, level)))
+        
+        manager.debug("d")
+        manager.info("i")
+        manager.warning("w")
+        manager.error("e")
+        
+        assert messages == [("d", "DEBUG"), ("i", "INFO"), ("w", "WARNING"), ("e", "ERROR")]
+        
+    def test_min_level_drops_lower_messages(self):
+        """Messages below the minimum level never reach the callback."""
+        manager = JobManager()
+        messages = []
+        manager.set_log_callback(lambda msg, level: messages.append(level))
+        manager.set_min_level("warning")
+        
+        for level in ("DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR"):
+            manager.log("message", level)
+        
+        assert messages == ["WARNING", "ERROR"]
+        
+    def test_filtered_messages_are_not_queued(self):
+        """Filtered messages are dropped before touching the UI queue."""
+        manager = JobManager()
+        manager.set_log_callback(lambda msg, level: None)
+        manager.attach_root(_FakeRoot())
+        manager.set_min_level("INFO")
+        
+        manager.debug("skipped")
+        assert manager._ui_queue.empty()
+        manager.info("kept")
+        assert manager._ui_queue.qsize() == 1
+        
+    def test_is_enabled_for(self):
+        """is_enabled_for follows the callback and the minimum level."""
+        manager = JobManager()
+        assert not manager.is_enabled_for("ERROR")
+        
+        manager.set_log_callback(lambda msg, level: None)
+        manager.set_min_level("INFO")
+        assert not manager.is_enabled_for("DEBUG")
+        assert manager.is_enabled_for("INFO")
+        assert manager.is_enabled_for("ERROR")
+        assert manager.is_enabled_for("CUSTOM")
+        
+    def test_unknown_min_level_raises(self):
+        """An unknown level name is rejected."""
+        manager = JobManager()
+        with pytest.raises(ValueError):
+            manager.set_min_level("VERBOSE")
+
+
+class _FakeRoot:
+    """Stands in for a Tk root: records after() calls instead of running them."""
+    
+    def __init__(self):
+        self.scheduled = []
+        
+    def after(self, ms, func, *args):
+        self.scheduled.append((ms, func, args))
+
+
+class TestJobManagerUiQueue:
+    """Tests for delivering callbacks on the Tk thread."""
+    
+    def test_attach_root_schedules_drain(self):
+        """Attaching a root starts the periodic queue drain."""
+        manager = JobManager()
+        root = _FakeRoot()
+        manager.attach_root(root)
+        
+        assert len(root.scheduled) == 1
+        assert root.scheduled[0][1] == manager._drain_ui_queue
+        
+    def test_updates_are_queued_until_drained(self):
+        """With a root attached, callbacks only run when the queue is drained."""
+        manager = JobManager()
+        events = []
+        manager.set_progress_callback(lambda v, s: events.append(('progress', v, s)))
+        manager.set_log_callback(lambda msg, level: events.append(('log', msg, level)))
+        root = _FakeRoot()
+        manager.attach_root(root)
+        
+        manager.log("Copying", "INFO")
+        manager.update_progress(10, "Working")
+        assert events == []
+        
+        manager._drain_ui_queue()
+        assert events == [('log', "Copying", "INFO"), ('progress', 10, "Working")]
+        # The drain re-arms itself
+        assert len(root.scheduled) == 2
+        
+    def test_consecutive_progress_updates_are_coalesced(self, monkeypatch):
+        """Only the latest of back-to-back progress updates reaches the callback."""
+        monkeypatch.setattr(job_manager, '_PROGRESS_MIN_INTERVAL', 0)
+        manager = JobManager()
+        events = []
+        manager.set_progress_callback(lambda v, s: events.append(('progress', v)))
+        manager.set_log_callback(lambda msg, level: events.append(('log', msg)))
+        manager.attach_root(_FakeRoot())
+        
+        for value in range(10):
+            manager.update_progress(value)
+        manager.log("halfway")
+        for value in range(10, 20):
+            manager.update_progress(value)
+        manager._drain_ui_queue()
+        
+        assert events == [('progress', 9), ('log', "halfway"), ('progress', 19)]
+        
+    def test_rapid_progress_is_throttled(self, monkeypatch):
+        """Updates inside the minimum interval are held back, last value wins."""
+        monkeypatch.setattr(job_manager, '_PROGRESS_MIN_INTERVAL', 60)
+        manager = JobManager()
+        events = []
+        manager.set_progress_callback(lambda v, s: events.append((v, s)))
+        manager.attach_root(_FakeRoot())
+        
+        for value in range(50):
+            manager.update_progress(value, f"Step {value}")
+        # Only the first update made it onto the queue
+        assert manager._ui_queue.qsize() == 1
+        
+        manager._drain_ui_queue()
+        assert events == [(49, "Step 49")]
+        
+        manager._drain_ui_queue()
+        assert events == [(49, "Step 49")]
+        
+    def test_final_progress_is_never_throttled(self, monkeypatch):
+        """Reaching 100% is queued immediately, ahead of the interval."""
+        monkeypatch.setattr(job_manager, '_PROGRESS_MIN_INTERVAL', 60)
+        manager = JobManager()
+        events = []
+        manager.set_progress_callback(lambda v, s: events.append((v, s)))
+        manager.attach_root(_FakeRoot())
+        
+        manager.update_progress(10, "Working")
+        manager.update_progress(50, "Working")
+        manager.update_progress(100, "Complete")
+        manager._drain_ui_queue()
+        
+        assert events == [(100, "Complete")]
+        
+    def test_progress_is_not_throttled_without_root(self):
+        """Without a Tk root every update is delivered inline."""
+        manager = JobManager()
+        events = []
+        manager.set_progress_callback(lambda v, s: events.append(v))
+        
+        for value in range(20):
+            manager.update_progress(value)
+        
+        assert events == list(range(20))
+        
+    def test_completion_is_delivered_after_job_logs(self):
+        """The completion callback is queued behind the job's own messages."""
+        manager = JobManager()
+        events = []
+        manager.set_log_callback(lambda msg, level: events.append(msg))
+        manager.attach_root(_FakeRoot())
+        
+        def job():
+            manager.log("last line")
+            return (True, "Done")
+        
+        manager.start_job(job, completion_callback=lambda s, m: events.append(m))
+        manager.shutdown()
+        assert events == []
+        
+        manager._drain_ui_queue()
+        assert events == ["last line", "Done"]
+        
+    def test_throttled_progress_is_delivered_before_completion(self, monkeypatch):
+        """A held-back progress update is drawn before 'done', never after it."""
+        monkeypatch.setattr(job_manager, '_PROGRESS_MIN_INTERVAL', 60)
+        manager = JobManager()
+        events = []
+        manager.set_progress_callback(lambda v, s: events.append(('progress', v, s)))
+        manager.set_log_callback(lambda msg, level: events.append(('log', msg)))
+        manager.attach_root(_FakeRoot())
+        
+        def job():
+            manager.update_progress(10)
+            manager.update_progress(37, "Archiving: f")
+            manager.log("Error creating package: boom", "ERROR")
+            return (False, "Package creation failed")
+        
+        manager.start_job(job, completion_callback=lambda s, m: events.append(('done', m)))
+        manager.shutdown()
+        manager._drain_ui_queue()
+        
+        assert events == [
+            ('progress', 10, None),
+            ('log', "Error creating package: boom"),
+            ('progress', 37, "Archiving: f"),
+            ('done', "Package creation failed"),
+        ]
+        manager._drain_ui_queue()
+        assert events[-1] == ('done', "Package creation failed")
+        
+    def test_failing_callback_does_not_stop_drain(self):
+        """A raising callback is logged; later items and the next drain still run."""
+        manager = JobManager()
+        events = []
+        
+        def on_log(message, level):
+            if message == "bad":
+                raise RuntimeError("widget destroyed")
+            events.append(message)
+            
+        manager.set_log_callback(on_log)
+        root = _FakeRoot()
+        manager.attach_root(root)
+        
+        manager.log("bad")
+        manager.log("good")
+        manager._drain_ui_queue()
+        
+        assert events == ["good"]
+        assert len(root.scheduled) == 2
+        assert root.scheduled[-1][1] == manager._drain_ui_queue
+        
+        manager.log("later")
+        manager._drain_ui_queue()
+        assert events == ["good", "later"]
 
 
 class TestJobManagerIntegration:
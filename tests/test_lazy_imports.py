@@ -0,0 +1,115 @@
+"""
+Tests for the lazy package exports in src.core and src.dias_package_creator.
+"""
+
+import pytest
+import subprocess
+import sys
+from pathlib import Path
+
+
+LAZY_PACKAGES = ['src.core', 'src.dias_package_creator']
+
+
+def _run(code):
+    """Run code in a fresh interpreter so sys.modules starts clean."""
+    project_root = Path(__file__).parent.parent
+    return subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=project_root, capture_output=True, text=True, timeout=30
+    )
+
+
+@pytest.mark.parametrize('package', LAZY_PACKAGES)
+class TestLazyPackageExports:
+    """Behaviour shared by every package with lazy exports."""
+    
+    def test_exports_resolve_on_access(self, package):
+        """Every name in __all__ resolves to the submodule's object and is cached."""
+        result = _run(
+            "import importlib\n"
+            f"pkg = importlib.import_module({package!r})\n"
+            "for name in pkg.__all__:\n"
+            "    module = importlib.import_module(pkg._LAZY_IMPORTS[name], pkg.__name__)\n"
+            "    assert getattr(pkg, name) is getattr(module, name), name\n"
+            "    assert name in vars(pkg), name\n"
+        )
+        assert result.returncode == 0, result.stderr
+    
+    def test_frozen_build_imports_eagerly(self, package):
+        """Frozen builds bind the exports directly at import time."""
+        result = _run(
+            "import importlib, sys\n"
+            "sys.frozen = True\n"
+            f"pkg = importlib.import_module({package!r})\n"
+            "assert all(name in vars(pkg) for name in pkg.__all__)\n"
+        )
+        assert result.returncode == 0, result.stderr
+    
+    def test_unknown_attribute_raises(self, package):
+        """Unknown names still raise AttributeError."""
+        import importlib
+        pkg = importlib.import_module(package)
+        with pytest.raises(AttributeError):
+            pkg.DoesNotExist
+
+
+class TestCorePackageLazyImports:
+    """Tests for the lazy exports in src.core."""
+    
+    def test_job_manager_does_not_import_controller(self):
+        """Accessing JobManager must not pull in the XML generation stack."""
+        result = _run(
+            "import sys, src.core\n"
+            "src.core.JobManager\n"
+            "assert 'src.core.dias_controller' not in sys.modules\n"
+            "assert 'src.dias_package_creator.dias_xml_generators' not in sys.modules\n"
+        )
+        assert result.returncode == 0, result.stderr
+    
+    def test_import_core_is_lazy(self):
+        """Importing src.core alone should not import any submodule."""
+        result = _run(
+            "import sys, src.core\n"
+            "assert 'src.core.job_manager' not in sys.modules\n"
+            "assert 'src.core.dias_controller' not in sys.modules\n"
+        )
+        assert result.returncode == 0, result.stderr
+    
+    def test_lazy_export_is_cached_after_first_access(self):
+        """The module __getattr__ runs once; later lookups hit the module dict."""
+        result = _run(
+            "import src.core\n"
+            "calls = []\n"
+            "original = src.core.__getattr__\n"
+            "def counting(name):\n"
+            "    calls.append(name)\n"
+            "    return original(name)\n"
+            "src.core.__getattr__ = counting\n"
+            "first = src.core.PackageController\n"
+            "second = src.core.PackageController\n"
+            "assert first is second\n"
+            "assert vars(src.core)['PackageController'] is second\n"
+            "assert calls == ['PackageController'], calls\n"
+        )
+        assert result.returncode == 0, result.stderr
+
+
+class TestPackageCreatorLazyImports:
+    """Tests for the lazy exports in src.dias_package_creator."""
+    
+    def test_submodule_import_does_not_load_siblings(self):
+        """Importing one submodule must not pull in the validator and inspector."""
+        result = _run(
+            "import sys\n"
+            "import src.dias_package_creator.dias_xml_generators\n"
+            "assert 'src.dias_package_creator.package_validator' not in sys.modules\n"
+            "assert 'src.dias_package_creator.package_inspector' not in sys.modules\n"
+            "assert 'src.dias_package_creator.metadata_handler' not in sys.modules\n"
+        )
+        assert result.returncode == 0, result.stderr
+    
+    def test_from_import_resolves(self):
+        """from-imports go through the lazy __getattr__."""
+        result = _run("from src.dias_package_creator import MetadataHandler\n")
+        assert result.returncode == 0, result.stderr
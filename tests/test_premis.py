@@ -108,6 +108,19 @@ class TestDIASLogGeneratorUserEvents(unittest.TestCase):
         # Should have a timestamp, not be empty
         self.assertTrue(len(event_datetime.text) > 0)
 
+    def test_user_event_date_auto_when_none(self):
+        """A null user event date also gets an auto-generated timestamp."""
+        user_events = [{'event_type': 'Creation', 'event_detail': 'test',
+                        'event_outcome': '0', 'event_date': None}]
+        root = self.generator.create_log_xml(
+            metadata=self.metadata, object_uuid='uuid-123',
+            user_events=user_events,
+        )
+        events = self._find_elements(root, 'event')
+        auto_datetime = [el for el in events[0] if el.tag.split('}')[-1] == 'eventDateTime'][0]
+        user_datetime = [el for el in events[1] if el.tag.split('}')[-1] == 'eventDateTime'][0]
+        self.assertEqual(user_datetime.text, auto_datetime.text)
+
     def test_user_event_outcome_detail_omitted_when_empty(self):
         """eventOutcomeDetailNote is omitted when outcome detail is empty."""
         user_events = [{'event_type': 'Creation', 'event_detail': 'test',
@@ -408,5 +421,27 @@ class TestDIASLogGeneratorSave(unittest.TestCase):
             os.unlink(output_path)
 
 
+class TestDIASLogGeneratorFileObjects(unittest.TestCase):
+    """Tests for the per-file objects in SIP-level log.xml."""
+
+    premis_ns = 'http://arkivverket.no/standarder/PREMIS'
+
+    def test_format_name_from_extension(self):
+        """formatName is the lowercased extension, as os.path.splitext sees it."""
+        paths = ['content/report.PDF', 'content/archive.tar.gz', 'content/no_extension',
+                 'content/.bashrc', 'content/.hidden.txt', 'content/trailing.',
+                 'content/double..dot.txt', 'content/dir.d/file', '..a.b', '...']
+        files_info = [{'path': path, 'checksum': 'abc', 'size': 1} for path in paths]
+        root = DIASLogGenerator().create_log_xml(
+            metadata={'label': 'Test Package'}, object_uuid='uuid-123',
+            files_info=files_info, is_sip_level=True,
+        )
+        # The first object describes the package tar itself
+        file_objects = root.findall(f'{{{self.premis_ns}}}object')[1:]
+        names = [el.find(f'.//{{{self.premis_ns}}}formatName').text for el in file_objects]
+        expected = [os.path.splitext(path)[1].lstrip('.').lower() or 'unknown' for path in paths]
+        self.assertEqual(names, expected)
+
+
 if __name__ == '__main__':
     unittest.main()